@@ -1,14 +1,43 @@
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
+from core.feature_store import STORE_DIR, FeatureStore
+from core.schema import SchemaRegistry
+from core.vector_index import VectorIndex
+from core.tracing import instrument
 
+
+# KPIs, anomalies and the trend chart only touch these columns
+COLUMNS = ["Revenue", "Quantity", "month"]
+
+
+@instrument(
+    "analytics",
+    "load_data", "load_window", "analyze", "compute_kpis", "detect_anomalies",
+    "plot_revenue_trend", "save_report"
+)
 class AnalyticsAgent:
 
-    def __init__(self, feature_dir="data/features", report_dir="data/reports"):
+    def __init__(self,
+                 feature_dir="data/features",
+                 report_dir="data/reports",
+                 index_dir="data/index",
+                 schema_dir="data/schemas",
+                 store_dir=STORE_DIR,
+                 window_days=None):
 
         self.feature_dir = feature_dir
         self.report_dir = report_dir
+        self.index_dir = index_dir
+        self.schemas = SchemaRegistry(schema_dir)
+        self.store_dir = store_dir
+
+        # Set: one report over the last window_days instead of one per
+        # feature file
+        if window_days is None and os.getenv("ADIP_ANALYTICS_WINDOW_DAYS"):
+            window_days = int(os.getenv("ADIP_ANALYTICS_WINDOW_DAYS"))
+
+        self.window_days = window_days
 
         os.makedirs(self.report_dir, exist_ok=True)
 
@@ -25,10 +54,21 @@ class AnalyticsAgent:
     def load_data(self, filename):
 
         path = os.path.join(self.feature_dir, filename)
-        df = pd.read_csv(path)
+
+        df = self.schemas.read_csv(path, "etl", columns=COLUMNS)
 
         return df
 
+    def load_window(self, days=None, start=None, end=None):
+
+        # Reads only the partitions overlapping the window
+        store = FeatureStore(self.store_dir)
+
+        if days is not None:
+            return store.window(days, columns=COLUMNS)
+
+        return store.read(start, end, columns=COLUMNS)
+
     def compute_kpis(self, df):
 
         kpis = {}
@@ -69,18 +109,21 @@ class AnalyticsAgent:
 
         trend = df.groupby("month")["Revenue"].sum()
 
-        plt.figure()
-        trend.plot(title="Monthly Revenue Trend")
-        plt.xlabel("Month")
-        plt.ylabel("Revenue")
+        # Figure API instead of pyplot: no global state, so this is safe
+        # while other pipeline stages run in parallel threads.
+        fig = Figure()
+        ax = fig.subplots()
+
+        trend.plot(ax=ax, title="Monthly Revenue Trend")
+        ax.set_xlabel("Month")
+        ax.set_ylabel("Revenue")
 
         out_path = os.path.join(
             self.report_dir,
             filename.replace(".csv", "_trend.png")
         )
 
-        plt.savefig(out_path)
-        plt.close()
+        fig.savefig(out_path)
 
         return out_path
 
@@ -110,11 +153,43 @@ class AnalyticsAgent:
 
         return report_path
 
-    def run(self):
+    def index_report(self, report_path):
+
+        # Reports are overwritten each run, so keep them in the vector
+        # index as history for the LLM agent.
+        try:
+            with open(report_path, "r") as f:
+                text = f.read()
+
+            VectorIndex(self.index_dir).add_report(
+                text,
+                os.path.basename(report_path)
+            )
+
+            return True
+
+        except Exception as e:
+            print(f"⚠️ Could not index report: {e}")
+            return False
+
+    def run(self, files=None):
 
         print("\n📊 Analytics Agent Started\n")
 
-        files = self.find_files()
+        if self.window_days:
+
+            print(f"🗓️ Analyzing the last {self.window_days} days\n")
+
+            self.analyze(
+                self.load_window(self.window_days),
+                f"last_{self.window_days}_days.csv"
+            )
+
+            print("✅ Analytics Complete\n")
+            return
+
+        if files is None:
+            files = self.find_files()
 
         if not files:
             print("❌ No feature files found")
@@ -122,30 +197,39 @@ class AnalyticsAgent:
 
         for file in files:
 
+            # ETL writes nothing for batches with no clean rows
+            if not os.path.exists(os.path.join(self.feature_dir, file)):
+                print(f"⏭️ {file}: no features\n")
+                continue
+
             print(f"📄 Analyzing: {file}\n")
 
-            df = self.load_data(file)
+            self.analyze(self.load_data(file), file)
 
-            kpis = self.compute_kpis(df)
+        print("✅ Analytics Complete\n")
 
-            anomalies = self.detect_anomalies(df)
+    def analyze(self, df, file):
 
-            charts = []
+        kpis = self.compute_kpis(df)
 
-            chart_path = self.plot_revenue_trend(df, file)
-            if chart_path:
-                charts.append(chart_path)
+        anomalies = self.detect_anomalies(df)
 
-            report = self.save_report(
-                kpis,
-                anomalies,
-                charts,
-                file
-            )
+        charts = []
 
-            print("✅ KPIs Generated")
-            print("🚨 Anomalies Detected:", anomalies)
-            print("📈 Charts Created")
-            print(f"📄 Report saved to: {report}\n")
+        chart_path = self.plot_revenue_trend(df, file)
+        if chart_path:
+            charts.append(chart_path)
 
-        print("✅ Analytics Complete\n")
+        report = self.save_report(
+            kpis,
+            anomalies,
+            charts,
+            file
+        )
+
+        self.index_report(report)
+
+        print("✅ KPIs Generated")
+        print("🚨 Anomalies Detected:", anomalies)
+        print("📈 Charts Created")
+        print(f"📄 Report saved to: {report}\n")
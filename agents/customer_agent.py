@@ -0,0 +1,461 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+import core.frames  # noqa: F401 (copy-on-write on pandas 2.x)
+from core.schema import SchemaRegistry
+from core.tracing import instrument
+
+
+WINDOWS = [7, 30, 90]
+
+COLUMNS = ["InvoiceNo", "InvoiceDate", "Quantity", "UnitPrice", "CustomerID"]
+
+FEATURES = ["recency_days", "frequency", "monetary"] + [
+    f"{name}_{days}d" for days in WINDOWS for name in ("spend", "orders")
+]
+
+
+def features_as_of(customers, days, history):
+
+    # Customer features for each row as of the row's day: only purchases
+    # on earlier days count, so neither the row's own revenue nor later
+    # purchases leak into it. history is CustomerAgent.history(); rows
+    # without a customer or a date get zeros, like unknown customers.
+    customers = pd.Series(customers, dtype=float).to_numpy()
+    days = pd.Series(days).astype("datetime64[ns]").to_numpy()
+
+    out = pd.DataFrame(0.0, index=range(len(customers)), columns=FEATURES)
+
+    rows = np.flatnonzero(~np.isnan(customers) & ~np.isnat(days))
+
+    if not len(rows) or history.empty:
+        return out
+
+    right = pd.DataFrame({
+        "CustomerID": history["CustomerID"].to_numpy(dtype=float),
+        "at": history["day"].astype("datetime64[ns]").to_numpy(),
+        "last_day": history["day"].astype("datetime64[ns]").to_numpy(),
+        "spend": history["cum_spend"].to_numpy(dtype=float),
+        "orders": history["cum_orders"].to_numpy(dtype=float)
+    }).sort_values("at", kind="stable")
+
+    def before(at):
+
+        # Running totals on the last purchase day strictly before `at`,
+        # in row order
+        left = pd.DataFrame({
+            "CustomerID": customers[rows],
+            "at": at,
+            "row": np.arange(len(rows))
+        }).sort_values("at", kind="stable")
+
+        merged = pd.merge_asof(
+            left, right,
+            on="at",
+            by="CustomerID",
+            allow_exact_matches=False
+        ).sort_values("row")
+
+        return merged
+
+    now = before(days[rows])
+
+    spend = now["spend"].fillna(0.0).to_numpy()
+    orders = now["orders"].fillna(0.0).to_numpy()
+
+    values = {
+        "recency_days": (days[rows] - now["last_day"].to_numpy()) /
+        np.timedelta64(1, "D"),
+        "frequency": orders,
+        "monetary": spend
+    }
+
+    for window in WINDOWS:
+
+        start = before(days[rows] - np.timedelta64(window, "D"))
+
+        values[f"spend_{window}d"] = \
+            spend - start["spend"].fillna(0.0).to_numpy()
+        values[f"orders_{window}d"] = \
+            orders - start["orders"].fillna(0.0).to_numpy()
+
+    for col, column in values.items():
+        out.loc[rows, col] = np.nan_to_num(column, nan=0.0)
+
+    return out
+
+
+@instrument(
+    "customer",
+    "load_data", "summarize", "update", "merge_history", "history",
+    "compute_features", "save_state", "save_features"
+)
+class CustomerAgent:
+
+    # Per-customer RFM and rolling 7/30/90-day spend and order counts.
+    # Each clean batch is summarised once (customer totals + daily spend)
+    # and merged into persisted running state, so a new batch costs its
+    # own size, not a rescan of the full history. The day-level history
+    # ETL joins against is persisted the same way.
+
+    def __init__(self,
+                 clean_dir="data/clean",
+                 customer_dir="data/customers",
+                 schema_dir="data/schemas"):
+
+        self.clean_dir = clean_dir
+        self.customer_dir = customer_dir
+        self.batch_dir = os.path.join(customer_dir, "batches")
+        self.schemas = SchemaRegistry(schema_dir)
+
+        self.state_path = os.path.join(customer_dir, "state.json")
+        self.totals_path = os.path.join(customer_dir, "customers.parquet")
+        self.daily_path = os.path.join(customer_dir, "daily.parquet")
+        self.features_path = os.path.join(
+            customer_dir, "customer_features.parquet"
+        )
+        self.history_path = os.path.join(customer_dir, "history.parquet")
+
+        os.makedirs(self.batch_dir, exist_ok=True)
+
+    def find_files(self):
+
+        return sorted(
+            f for f in os.listdir(self.clean_dir)
+            if f.endswith(".csv")
+        )
+
+    def load_data(self, filename):
+
+        path = os.path.join(self.clean_dir, filename)
+
+        return self.schemas.read_csv(path, "quality", columns=COLUMNS)
+
+    def batch_digest(self, filename):
+
+        # Content, not mtime: Quality rewrites unchanged files each run
+        digest = hashlib.sha256()
+
+        with open(os.path.join(self.clean_dir, filename), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    # ---------- Batch Summary ---------- #
+
+    def summarize(self, df):
+
+        df = df[df["CustomerID"].notna()]
+
+        dates = pd.to_datetime(df["InvoiceDate"])
+
+        lines = pd.DataFrame({
+            "CustomerID": df["CustomerID"].to_numpy(),
+            "InvoiceNo": df["InvoiceNo"].astype(str).to_numpy(),
+            "InvoiceDate": dates.to_numpy(),
+            "day": dates.dt.normalize().to_numpy(),
+            "spend": (df["Quantity"] * df["UnitPrice"]).to_numpy()
+        })
+
+        # Sort once; every grouping below runs over ordered keys
+        lines = lines.sort_values(
+            ["CustomerID", "InvoiceDate"],
+            kind="stable",
+            ignore_index=True
+        )
+
+        by_customer = lines.groupby("CustomerID", sort=False)
+
+        totals = pd.DataFrame({
+            "first_purchase": by_customer["InvoiceDate"].min(),
+            "last_purchase": by_customer["InvoiceDate"].max(),
+            "monetary": by_customer["spend"].sum()
+        })
+
+        # An order is one invoice; cancellations ("C…") are not purchases.
+        # Counted per batch, so an invoice split across two exports
+        # would count twice (exports are cut at invoice boundaries).
+        orders = lines.drop_duplicates(["CustomerID", "InvoiceNo"])
+        orders = orders[~orders["InvoiceNo"].str.startswith("C")]
+
+        totals["frequency"] = orders.groupby(
+            "CustomerID", sort=False
+        ).size().reindex(totals.index, fill_value=0)
+
+        daily = lines.groupby(["CustomerID", "day"], sort=False).agg(
+            spend=("spend", "sum")
+        )
+        daily["orders"] = orders.groupby(
+            ["CustomerID", "day"], sort=False
+        ).size().reindex(daily.index, fill_value=0)
+
+        return totals.reset_index(), daily.reset_index()
+
+    # ---------- State ---------- #
+
+    def combine(self, totals, daily):
+
+        # Merge partial states (lists of frames) into one; totals add up,
+        # first/last purchase take the min/max
+        totals = pd.concat(totals, ignore_index=True).groupby(
+            "CustomerID", sort=True
+        ).agg(
+            first_purchase=("first_purchase", "min"),
+            last_purchase=("last_purchase", "max"),
+            monetary=("monetary", "sum"),
+            frequency=("frequency", "sum")
+        ).reset_index()
+
+        reference = totals["last_purchase"].max()
+
+        daily = pd.concat(daily, ignore_index=True)
+
+        # Only days inside the widest window are ever needed again
+        horizon = reference.normalize() - pd.Timedelta(days=max(WINDOWS))
+        daily = daily[daily["day"] > horizon]
+
+        daily = daily.groupby(
+            ["CustomerID", "day"], sort=True
+        ).sum().reset_index()
+
+        return totals, daily, reference
+
+    def load_state(self):
+
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+
+            totals = pd.read_parquet(self.totals_path)
+            daily = pd.read_parquet(self.daily_path)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"batches": {}}, None, None
+
+        return state, totals, daily
+
+    def save_state(self, state, totals, daily, history):
+
+        for frame, path in [(totals, self.totals_path),
+                            (daily, self.daily_path),
+                            (history, self.history_path)]:
+            frame.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+
+        # Written last: it only names batches whose data is on disk
+        with open(self.state_path + ".tmp", "w") as f:
+            json.dump(state, f, indent=2)
+
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def batch_paths(self, name):
+
+        stem = os.path.splitext(name)[0]
+
+        return (
+            os.path.join(self.batch_dir, f"{stem}.customers.parquet"),
+            os.path.join(self.batch_dir, f"{stem}.daily.parquet")
+        )
+
+    def update(self, state, totals, daily, name, digest, batch):
+
+        # batch = summarize() output for one clean file
+        batch_totals, batch_daily = batch
+        totals_path, daily_path = self.batch_paths(name)
+
+        replaced = name in state["batches"]
+
+        batch_totals.to_parquet(totals_path, index=False)
+        batch_daily.to_parquet(daily_path, index=False)
+
+        state["batches"][name] = {
+            "digest": digest,
+            "customers": int(len(batch_totals))
+        }
+
+        if replaced or totals is None:
+
+            # A batch changed content: its old contribution can't be
+            # subtracted from min/max, so rebuild from the per-batch
+            # summaries (never from raw history)
+            parts = [self.batch_paths(n) for n in state["batches"]]
+
+            return self.combine(
+                [pd.read_parquet(p) for p, _ in parts],
+                [pd.read_parquet(p) for _, p in parts]
+            )
+
+        return self.combine([totals, batch_totals], [daily, batch_daily])
+
+    # ---------- Features ---------- #
+
+    def compute_features(self, totals, daily, reference):
+
+        features = pd.DataFrame({
+            "CustomerID": totals["CustomerID"].to_numpy(),
+            "recency_days": (
+                reference - totals["last_purchase"]
+            ).dt.days.to_numpy(),
+            "frequency": totals["frequency"].to_numpy(),
+            "monetary": totals["monetary"].to_numpy()
+        })
+
+        age = (reference.normalize() - daily["day"]).dt.days.to_numpy()
+
+        # One grouped sum over all windows at once
+        windows = {"CustomerID": daily["CustomerID"].to_numpy()}
+
+        for days in WINDOWS:
+            inside = age < days
+            windows[f"spend_{days}d"] = np.where(inside, daily["spend"], 0.0)
+            windows[f"orders_{days}d"] = np.where(inside, daily["orders"], 0)
+
+        rolling = pd.DataFrame(windows).groupby(
+            "CustomerID", sort=True
+        ).sum()
+
+        features = features.merge(
+            rolling,
+            left_on="CustomerID",
+            right_index=True,
+            how="left"
+        )
+
+        window_cols = list(rolling.columns)
+        features[window_cols] = features[window_cols].fillna(0)
+
+        return features
+
+    def running_totals(self, daily):
+
+        daily = daily.groupby(
+            ["CustomerID", "day"], sort=True
+        ).sum().reset_index()
+
+        by_customer = daily.groupby("CustomerID", sort=False)
+
+        daily["cum_spend"] = by_customer["spend"].cumsum()
+        daily["cum_orders"] = by_customer["orders"].cumsum()
+
+        return daily
+
+    def history(self, state):
+
+        # Spend and orders per customer and day over every batch, with
+        # running totals through that day: what ETL needs to give each
+        # row the features as of its own date. Built from the per-batch
+        # summaries, never from raw history; only needed when there is
+        # no persisted history yet or a batch changed content.
+        return self.running_totals(pd.concat([
+            pd.read_parquet(self.batch_paths(name)[1])
+            for name in state["batches"]
+        ], ignore_index=True))
+
+    def load_history(self):
+
+        try:
+            return pd.read_parquet(self.history_path)
+        except FileNotFoundError:
+            return None
+
+    def merge_history(self, history, batch_daily):
+
+        # Fold one new batch's days into the persisted history. Only the
+        # batch's customers need their running totals redone; everyone
+        # else's rows are kept as they are.
+        touched = history["CustomerID"].isin(batch_daily["CustomerID"])
+
+        merged = self.running_totals(pd.concat([
+            history.loc[touched, ["CustomerID", "day", "spend", "orders"]],
+            batch_daily
+        ], ignore_index=True))
+
+        return pd.concat(
+            [history[~touched], merged], ignore_index=True
+        ).sort_values(["CustomerID", "day"], ignore_index=True)
+
+    def save_features(self, features):
+
+        features.to_parquet(self.features_path + ".tmp", index=False)
+        os.replace(self.features_path + ".tmp", self.features_path)
+
+        return self.features_path
+
+    def run(self, files=None):
+
+        print("\n👥 Customer Agent Started\n")
+
+        if files is None:
+            files = self.find_files()
+
+        if not files:
+            print("❌ No clean files found")
+            return
+
+        state, totals, daily = self.load_state()
+        reference = pd.Timestamp(state["reference"]) \
+            if "reference" in state else None
+
+        history = self.load_history() if totals is not None else None
+
+        updated = False
+
+        for file in files:
+
+            # Quality writes nothing for batches that were all duplicates
+            if not os.path.exists(os.path.join(self.clean_dir, file)):
+                print(f"⏭️ {file}: no clean data")
+                continue
+
+            digest = self.batch_digest(file)
+
+            if state["batches"].get(file, {}).get("digest") == digest:
+                print(f"⏭️ {file}: already in customer state")
+                continue
+
+            print(f"📄 Summarizing: {file}")
+
+            batch = self.summarize(self.load_data(file))
+
+            # A replaced batch's old days can't be told apart in the
+            # merged history: rebuild it from the batch summaries below
+            if file in state["batches"]:
+                history = None
+            elif history is not None:
+                history = self.merge_history(history, batch[1])
+
+            totals, daily, reference = self.update(
+                state, totals, daily, file, digest, batch
+            )
+            updated = True
+
+        if totals is None:
+            print("❌ No customer data")
+            return
+
+        rebuilt = history is None
+
+        if rebuilt:
+            history = self.history(state)
+
+        if updated:
+            state["reference"] = reference.isoformat()
+
+        if updated or rebuilt:
+            self.save_state(state, totals, daily, history)
+
+        if updated or not os.path.exists(self.features_path):
+
+            features = self.compute_features(totals, daily, reference)
+            output = self.save_features(features)
+
+            print(f"\n👥 Customers: {len(features):,}")
+            print(f"📅 Reference date: {reference}")
+            print(f"💾 Saved to: {output}\n")
+
+        print("✅ Customer Features Complete\n")
@@ -1,19 +1,93 @@
 import os
+import json
 import pandas as pd
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-
-
+from sklearn.preprocessing import StandardScaler
+
+from agents.customer_agent import FEATURES, features_as_of
+from core.encoding import (
+    HASH_WIDTH,
+    ValueCounts,
+    choose_strategy,
+    dictionary_codes,
+    frequency,
+    hash_block
+)
+from core.feature_store import STORE_DIR, DATE_PARTS, FeatureStore
+import core.frames  # noqa: F401 (copy-on-write on pandas 2.x)
+from core.schema import SchemaRegistry, print_changes
+from core.tracing import instrument
+
+
+# Calendar features stay as they are: a missing InvoiceDate makes them
+# float, and they must not be standardized then either
+DATE_FEATURES = DATE_PARTS + ["weekday"]
+
+
+@instrument(
+    "etl",
+    "load_data", "create_features", "add_customer_features",
+    "encode_categorical", "scale_numeric", "select_features", "save_features"
+)
 class ETLAgent:
 
-    def __init__(self, clean_dir="data/clean", feature_dir="data/features"):
+    def __init__(self, clean_dir="data/clean", feature_dir="data/features",
+                 schema_dir="data/schemas",
+                 customer_history="data/customers/history.parquet",
+                 store_dir=STORE_DIR):
 
         self.clean_dir = clean_dir
         self.feature_dir = feature_dir
+        self.customer_history = customer_history
+        self.schemas = SchemaRegistry(schema_dir)
+        self.store = FeatureStore(store_dir)
 
         os.makedirs(self.feature_dir, exist_ok=True)
 
-        self.scaler = StandardScaler()
-        self.encoder = LabelEncoder()
+        # column → {"mean", "scale"}: fitted on the first batch a numeric
+        # column appears in and reused after, so every batch (and the
+        # watch daemon's) is standardized on the same scale
+        self.scaling_path = os.path.join(feature_dir, "scaling.json")
+        self.scaling = self.load_scaling()
+
+        # column → {"strategy", "vocabulary"}: fixed the first time a
+        # column is seen, so every batch gets the same feature columns
+        self.encoding_path = os.path.join(feature_dir, "encodings.json")
+        self.encodings = self.load_encodings()
+
+        # Encoder outputs; already on a fixed scale, never standardized
+        self.encoded = set()
+
+    def load_encodings(self):
+
+        try:
+            with open(self.encoding_path, "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_encodings(self):
+
+        with open(self.encoding_path + ".tmp", "w") as f:
+            json.dump(self.encodings, f, indent=2)
+
+        os.replace(self.encoding_path + ".tmp", self.encoding_path)
+
+    def load_scaling(self):
+
+        try:
+            with open(self.scaling_path, "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_scaling(self):
+
+        with open(self.scaling_path + ".tmp", "w") as f:
+            json.dump(self.scaling, f, indent=2)
+
+        os.replace(self.scaling_path + ".tmp", self.scaling_path)
 
     def find_files(self):
 
@@ -28,7 +102,7 @@ class ETLAgent:
     def load_data(self, filename):
 
         path = os.path.join(self.clean_dir, filename)
-        df = pd.read_csv(path)
+        df = self.schemas.read_csv(path, "quality")
 
         return df
 
@@ -50,38 +124,134 @@ class ETLAgent:
 
         return df
 
-    def encode_categorical(self, df):
+    def add_customer_features(self, df):
+
+        # Per-customer RFM / rolling spend from the customer stage, as
+        # of each row's day (purchases on earlier days only), so a row's
+        # features never include its own revenue or later purchases
+        if "CustomerID" not in df.columns:
+            return df
+
+        if "InvoiceDate" not in df.columns or \
+                not os.path.exists(self.customer_history):
+            print("⚠️ No customer history found, skipping join")
+
+        else:
+            history = pd.read_parquet(self.customer_history)
+
+            features = features_as_of(
+                df["CustomerID"],
+                df["InvoiceDate"].dt.normalize(),
+                history
+            )
+
+            df[FEATURES] = features.to_numpy()
+
+        # Guest lines (no customer) keep their own marker from here on
+        df["CustomerID"] = df["CustomerID"].fillna(0)
+
+        return df
+
+    def encode_categorical(self, df, batch="batch"):
 
         categorical_cols = df.select_dtypes(
-            include=["object"]
+            include=["object", "string"]
         ).columns
 
         for col in categorical_cols:
 
-            df[col] = df[col].astype(str)
+            # Hash-based factorize, unsorted: linear in rows whatever the
+            # vocabulary size; missing values are a category of their own
+            codes, uniques = pd.factorize(df[col], use_na_sentinel=False)
+
+            encoding = self.encodings.setdefault(col, {
+                "strategy": choose_strategy(len(uniques))
+            })
+            strategy = encoding["strategy"]
+
+            if strategy == "dictionary":
+
+                df[col] = dictionary_codes(
+                    codes,
+                    uniques.astype(str).to_numpy(dtype=object),
+                    encoding.setdefault("vocabulary", [])
+                )
+                outputs = [col]
 
-            df[col] = self.encoder.fit_transform(df[col])
+            elif strategy == "hash":
+
+                block = hash_block(
+                    codes,
+                    uniques.astype(str).to_numpy(dtype=object)
+                )
+                outputs = [f"{col}_hash{i}" for i in range(HASH_WIDTH)]
+
+                del df[col]
+                df[outputs] = block
+
+            else:
+
+                df[col] = frequency(
+                    codes,
+                    uniques.astype(str).to_numpy(dtype=object),
+                    ValueCounts(self.feature_dir, col),
+                    os.path.splitext(batch)[0]
+                )
+                outputs = [col]
+
+            self.encoded.update(outputs)
+
+            print(f"🔤 {col}: {strategy} ({len(uniques):,} values)")
 
         return df
 
-    def scale_numeric(self, df):
+    def scale_numeric(self, df, chunk_size=100_000):
 
         numeric_cols = df.select_dtypes(
             include=["int64", "float64"]
-        ).columns
+        ).columns.difference(list(self.encoded) + DATE_FEATURES, sort=False)
+
+        if len(numeric_cols) == 0 or df.empty:
+            return df
+
+        # Columns without a fitted scale yet are fitted on row chunks;
+        # then each column is transformed on its own, so the only extra
+        # allocation is a chunk or a column, never a second full-size
+        # matrix
+        unfitted = [col for col in numeric_cols if col not in self.scaling]
+
+        if unfitted:
+
+            scaler = StandardScaler()
+
+            for start in range(0, len(df), chunk_size):
+                scaler.partial_fit(
+                    df[unfitted].iloc[start:start + chunk_size].to_numpy(
+                        dtype="float64"
+                    )
+                )
+
+            for col, mean, scale in zip(unfitted, scaler.mean_,
+                                        scaler.scale_):
+                self.scaling[col] = {"mean": float(mean),
+                                     "scale": float(scale)}
+
+        for col in numeric_cols:
 
-        df[numeric_cols] = self.scaler.fit_transform(df[numeric_cols])
+            values = df[col].to_numpy(dtype="float64", copy=True)
+
+            values -= self.scaling[col]["mean"]
+            values /= self.scaling[col]["scale"]
+
+            df[col] = values
 
         return df
 
     def select_features(self, df):
 
-        drop_cols = []
-
+        # Delete in place instead of building a new frame via drop()
         if "InvoiceDate" in df.columns:
-            drop_cols.append("InvoiceDate")
-
-        df = df.drop(columns=drop_cols)
+            del df["InvoiceDate"]
 
         return df
 
@@ -93,11 +263,12 @@ class ETLAgent:
 
         return out_path
 
-    def run(self):
+    def run(self, files=None):
 
         print("\n⚙️ ETL Agent Started\n")
 
-        files = self.find_files()
+        if files is None:
+            files = self.find_files()
 
         if not files:
             print("❌ No clean files found")
@@ -105,21 +276,48 @@ class ETLAgent:
 
         for file in files:
 
+            # Quality writes nothing for batches that were all duplicates
+            if not os.path.exists(os.path.join(self.clean_dir, file)):
+                print(f"⏭️ {file}: no clean data\n")
+                continue
+
             print(f"📄 Transforming: {file}\n")
 
             df = self.load_data(file)
 
             df = self.create_features(df)
 
-            df = self.encode_categorical(df)
+            df = self.add_customer_features(df)
+
+            df = self.encode_categorical(df, file)
 
             df = self.scale_numeric(df)
 
+            # Partitions follow the dates themselves, not the features
+            dates = df["InvoiceDate"] if "InvoiceDate" in df.columns else None
+
             df = self.select_features(df)
 
             output = self.save_features(df, file)
 
+            self.save_encodings()
+            self.save_scaling()
+
+            # Same rows, partitioned by month for windowed readers
+            partitions = self.store.write(df, file, dates)
+
+            undated = 0 if dates is None else int(dates.isna().sum())
+
+            if undated:
+                print(f"⚠️ {undated} rows without an InvoiceDate kept out "
+                      f"of the feature store")
+
+            changes = self.schemas.record("etl", output, df)
+
             print("✅ Feature engineering complete")
-            print(f"💾 Saved to: {output}\n")
+            print(f"💾 Saved to: {output}")
+            print(f"🗂️ Partitions written: {partitions}\n")
+
+            print_changes(output, changes)
 
         print("✅ ETL Pipeline Complete\n")
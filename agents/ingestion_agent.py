@@ -1,46 +1,103 @@
 import os
 import pandas as pd
 
-
+from core.compressed import (
+    is_compressed,
+    strip_suffix,
+    csv_members,
+    background_stream
+)
+from core.dedup import row_hashes, duplicated, save_hashes
+from core.excel import ExcelReader
+from core.schema import SchemaRegistry, print_changes
+from core.sketches import PROFILE_DIR, profile_frame, save_profile
+from core.tracing import instrument
+
+
+@instrument(
+    "ingestion",
+    "load_file", "analyze_schema", "profile_data", "save_profile",
+    "save_processed"
+)
 class IngestionAgent:
 
-    def __init__(self, raw_dir="data/raw", processed_dir="data/processed"):
+    def __init__(self, raw_dir="data/raw", processed_dir="data/processed",
+                 excel_engine=None, excel_cache_dir="data/cache/excel",
+                 schema_dir="data/schemas", profile_dir=PROFILE_DIR):
         self.raw_dir = raw_dir
         self.processed_dir = processed_dir
+        self.schemas = SchemaRegistry(schema_dir)
+        self.profile_dir = profile_dir
 
         os.makedirs(self.processed_dir, exist_ok=True)
 
+        self.excel = ExcelReader(
+            cache_dir=excel_cache_dir,
+            engine=excel_engine
+        )
+
+    def is_supported(self, filename):
+        return filename.endswith(".csv") or filename.endswith(".xlsx") \
+            or is_compressed(filename)
+
     def find_files(self):
         files = []
 
         for file in os.listdir(self.raw_dir):
-            if file.endswith(".csv") or file.endswith(".xlsx"):
+            if self.is_supported(file):
                 files.append(file)
 
         return files
 
+    def read_csv(self, open_source):
+
+        # open_source() returns a fresh binary stream, so each encoding
+        # attempt starts again from the first byte
+        encodings = ["utf-8", "latin1", "ISO-8859-1", "cp1252"]
+
+        for enc in encodings:
+            try:
+                with open_source() as f:
+                    df = pd.read_csv(f, encoding=enc)
+                print(f"✅ Loaded with encoding: {enc}")
+                return df
+            except UnicodeDecodeError:
+                print(f"⚠️ Failed with encoding: {enc}")
+                continue
+
+        raise ValueError("❌ Could not decode CSV with known encodings")
+
+    def load_compressed(self, path):
+
+        frames = []
+
+        # Decompressed on a background thread straight into the parser;
+        # archive members are concatenated in archive order
+        for member, opener in csv_members(path):
+
+            print(f"📦 Streaming: {os.path.basename(member)}")
+
+            frames.append(
+                self.read_csv(lambda: background_stream(opener))
+            )
+
+        if not frames:
+            raise ValueError("❌ No CSV files found in archive")
+
+        return pd.concat(frames, ignore_index=True)
+
     def load_file(self, filename):
         path = os.path.join(self.raw_dir, filename)
 
         if filename.endswith(".csv"):
+            return self.read_csv(lambda: open(path, "rb"))
 
-            encodings = ["utf-8", "latin1", "ISO-8859-1", "cp1252"]
-
-            for enc in encodings:
-                try:
-                    df = pd.read_csv(path, encoding=enc)
-                    print(f"✅ Loaded with encoding: {enc}")
-                    return df
-                except UnicodeDecodeError:
-                    print(f"⚠️ Failed with encoding: {enc}")
-                    continue
-
-            raise ValueError("❌ Could not decode CSV with known encodings")
+        elif is_compressed(filename):
+            return self.load_compressed(path)
 
         else:
-            df = pd.read_excel(path)
-            print("✅ Loaded Excel file")
-            return df
+            # All sheets, parsed once per workbook content
+            return self.excel.load(path)
 
     def analyze_schema(self, df):
         schema = {}
@@ -50,35 +107,73 @@ class IngestionAgent:
 
         return schema
 
-    def profile_data(self, df):
+    def profile_data(self, df, hashes=None):
+
+        # Sketches (distinct counts, quantiles, heavy hitters, null
+        # rates) in one pass over chunks; the sketch state is kept so
+        # later stages and other files can build on it
+        if hashes is None:
+            hashes = row_hashes(df)
+
+        sketches = profile_frame(df)
+        columns = sketches.summary()["columns"]
 
         profile = {
             "rows": int(df.shape[0]),
             "columns": int(df.shape[1]),
-            "missing_values": df.isnull().sum().to_dict(),
-            "duplicates": int(df.duplicated().sum())
+            "missing_values": {
+                col: info["nulls"] for col, info in columns.items()
+            },
+            "duplicates": int(duplicated(hashes).sum()),
+            "sketches": sketches,
+            "summary": columns
         }
 
         return profile
 
+    def save_profile(self, profile, output):
+
+        name = os.path.splitext(os.path.basename(output))[0]
+
+        return save_profile(
+            os.path.join(self.profile_dir, f"{name}.json"),
+            profile["sketches"]
+        )
+
+    def output_name(self, filename):
+
+        # Downstream stages read CSV only, so workbooks and compressed
+        # inputs land as .csv
+        name, ext = os.path.splitext(filename)
+
+        if ext == ".xlsx":
+            return name + ".csv"
+
+        return strip_suffix(filename)
+
     def save_processed(self, df, filename):
 
-        out_path = os.path.join(self.processed_dir, filename)
+        out_path = os.path.join(self.processed_dir, self.output_name(filename))
 
         df.to_csv(out_path, index=False)
 
         return out_path
 
-    def run(self):
+    def run(self, files=None):
 
         print("\n📥 Ingestion Agent Started\n")
 
-        files = self.find_files()
+        if files is None:
+            files = self.find_files()
 
         if not files:
             print("❌ No files found in raw directory")
             return
 
+        # One bad file doesn't stop the others; the count tells the
+        # orchestrator not to checkpoint the stage
+        failed = 0
+
         for file in files:
 
             print(f"📄 Processing: {file}\n")
@@ -87,10 +182,21 @@ class IngestionAgent:
                 df = self.load_file(file)
 
                 schema = self.analyze_schema(df)
-                profile = self.profile_data(df)
+                # Hashed once here; Quality reuses them for dedup
+                hashes = row_hashes(df)
+
+                profile = self.profile_data(df, hashes)
 
                 output = self.save_processed(df, file)
 
+                save_hashes(output, hashes)
+
+                # Written after the CSV, so Quality can tell it is current
+                self.save_profile(profile, output)
+
+                # Later stages parse with this instead of inferring
+                changes = self.schemas.record("ingestion", output, df)
+
                 print("\n📊 Schema:")
                 for k, v in schema.items():
                     print(f"   {k}: {v}")
@@ -100,9 +206,22 @@ class IngestionAgent:
                 print(f"   Columns: {profile['columns']}")
                 print(f"   Duplicates: {profile['duplicates']}")
 
+                print("\n🔎 Columns (≈ distinct, null rate):")
+                for col, info in profile["summary"].items():
+                    print(f"   {col}: {info['distinct']:,} distinct, "
+                          f"{info['null_rate']:.1%} null")
+
+                    for value, count in info.get("top", [])[:3]:
+                        print(f"      {value}: ~{count:,}")
+
                 print(f"\n💾 Saved to: {output}\n")
 
+                print_changes(output, changes)
+
             except Exception as e:
                 print(f"❌ Error processing {file}: {e}")
+                failed += 1
 
         print("✅ Ingestion Complete\n")
+
+        return failed
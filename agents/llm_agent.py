@@ -1,24 +1,53 @@
 import os
-from dotenv import load_dotenv
-from groq import Groq
+import time
 
-load_dotenv()
+from core.vector_index import VectorIndex, document_id
+from core.tracing import instrument
 
 
+@instrument(
+    "llm",
+    "read_report", "retrieve_history", "generate_insight", "stream_insight",
+    "save_insight"
+)
 class LLMInsightAgent:
 
     def __init__(self,
                  report_dir="data/reports",
-                 insight_dir="data/insights"):
+                 insight_dir="data/insights",
+                 index_dir="data/index",
+                 stream=True,
+                 top_k=3,
+                 reuse_threshold=0.98):
 
         self.report_dir = report_dir
         self.insight_dir = insight_dir
+        self.index_dir = index_dir
+        self.stream = stream
+        self.top_k = top_k
+        self.reuse_threshold = reuse_threshold
 
         os.makedirs(self.insight_dir, exist_ok=True)
 
-        self.client = Groq(
-            api_key=os.getenv("GROQ_API_KEY")
-        )
+        self._client = None
+
+    @property
+    def client(self):
+
+        # Built on first use: groq/dotenv are only imported when the LLM
+        # node actually calls the API.
+        if self._client is None:
+
+            from dotenv import load_dotenv
+            from groq import Groq
+
+            load_dotenv()
+
+            self._client = Groq(
+                api_key=os.getenv("GROQ_API_KEY")
+            )
+
+        return self._client
 
     def find_latest_report(self):
 
@@ -39,7 +68,60 @@ class LLMInsightAgent:
         with open(path, "r") as f:
             return f.read()
 
-    def generate_insight(self, report):
+    def load_index(self):
+
+        # Retrieval is best-effort: insights still generate without it
+        try:
+            return VectorIndex(self.index_dir)
+
+        except Exception as e:
+            print(f"⚠️ Vector index unavailable: {e}")
+            return None
+
+    def retrieve_history(self, index, report):
+
+        if index is None:
+            return []
+
+        history = []
+
+        for match in index.query(report, k=self.top_k + 1):
+
+            match["insight"] = index.get_insight(match["id"])
+
+            history.append(match)
+
+        return history
+
+    def find_reusable(self, history):
+
+        for match in history:
+            if match["similarity"] >= self.reuse_threshold \
+                    and match["insight"]:
+                return match
+
+        return None
+
+    def format_history(self, history):
+
+        sections = []
+
+        for i, match in enumerate(history, start=1):
+
+            section = (
+                f"--- Past period {i} "
+                f"(similarity {match['similarity']:.2f}) ---\n"
+                f"{match['report']}"
+            )
+
+            if match["insight"]:
+                section += f"\nPrevious analysis:\n{match['insight']}"
+
+            sections.append(section)
+
+        return "\n\n".join(sections)
+
+    def build_messages(self, report, history=None):
 
         prompt = f"""
 You are a senior business data analyst.
@@ -55,24 +137,89 @@ Report:
 {report}
 """
 
+        if history:
+            prompt += f"""
+Similar past periods, for comparison:
+{self.format_history(history)}
+"""
+
+        return [
+            {"role": "system", "content": "You are a business analyst."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def generate_insight(self, report, history=None):
+
         response = self.client.chat.completions.create(
             model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are a business analyst."},
-                {"role": "user", "content": prompt}
-            ]
+            messages=self.build_messages(report, history)
         )
 
         return response.choices[0].message.content
 
-    def save_insight(self, insight, filename):
+    def insight_path(self, filename):
 
-        out_path = os.path.join(
+        return os.path.join(
             self.insight_dir,
             filename.replace("_report.txt", "_insight.txt")
         )
 
-        with open(out_path, "w") as f:
+    def stream_insight(self, report, filename, history=None):
+
+        # Tokens go to a sidecar file as they arrive; the final insight
+        # file only appears once generation completes (atomic rename).
+        out_path = self.insight_path(filename)
+        stream_path = out_path + ".partial"
+
+        start = time.perf_counter()
+        first_token = None
+
+        try:
+            with open(stream_path, "w", encoding="utf-8") as f:
+
+                stream = self.client.chat.completions.create(
+                    model="llama-3.1-8b-instant",
+                    messages=self.build_messages(report, history),
+                    stream=True
+                )
+
+                for chunk in stream:
+
+                    if not chunk.choices:
+                        continue
+
+                    delta = chunk.choices[0].delta.content
+
+                    if not delta:
+                        continue
+
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+
+                    f.write(delta)
+                    f.flush()
+
+            os.replace(stream_path, out_path)
+
+        except Exception:
+
+            if os.path.exists(stream_path):
+                os.remove(stream_path)
+
+            raise
+
+        timings = {
+            "time_to_first_token": first_token,
+            "total_time": time.perf_counter() - start
+        }
+
+        return out_path, timings
+
+    def save_insight(self, insight, filename):
+
+        out_path = self.insight_path(filename)
+
+        with open(out_path, "w", encoding="utf-8") as f:
             f.write(insight)
 
         return out_path
@@ -81,18 +228,76 @@ Report:
 
         print("\n🧠 LLM Insight Agent Started\n")
 
+        # 1 if no insight was written, so the stage isn't checkpointed
+        failed = 0
+
         try:
             report_file = self.find_latest_report()
             report = self.read_report(report_file)
 
-            insight = self.generate_insight(report)
+            index = self.load_index()
+            report_id = document_id(report)
+
+            history = self.retrieve_history(index, report)
+            reusable = self.find_reusable(history)
+
+            if reusable:
+
+                path = self.save_insight(reusable["insight"], report_file)
+
+                print(
+                    f"♻️ Reused insight from {reusable['source']} "
+                    f"(similarity {reusable['similarity']:.3f})"
+                )
+
+            else:
+
+                history = [
+                    m for m in history if m["id"] != report_id
+                ][:self.top_k]
+
+                if history:
+                    print(f"🔎 Retrieved {len(history)} similar past periods")
 
-            path = self.save_insight(insight, report_file)
+                if self.stream:
+
+                    path, timings = self.stream_insight(
+                        report,
+                        report_file,
+                        history
+                    )
+
+                    if timings["time_to_first_token"] is not None:
+                        print(
+                            f"⏱️ Time to first insight: "
+                            f"{timings['time_to_first_token']:.2f}s"
+                        )
+                    print(
+                        f"⏱️ Total generation: "
+                        f"{timings['total_time']:.2f}s"
+                    )
+
+                else:
+
+                    insight = self.generate_insight(report, history)
+
+                    path = self.save_insight(insight, report_file)
+
+                if index is not None:
+
+                    with open(path, "r", encoding="utf-8") as f:
+                        insight = f.read()
+
+                    index.add_report(report, report_file)
+                    index.add_insight(report_id, insight, report_file)
 
             print("✅ AI Insights Generated")
             print(f"📄 Saved to: {path}\n")
 
         except Exception as e:
             print(f"❌ LLM Error: {e}")
+            failed = 1
 
         print("✅ LLM Agent Complete\n")
+
+        return failed
@@ -1,5 +1,5 @@
 import os
-import pandas as pd
+import numpy as np
 import joblib
 
 from sklearn.model_selection import train_test_split
@@ -7,17 +7,57 @@ from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_squared_error
 
-
+from core.forest import compiled_path, export_forest
+from core.frames import split_target
+from core.incremental import (
+    TREES_PER_BATCH,
+    MAX_TREES,
+    ModelRegistry,
+    combine_stats,
+    file_digest,
+    forest_trees,
+    ols_stats,
+    solve_ols,
+    training_mode
+)
+from core.matrix import MATRIX_DIR, matrix_path, write_matrix
+from core.resources import resources
+from core.schema import SchemaRegistry
+from core.tracing import instrument
+
+
+@instrument(
+    "ml",
+    "load_data", "training_matrix", "train_models", "train_incremental",
+    "evaluate_models", "save_model"
+)
 class MLAgent:
 
     def __init__(self,
                  feature_dir="data/features",
-                 model_dir="models"):
+                 model_dir="models",
+                 schema_dir="data/schemas",
+                 matrix_dir=MATRIX_DIR,
+                 mode=None,
+                 trees_per_batch=TREES_PER_BATCH,
+                 max_trees=MAX_TREES,
+                 n_estimators=None):
 
         self.feature_dir = feature_dir
         self.model_dir = model_dir
+        self.matrix_dir = matrix_dir
+        self.schemas = SchemaRegistry(schema_dir)
+
+        # Incremental mode keeps its models and registry here
+        self.mode = mode or training_mode()
+        self.state_dir = os.path.join(model_dir, "incremental")
+        self.forest_path = os.path.join(self.state_dir, "forest.joblib")
+        self.trees_per_batch = trees_per_batch
+        self.max_trees = max_trees
+        self.n_estimators = n_estimators or forest_trees()
 
         os.makedirs(self.model_dir, exist_ok=True)
+        os.makedirs(self.matrix_dir, exist_ok=True)
 
     def find_files(self):
 
@@ -29,23 +69,54 @@ class MLAgent:
     def load_data(self, filename):
 
         path = os.path.join(self.feature_dir, filename)
-        return pd.read_csv(path)
+        return self.schemas.read_csv(path, "etl")
+
+    def prepare_data(self, df, filename="train.csv"):
+
+        matrix, target, n_train = self.training_matrix(df, filename)
+
+        return (
+            matrix[:n_train],
+            matrix[n_train:],
+            target[:n_train],
+            target[n_train:]
+        )
 
-    def prepare_data(self, df):
+    def training_matrix(self, df, filename="train.csv"):
 
         if "Revenue" not in df.columns:
             raise ValueError("Revenue column not found in dataset")
 
-        X = df.drop(columns=["Revenue"])
-        y = df["Revenue"]
+        X, y = split_target(df)
 
-        return train_test_split(
-            X,
-            y,
+        # Rows missing a feature can't be fitted (an unparseable
+        # InvoiceDate leaves its date parts empty); they are left out
+        complete = np.ones(len(df), dtype=bool)
+
+        for col in X.columns:
+            complete &= X[col].notna().to_numpy()
+
+        # Split row positions, not frames (same rows as splitting X)
+        train_idx, test_idx = train_test_split(
+            np.flatnonzero(complete),
             test_size=0.2,
             random_state=42
         )
 
+        # The models work in float32 anyway (the forest converts to it);
+        # rows go to disk train-first, so both halves are zero-copy
+        # slices of one read-only mapping
+        order = np.concatenate([train_idx, test_idx])
+
+        matrix = write_matrix(
+            X,
+            matrix_path(self.matrix_dir, filename),
+            order
+        )
+        target = y.to_numpy(dtype=np.float64)[order]
+
+        return matrix, target, len(train_idx)
+
     def train_models(self, X_train, y_train):
 
         models = {}
@@ -57,15 +128,197 @@ class MLAgent:
 
         # Random Forest
         rf = RandomForestRegressor(
-            n_estimators=100,
+            n_estimators=self.n_estimators,
             random_state=42,
-            n_jobs=-1
+            n_jobs=resources.threads()
         )
         rf.fit(X_train, y_train)
         models["RandomForest"] = rf
 
         return models
 
+    # ---------- Incremental ---------- #
+
+    def ols_path(self, file):
+
+        stem = os.path.splitext(file)[0]
+
+        return os.path.join(self.state_dir, f"{stem}.ols.npz")
+
+    def load_forest(self):
+
+        try:
+            return joblib.load(self.forest_path)
+
+        except FileNotFoundError:
+            return None
+
+    def load_linear(self, registry):
+
+        # Exact: the fit over every batch seen, from per-batch sums
+        parts = [
+            dict(np.load(self.ols_path(b["file"])))
+            for b in registry.batches("LinearRegression")
+        ]
+
+        return solve_ols(combine_stats(parts))
+
+    def update_linear(self, registry, file, digest, X_train, y_train):
+
+        # A changed batch just replaces its own sums
+        np.savez(self.ols_path(file), **ols_stats(X_train, y_train))
+
+        registry.record("LinearRegression", file, digest, len(X_train))
+
+        return self.load_linear(registry)
+
+    def fold_linear(self, registry, file, digest, X, y):
+
+        # Rows added to a batch's sums after its fit was scored: the
+        # sums stay exact without refitting the rows already in them
+        path = self.ols_path(file)
+
+        with np.load(path) as f:
+            stats = combine_stats([dict(f), ols_stats(X, y)])
+
+        np.savez(path, **stats)
+
+        registry.record(
+            "LinearRegression", file, digest, int(stats["n"][0])
+        )
+
+        return self.load_linear(registry)
+
+    def current_models(self, registry, columns):
+
+        # The incremental models as saved, or None before the first
+        # batch (or once the feature columns changed)
+        if registry.data["columns"] != list(columns) or \
+                not registry.batches("LinearRegression"):
+            return None
+
+        forest = self.load_forest()
+
+        if forest is None:
+            return None
+
+        return {
+            "LinearRegression": self.load_linear(registry),
+            "RandomForest": forest
+        }
+
+    def update_forest(self, registry, forest, file, digest,
+                      X_train, y_train):
+
+        batches = registry.batches("RandomForest")
+
+        if forest is None:
+            forest = RandomForestRegressor(
+                n_estimators=self.trees_per_batch,
+                warm_start=True,
+                random_state=42
+            )
+            forest.estimators_ = []
+
+        # A changed batch: drop the trees it grew before growing new ones
+        start = 0
+
+        for b in batches:
+            if b["file"] == file:
+                del forest.estimators_[start:start + b["trees"]]
+                break
+            start += b["trees"]
+
+        # A reloaded forest keeps the n_jobs of the run that saved it
+        forest.n_jobs = resources.threads()
+
+        # warm_start: only the new trees are fit, on this batch alone
+        forest.n_estimators = len(forest.estimators_) + self.trees_per_batch
+        forest.fit(X_train, y_train)
+
+        registry.record(
+            "RandomForest", file, digest, len(X_train), self.trees_per_batch
+        )
+
+        # Over budget: retire whole batches of trees, oldest first
+        if self.max_trees:
+            for b in registry.batches("RandomForest")[:-1]:
+
+                if len(forest.estimators_) <= self.max_trees:
+                    break
+
+                del forest.estimators_[:b["trees"]]
+                registry.retire("RandomForest", b["file"])
+
+            forest.n_estimators = len(forest.estimators_)
+
+        return forest
+
+    def update_models(self, registry, file, digest, X_train, y_train,
+                      columns):
+
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        forest = self.load_forest()
+
+        if registry.data["columns"] != list(columns):
+            registry.reset(columns)
+            forest = None
+
+        return {
+            "LinearRegression": self.update_linear(
+                registry, file, digest, X_train, y_train
+            ),
+            "RandomForest": self.update_forest(
+                registry, forest, file, digest, X_train, y_train
+            )
+        }
+
+    def train_incremental(self, registry, file, digest, matrix, target,
+                          n_train, columns):
+
+        # One fit per batch. Test-then-train: the batch is scored by the
+        # models as they stood before it, then folded in whole.
+        previous = self.current_models(registry, columns)
+
+        if previous is not None:
+
+            results = self.evaluate_models(previous, matrix, target)
+
+            models = self.update_models(
+                registry, file, digest, matrix, target, columns
+            )
+
+        else:
+
+            # Nothing to score against yet: the first batch is fit on
+            # its 80% and scored on the rest. The held-out rows join the
+            # linear sums afterwards; the first trees never see them.
+            models = self.update_models(
+                registry, file, digest,
+                matrix[:n_train], target[:n_train], columns
+            )
+
+            results = self.evaluate_models(
+                models, matrix[n_train:], target[n_train:]
+            )
+
+            models["LinearRegression"] = self.fold_linear(
+                registry, file, digest,
+                matrix[n_train:], target[n_train:]
+            )
+
+        self.save_state(registry, models)
+
+        return models, results
+
+    def save_state(self, registry, models):
+
+        joblib.dump(models["RandomForest"], self.forest_path)
+
+        # Written last: it only names batches whose models are on disk
+        registry.save()
+
     def evaluate_models(self, models, X_test, y_test):
 
         results = {}
@@ -96,7 +349,12 @@ class MLAgent:
 
         return best
 
-    def save_model(self, model, name):
+    def save_model(self, model, name, columns=None):
+
+        # Fitted on the bare matrix: restore the column names so callers
+        # predicting on a DataFrame (monitoring) are still checked
+        if columns is not None:
+            model.feature_names_in_ = np.asarray(columns, dtype=object)
 
         path = os.path.join(
             self.model_dir,
@@ -105,38 +363,75 @@ class MLAgent:
 
         joblib.dump(model, path)
 
+        # Flat float32 copy of a forest for fast scoring (monitoring)
+        if isinstance(model, RandomForestRegressor):
+            compiled = export_forest(model, compiled_path(path))
+            print(f"⚡ Compiled predictor: {compiled}")
+
         return path
 
-    def run(self):
+    def run(self, files=None):
 
         print("\n🤖 ML Agent Started\n")
 
-        files = self.find_files()
+        if files is None:
+            files = self.find_files()
 
         if not files:
             print("❌ No feature files found")
             return
 
+        incremental = self.mode == "incremental"
+
+        if incremental:
+            registry = ModelRegistry(self.state_dir)
+
+        # Files that failed to train; the orchestrator won't checkpoint
+        # the stage while any did
+        failed = 0
+
         for file in files:
 
+            # ETL writes nothing for batches with no clean rows
+            if not os.path.exists(os.path.join(self.feature_dir, file)):
+                print(f"⏭️ {file}: no features\n")
+                continue
+
+            if incremental:
+
+                digest = file_digest(os.path.join(self.feature_dir, file))
+
+                if all(registry.has_seen(name, file, digest)
+                       for name in ["LinearRegression", "RandomForest"]):
+                    print(f"⏭️ {file}: already trained\n")
+                    continue
+
             print(f"📄 Training on: {file}\n")
 
             try:
                 df = self.load_data(file)
 
-                X_train, X_test, y_train, y_test = \
-                    self.prepare_data(df)
+                matrix, target, n_train = self.training_matrix(df, file)
 
-                models = self.train_models(
-                    X_train,
-                    y_train
-                )
+                columns = df.columns.drop("Revenue")
+                del df
 
-                results = self.evaluate_models(
-                    models,
-                    X_test,
-                    y_test
-                )
+                if incremental:
+                    models, results = self.train_incremental(
+                        registry, file, digest,
+                        matrix, target, n_train, columns
+                    )
+
+                else:
+                    models = self.train_models(
+                        matrix[:n_train],
+                        target[:n_train]
+                    )
+                    results = self.evaluate_models(
+                        models,
+                        matrix[n_train:],
+                        target[n_train:]
+                    )
 
                 print("📊 Evaluation Results:")
                 for name, metrics in results.items():
@@ -151,7 +446,8 @@ class MLAgent:
 
                 model_path = self.save_model(
                     best_model,
-                    best
+                    best,
+                    columns
                 )
 
                 print(f"\n🏆 Best Model: {best}")
@@ -159,5 +455,8 @@ class MLAgent:
 
             except Exception as e:
                 print(f"❌ Error during training: {e}")
+                failed += 1
 
         print("✅ ML Training Complete\n")
+
+        return failed
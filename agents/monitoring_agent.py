@@ -1,24 +1,70 @@
 import os
+import json
 import pandas as pd
 import numpy as np
 import joblib
 
+from core.feature_store import STORE_DIR, DATE_PARTS, FeatureStore
+from core.forest import load_compiled
+from core.frames import split_target
+from core.resources import resources
+from core.schema import SchemaRegistry
+from core.sketches import drift_report, profile_frame
+from core.tracing import instrument
 
+# Labels rather than measurements: their distribution says nothing
+# about drift
+IDENTIFIERS = ["InvoiceNo", "StockCode", "CustomerID"]
+
+# Customer totals to date: they grow with the history by construction,
+# so any window differs from the past
+CUMULATIVE = ["recency_days", "frequency", "monetary"]
+
+
+@instrument(
+    "monitor",
+    "load_latest_data", "load_model", "detect_data_drift", "evaluate_model",
+    "save_report", "trigger_retraining"
+)
 class MonitoringAgent:
 
     def __init__(self,
                  feature_dir="data/features",
                  model_dir="models",
-                 monitor_dir="monitoring"):
+                 monitor_dir="monitoring",
+                 schema_dir="data/schemas",
+                 store_dir=STORE_DIR,
+                 window_days=7):
 
         self.feature_dir = feature_dir
         self.model_dir = model_dir
         self.monitor_dir = monitor_dir
+        self.schemas = SchemaRegistry(schema_dir)
+        self.store_dir = store_dir
+        self.window_days = window_days
+
+        # path → (mtime, model); keeps the model warm across runs when
+        # the agent is long-lived (watch mode)
+        self.model_cache = {}
 
         os.makedirs(self.monitor_dir, exist_ok=True)
 
     def load_latest_data(self):
 
+        # The last window_days of data: only the partitions overlapping
+        # the window are read. Re-opened each time for a fresh index.
+        store = FeatureStore(self.store_dir)
+
+        if not store.empty():
+
+            df = store.window(self.window_days)
+
+            print(f"🗓️ Window: last {self.window_days} days "
+                  f"({len(df):,} rows)")
+
+            return df
+
+        # No partitioned features yet: newest feature file
         files = [
             f for f in os.listdir(self.feature_dir)
             if f.endswith(".csv")
@@ -30,7 +76,7 @@ class MonitoringAgent:
         latest = max(files)
         path = os.path.join(self.feature_dir, latest)
 
-        return pd.read_csv(path)
+        return self.schemas.read_csv(path, "etl")
 
     def load_model(self):
 
@@ -45,32 +91,74 @@ class MonitoringAgent:
         best = models[0]
         path = os.path.join(self.model_dir, best)
 
-        return joblib.load(path), best
+        mtime = os.path.getmtime(path)
+        cached = self.model_cache.get(path)
+
+        if not cached or cached[0] != mtime:
+
+            # A compiled forest predicts without unpickling any trees
+            model = load_compiled(path) or joblib.load(path)
+            self.model_cache[path] = (mtime, model)
+
+        model = self.model_cache[path][1]
+
+        # sklearn estimators keep the n_jobs they were trained with
+        if hasattr(model, "n_jobs"):
+            model.n_jobs = resources.threads()
+
+        return model, best
+
+    def encoded_columns(self, df):
+
+        # ETL's categorical outputs (dictionary/frequency codes, hash
+        # blocks), from the encodings it persists next to the features
+        try:
+            with open(os.path.join(self.feature_dir, "encodings.json")) as f:
+                encoded = list(json.load(f))
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+        return [
+            col for col in df.columns
+            if col in encoded or col.split("_hash")[0] in encoded
+        ]
 
     def detect_data_drift(self, df):
 
-        drift_report = {}
+        # The window's sketches against the history before it, merged
+        # from the partition profiles ETL stored, so the history is
+        # never re-read. Each numeric column gets mean/std for both and
+        # the KS distance between their digests. Date parts always
+        # differ between a window and its history, cumulative customer
+        # totals grow with it, and identifiers and encoded categories
+        # aren't measurements, so they are all left out.
+        store = FeatureStore(self.store_dir)
+        reference = None
 
-        numeric_cols = df.select_dtypes(
-            include=["int64", "float64"]
-        ).columns
+        if not store.empty():
 
-        for col in numeric_cols:
+            _, last = store.date_range()
+            start = last - pd.Timedelta(days=self.window_days - 1)
 
-            drift_report[col] = {
-                "mean": float(df[col].mean()),
-                "std": float(df[col].std())
-            }
+            reference = store.profile(end=start - pd.Timedelta(days=1))
 
-        return drift_report
+        skip = DATE_PARTS + IDENTIFIERS + CUMULATIVE + \
+            self.encoded_columns(df)
+
+        current = profile_frame(
+            df.drop(columns=skip, errors="ignore"),
+            heavy_hitters=[]
+        )
+
+        return drift_report(reference, current)
 
     def evaluate_model(self, model, df):
 
         if "Revenue" not in df.columns:
             return None
 
-        X = df.drop(columns=["Revenue"])
-        y = df["Revenue"]
+        X, y = split_target(df)
 
         preds = model.predict(X)
 
@@ -119,6 +207,9 @@ class MonitoringAgent:
 
         print("\n📡 Monitoring Agent Started\n")
 
+        # 1 if the check failed, so the orchestrator doesn't checkpoint it
+        failed = 0
+
         try:
             df = self.load_latest_data()
             model, name = self.load_model()
@@ -132,7 +223,13 @@ class MonitoringAgent:
                 name
             )
 
+            drifted = [col for col, stats in drift.items()
+                       if stats.get("drift")]
+
             print("✅ Drift Analysis Complete")
+
+            if drifted:
+                print(f"🌊 Drift vs history: {', '.join(drifted)}")
             print("📊 Model Performance:", performance)
             print(f"📄 Report saved to: {report}\n")
 
@@ -143,5 +240,8 @@ class MonitoringAgent:
 
         except Exception as e:
             print(f"❌ Monitoring Error: {e}")
+            failed = 1
 
         print("✅ Monitoring Complete\n")
+
+        return failed
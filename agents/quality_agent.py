@@ -1,16 +1,65 @@
 import os
+import json
 import pandas as pd
 import numpy as np
 
-
+from core.dedup import (
+    RowHashIndex,
+    row_hashes,
+    duplicated,
+    load_hashes
+)
+import core.frames  # noqa: F401 (copy-on-write on pandas 2.x)
+from core.rules import RuleSet
+from core.schema import SchemaRegistry, print_changes
+from core.sketches import PROFILE_DIR, load_profile
+from core.tracing import instrument
+
+# Left missing: a guest line has no customer, and a filled-in ID would
+# credit every guest purchase to one made-up customer
+KEEP_MISSING = ["CustomerID"]
+
+
+@instrument(
+    "quality",
+    "load_data", "remove_duplicates", "remove_seen", "validate",
+    "handle_missing", "fix_dates", "clean_text", "detect_outliers",
+    "save_clean"
+)
 class QualityAgent:
 
-    def __init__(self, processed_dir="data/processed", clean_dir="data/clean"):
+    def __init__(self, processed_dir="data/processed", clean_dir="data/clean",
+                 schema_dir="data/schemas", dedup_dir="data/dedup",
+                 dedup_memory_mb=None, rules_path=None,
+                 violations_dir="data/quality", profile_dir=PROFILE_DIR):
         self.processed_dir = processed_dir
+        self.profile_dir = profile_dir
         self.clean_dir = clean_dir
+        self.schemas = SchemaRegistry(schema_dir)
+
+        # Business rules from the declarative spec (rules/quality_rules.json
+        # unless overridden); violating rows are kept here for review
+        self.rules = RuleSet.load(rules_path)
+        self.violations_dir = violations_dir
+
+        self.dedup_dir = dedup_dir
+        self.dedup_memory_mb = dedup_memory_mb
+        self._seen_index = None
 
         os.makedirs(self.clean_dir, exist_ok=True)
 
+    @property
+    def seen_index(self):
+
+        # Opened on first use: loading the Bloom filter costs its size
+        if self._seen_index is None:
+            self._seen_index = RowHashIndex(
+                self.dedup_dir,
+                memory_mb=self.dedup_memory_mb
+            )
+
+        return self._seen_index
+
     def find_files(self):
 
         files = []
@@ -19,48 +68,145 @@ class QualityAgent:
             if file.endswith(".csv"):
                 files.append(file)
 
-        return files
+        # Name order decides which batch is "earlier" for cross-batch
+        # dedup (dated export names sort chronologically)
+        return sorted(files)
 
     def load_data(self, filename):
 
         path = os.path.join(self.processed_dir, filename)
-        df = pd.read_csv(path)
+        df = self.schemas.read_csv(path, "ingestion")
 
         return df
 
-    def remove_duplicates(self, df):
+    def load_hashes(self, filename, df):
+
+        # Written by ingestion next to the file; recomputed if missing
+        path = os.path.join(self.processed_dir, filename)
+
+        hashes = load_hashes(path, len(df))
+
+        if hashes is None:
+            hashes = row_hashes(df)
+
+        return hashes
+
+    def load_profile(self, filename):
+
+        # Ingestion's sketch profile of the file; None if it is missing
+        # or older than the file
+        path = os.path.join(self.processed_dir, filename)
+        stem = os.path.splitext(filename)[0]
+
+        return load_profile(
+            os.path.join(self.profile_dir, f"{stem}.json"),
+            source=path
+        )
+
+    def remove_duplicates(self, df, hashes=None):
+
+        if hashes is None:
+            hashes = row_hashes(df)
+
+        dropped = duplicated(hashes)
+        removed = int(dropped.sum())
+
+        # Only materialise a filtered copy when there is something to drop
+        if removed:
+            df = df[~dropped]
+            hashes = hashes[~dropped]
+
+        return df, hashes, removed
+
+    def remove_seen(self, filename, df, hashes):
+
+        # Rows already delivered by an earlier batch (overlapping exports)
+        dropped = self.seen_index.seen(filename, hashes)
+        removed = int(dropped.sum())
+
+        if removed:
+            df = df[~dropped]
+            hashes = hashes[~dropped]
+
+        return df, hashes, removed
+
+    def validate(self, df, filename):
+
+        # One compiled pass over every rule: drop rules remove rows, fix
+        # rules rewrite values, flag rules only report. Dropped and
+        # flagged rows go to <name>.violations.csv with their bitmask.
+        df, mask, dropped, dropped_mask, counts = self.rules.apply(df)
 
-        before = len(df)
-        df = df.drop_duplicates()
-        after = len(df)
+        stem = os.path.splitext(filename)[0]
+        path = os.path.join(self.violations_dir, f"{stem}.violations.csv")
 
-        removed = before - after
+        flagged = (mask & self.rules.flag_bits) != 0
 
-        return df, removed
+        if len(dropped) or flagged.any():
 
-    def handle_missing(self, df):
+            os.makedirs(self.violations_dir, exist_ok=True)
+
+            violations = pd.concat([
+                df[flagged].assign(violations=mask[flagged], dropped=False),
+                dropped.assign(violations=dropped_mask, dropped=True)
+            ])
+
+            violations.to_csv(path, index=False)
+
+        elif os.path.exists(path):
+            os.remove(path)
+
+        report = self.rules.describe(counts)
+
+        os.makedirs(self.violations_dir, exist_ok=True)
+
+        with open(os.path.join(self.violations_dir, f"{stem}.rules.json"),
+                  "w") as f:
+            json.dump(report, f, indent=2)
+
+        return df, report, len(dropped)
+
+    def handle_missing(self, df, profile=None):
 
         report = {}
+        fill_values = {}
+
+        # Rows only get removed before this point, so a column the
+        # profile saw without nulls has none now: only the others (and
+        # any the profile doesn't know) are counted
+        columns = df.columns
+
+        if profile is not None:
+            columns = [
+                col for col in df.columns
+                if col not in profile.columns or profile.columns[col].nulls
+            ]
 
-        for col in df.columns:
+        # One null-count pass, then a single fillna that only rewrites
+        # the columns that actually have gaps
+        missing_counts = df[columns].isnull().sum()
 
-            missing = df[col].isnull().sum()
+        for col, missing in missing_counts[missing_counts > 0].items():
 
-            if missing > 0:
+            if col in KEEP_MISSING:
+                report[col] = {"missing": int(missing), "strategy": "kept"}
+                continue
 
-                if df[col].dtype in ["int64", "float64"]:
-                    fill_value = df[col].median()
-                    df[col] = df[col].fillna(fill_value)
-                    strategy = "median"
+            if df[col].dtype in ["int64", "float64"]:
+                fill_values[col] = df[col].median()
+                strategy = "median"
 
-                else:
-                    df[col] = df[col].fillna("Unknown")
-                    strategy = "constant:Unknown"
+            else:
+                fill_values[col] = "Unknown"
+                strategy = "constant:Unknown"
 
-                report[col] = {
-                    "missing": int(missing),
-                    "strategy": strategy
-                }
+            report[col] = {
+                "missing": int(missing),
+                "strategy": strategy
+            }
+
+        if fill_values:
+            df = df.fillna(fill_values)
 
         return df, report
 
@@ -88,7 +234,7 @@ class QualityAgent:
 
         return df
 
-    def detect_outliers(self, df):
+    def detect_outliers(self, df, profile=None, rewritten=()):
 
         outlier_report = {}
 
@@ -98,8 +244,19 @@ class QualityAgent:
 
         for col in numeric_cols:
 
-            q1 = df[col].quantile(0.25)
-            q3 = df[col].quantile(0.75)
+            # Quartiles from ingestion's digest while it still describes
+            # the column (see run), without another sort of it
+            sketch = profile.columns.get(col) \
+                if profile and col not in rewritten else None
+
+            if sketch is not None and sketch.digest is not None \
+                    and len(sketch.digest.means):
+                q1 = sketch.digest.quantile(0.25)
+                q3 = sketch.digest.quantile(0.75)
+
+            else:
+                q1 = df[col].quantile(0.25)
+                q3 = df[col].quantile(0.75)
 
             iqr = q3 - q1
 
@@ -122,11 +279,12 @@ class QualityAgent:
 
         return out_path
 
-    def run(self):
+    def run(self, files=None):
 
         print("\n🧹 Quality Agent Started\n")
 
-        files = self.find_files()
+        if files is None:
+            files = self.find_files()
 
         if not files:
             print("❌ No processed files found")
@@ -138,19 +296,69 @@ class QualityAgent:
 
             df = self.load_data(file)
 
-            df, removed = self.remove_duplicates(df)
+            hashes = self.load_hashes(file, df)
 
-            df, missing_report = self.handle_missing(df)
+            profile = self.load_profile(file)
+
+            df, hashes, removed = self.remove_duplicates(df, hashes)
+
+            df, hashes, seen = self.remove_seen(file, df, hashes)
+
+            if df.empty:
+
+                # Nothing new: drop any clean output from an earlier run
+                # so downstream stages don't pick up stale rows
+                stale = os.path.join(self.clean_dir, file)
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+                self.seen_index.add(file, hashes)
+
+                print(f"⏭️ No new rows in {file} "
+                      f"({removed + seen} duplicates)\n")
+                continue
+
+            df, rule_report, rule_dropped = self.validate(df, file)
+
+            df, missing_report = self.handle_missing(df, profile)
 
             df = self.fix_dates(df)
 
             df = self.clean_text(df)
 
-            outliers = self.detect_outliers(df)
+            # Ingestion's profile describes the file as it arrived: it
+            # only stands in for the frame if no rows were removed, and
+            # only for columns nothing rewrote
+            rewritten = {
+                col for col, info in missing_report.items()
+                if info["strategy"] != "kept"
+            } | {
+                info["column"] for info in rule_report.values()
+                if info["action"] == "fix" and info["violations"]
+            }
+
+            untouched = not (removed or seen or rule_dropped)
+
+            outliers = self.detect_outliers(
+                df,
+                profile if untouched else None,
+                rewritten
+            )
 
             output = self.save_clean(df, file)
 
+            # Registered only once the clean file is written
+            self.seen_index.add(file, hashes)
+
+            changes = self.schemas.record("quality", output, df)
+
             print("📉 Duplicates removed:", removed)
+            print("🔁 Rows seen in earlier batches removed:", seen)
+
+            print("\n📏 Rule Violations:")
+            for name, info in rule_report.items():
+                print(f"   {name}: {info['violations']} ({info['action']})")
+            print(f"   rows dropped by rules: {rule_dropped}")
 
             print("\n🧪 Missing Values Handling:")
             for col, info in missing_report.items():
@@ -162,4 +370,6 @@ class QualityAgent:
 
             print(f"\n💾 Clean data saved to: {output}\n")
 
+            print_changes(output, changes)
+
         print("✅ Quality Check Complete\n")
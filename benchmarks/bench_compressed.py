@@ -0,0 +1,172 @@
+import os
+import sys
+import bz2
+import gzip
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from core.compressed import csv_members, background_stream
+
+
+# ---------------- INPUTS ---------------- #
+
+def compress_inputs(csv_path, tmp):
+
+    paths = {}
+
+    with open(csv_path, "rb") as src, \
+            gzip.open(os.path.join(tmp, "data.csv.gz"), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    paths["gzip"] = os.path.join(tmp, "data.csv.gz")
+
+    with open(csv_path, "rb") as src, \
+            bz2.open(os.path.join(tmp, "data.csv.bz2"), "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    paths["bz2"] = os.path.join(tmp, "data.csv.bz2")
+
+    try:
+        import zstandard
+
+        with open(csv_path, "rb") as src, \
+                open(os.path.join(tmp, "data.csv.zst"), "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+        paths["zstd"] = os.path.join(tmp, "data.csv.zst")
+
+    except ImportError:
+        print("⚠️ zstandard not installed, skipping .zst")
+
+    # Two members, as the exports arrive split in halves
+    df = pd.read_csv(csv_path)
+    half = len(df) // 2
+
+    zip_path = os.path.join(tmp, "data.zip")
+
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("part-1.csv", df.iloc[:half].to_csv(index=False))
+        archive.writestr("part-2.csv", df.iloc[half:].to_csv(index=False))
+
+    paths["zip"] = zip_path
+
+    return paths
+
+
+# ---------------- STRATEGIES ---------------- #
+
+def decompress_then_read(path, tmp):
+
+    frames = []
+
+    for i, (_, opener) in enumerate(csv_members(path)):
+
+        out_path = os.path.join(tmp, f"extracted-{i}.csv")
+
+        with opener() as src, open(out_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+
+        frames.append(pd.read_csv(out_path, encoding="utf-8"))
+
+        os.remove(out_path)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def stream_inline(path, tmp):
+
+    frames = []
+
+    for _, opener in csv_members(path):
+        with opener() as f:
+            frames.append(pd.read_csv(f, encoding="utf-8"))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def stream_background(path, tmp):
+
+    frames = []
+
+    for _, opener in csv_members(path):
+        with background_stream(opener) as f:
+            frames.append(pd.read_csv(f, encoding="utf-8"))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+STRATEGIES = {
+    "decompress→read": decompress_then_read,
+    "stream (inline)": stream_inline,
+    "stream (thread)": stream_background
+}
+
+
+def best_of(func, path, tmp, repeat):
+
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        df = func(path, tmp)
+        timings.append(time.perf_counter() - started)
+
+    return min(timings), len(df)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compare streaming decompression with decompress-then-read"
+    )
+
+    parser.add_argument("--rows", default="1M")
+    parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        csv_path = os.path.join(tmp, "data.csv")
+        generate(rows, csv_path, encoding="utf-8")
+
+        raw_mb = os.path.getsize(csv_path) / 1e6
+
+        print(f"\n🗜️ Compressing {raw_mb:,.0f} MB of CSV...")
+        paths = compress_inputs(csv_path, tmp)
+
+        print(f"\n⏱️ Read Throughput (MB/s of uncompressed CSV, "
+              f"best of {args.repeat})\n")
+
+        print(f"   {'format':8s}" + "".join(
+            f"{name:>18s}" for name in STRATEGIES
+        ) + f"{'speedup':>10s}")
+
+        for fmt, path in paths.items():
+
+            results = {
+                name: best_of(func, path, tmp, args.repeat)
+                for name, func in STRATEGIES.items()
+            }
+
+            rates = {
+                name: raw_mb / seconds
+                for name, (seconds, _) in results.items()
+            }
+
+            speedup = rates["stream (thread)"] / rates["decompress→read"]
+
+            print(f"   {fmt:8s}" + "".join(
+                f"{rate:18.1f}" for rate in rates.values()
+            ) + f"{speedup:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
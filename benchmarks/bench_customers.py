@@ -0,0 +1,150 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from agents.customer_agent import CustomerAgent
+
+
+# ---------------- DATA ---------------- #
+
+def clean_lines(rows, customers, seed=42):
+
+    # Clean-stage columns only; ~2 lines per invoice over one year, so
+    # nearly every customer id is active at the default sizes
+    rng = np.random.default_rng(seed)
+
+    n_invoices = rows // 2
+
+    invoice = np.sort(rng.integers(0, n_invoices, rows))
+    invoice_customer = rng.integers(0, customers, n_invoices)
+    invoice_seconds = np.sort(rng.integers(0, 365 * 24 * 3600, n_invoices))
+
+    invoice_no = (536365 + invoice).astype(str).astype(object)
+    cancelled = rng.random(rows) < 0.02
+    invoice_no[cancelled] = "C" + invoice_no[cancelled]
+
+    return pd.DataFrame({
+        "InvoiceNo": invoice_no,
+        "InvoiceDate": pd.Timestamp("2010-12-01")
+        + pd.to_timedelta(invoice_seconds[invoice], unit="s"),
+        "Quantity": rng.integers(1, 25, rows),
+        "UnitPrice": np.round(rng.lognormal(1.0, 0.9, rows), 2),
+        "CustomerID": (12346 + invoice_customer[invoice]).astype(float)
+    })
+
+
+def write_batches(df, n_batches, clean_dir):
+
+    # Time-ordered daily exports; an invoice never spans two exports
+    invoice = df["InvoiceNo"].str.lstrip("C").astype(int).to_numpy()
+    cuts = np.searchsorted(
+        invoice,
+        np.linspace(invoice[0], invoice[-1] + 1, n_batches + 1)
+    )
+
+    names = []
+
+    for i in range(n_batches):
+        name = f"batch_{i:03d}.csv"
+        df.iloc[cuts[i]:cuts[i + 1]].to_csv(
+            os.path.join(clean_dir, name), index=False
+        )
+        names.append(name)
+
+    return names
+
+
+def timed(func):
+
+    started = time.perf_counter()
+    result = func()
+
+    return time.perf_counter() - started, result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark incremental customer features"
+    )
+
+    parser.add_argument("--customers", default="1M")
+    parser.add_argument("--rows", default="6M")
+    parser.add_argument("--batches", type=int, default=10)
+
+    args = parser.parse_args()
+
+    customers = parse_rows(args.customers)
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        clean_dir = os.path.join(tmp, "clean")
+        os.makedirs(clean_dir)
+
+        print(f"\n🏗️ {rows:,} lines, {customers:,} customers, "
+              f"{args.batches} batches...")
+
+        names = write_batches(
+            clean_lines(rows, customers), args.batches, clean_dir
+        )
+
+        agent = CustomerAgent(clean_dir, os.path.join(tmp, "customers"))
+
+        # Batches arrive one at a time; the agent only sees new files
+        quiet = open(os.devnull, "w")
+        incremental = []
+
+        for i in range(len(names)):
+            with contextlib.redirect_stdout(quiet):
+                seconds, _ = timed(lambda: agent.run(files=names[:i + 1]))
+            incremental.append(seconds)
+
+        # Without state: summarise the whole history on every arrival
+        full = []
+
+        for i in range(len(names)):
+
+            def recompute():
+                history = pd.concat(
+                    [agent.load_data(n) for n in names[:i + 1]],
+                    ignore_index=True
+                )
+                totals, daily = agent.summarize(history)
+                totals, daily, reference = agent.combine([totals], [daily])
+                return agent.compute_features(totals, daily, reference)
+
+            seconds, expected = timed(recompute)
+            full.append(seconds)
+
+        actual = pd.read_parquet(agent.features_path)
+
+        pd.testing.assert_frame_equal(
+            actual.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+            atol=1e-6
+        )
+
+    print(f"\n⏱️ Customer Features ({len(actual):,} customers)\n")
+    print(f"   {'batch':>6s}{'full rescan':>14s}{'incremental':>14s}")
+
+    for i, (f, inc) in enumerate(zip(full, incremental)):
+        print(f"   {i + 1:6d}{f:13.2f}s{inc:13.2f}s")
+
+    print(f"\n   total  {sum(full):12.2f}s{sum(incremental):13.2f}s   "
+          f"({sum(full) / sum(incremental):.1f}x)")
+    print("\n✅ Incremental state matches a full recompute")
+
+
+if __name__ == "__main__":
+    main()
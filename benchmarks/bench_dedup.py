@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from core.dedup import RowHashIndex, row_hashes, duplicated
+
+
+# ---------------- BATCHES ---------------- #
+
+def overlapping_batches(df, n_batches, overlap):
+
+    # Daily exports that re-send the tail of the previous day
+    size = len(df) // n_batches
+    batches = []
+
+    for i in range(n_batches):
+        start = max(0, i * size - int(size * overlap))
+        batches.append(df.iloc[start:(i + 1) * size])
+
+    return batches
+
+
+def timed(func):
+
+    started = time.perf_counter()
+    result = func()
+
+    return time.perf_counter() - started, result
+
+
+# ---------------- SCENARIOS ---------------- #
+
+def hash_twice(df):
+
+    # Before: ingestion profiled with duplicated(), quality dropped again
+    df.duplicated().sum()
+    return df.drop_duplicates()
+
+
+def hash_once(df):
+
+    hashes = row_hashes(df)
+    dropped = duplicated(hashes)
+
+    return df[~dropped]
+
+
+def naive_cross_batch(batches):
+
+    # Without an index: re-check each batch against everything before it
+    history = []
+    removed = 0
+
+    for batch in batches:
+
+        if history:
+            previous = pd.concat(history, ignore_index=True)
+            merged = batch.merge(
+                previous.drop_duplicates(),
+                how="left",
+                indicator=True
+            )
+            removed += int((merged["_merge"] == "both").sum())
+
+        history.append(batch)
+
+    return removed
+
+
+def indexed_cross_batch(batches, index_dir, memory_mb):
+
+    index = RowHashIndex(index_dir, memory_mb=memory_mb)
+    removed = 0
+    lookup = 0.0
+
+    for i, batch in enumerate(batches):
+
+        hashes = row_hashes(batch)
+
+        started = time.perf_counter()
+        seen = index.seen(f"batch-{i:03d}", hashes)
+        lookup += time.perf_counter() - started
+
+        removed += int(seen.sum())
+        index.add(f"batch-{i:03d}", hashes[~seen])
+
+    return removed, lookup, index.stats()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark row hashing and the cross-batch dedup index"
+    )
+
+    parser.add_argument("--rows", default="1M")
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--overlap", type=float, default=0.25)
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path = os.path.join(tmp, "raw.csv")
+        generate(rows, path, encoding="utf-8")
+        df = pd.read_csv(path)
+
+        print(f"\n🔑 Within-file Dedup ({len(df):,} rows)\n")
+
+        twice, _ = timed(lambda: hash_twice(df))
+        once, _ = timed(lambda: hash_once(df))
+
+        print(f"   duplicated() + drop_duplicates()  {twice:7.2f}s")
+        print(f"   row hashes once                   {once:7.2f}s   "
+              f"({twice / once:.1f}x)")
+
+        batches = overlapping_batches(df, args.batches, args.overlap)
+        total = sum(len(b) for b in batches)
+
+        print(f"\n🔁 Cross-batch Dedup ({args.batches} batches, "
+              f"{args.overlap:.0%} overlap, {total:,} rows)\n")
+
+        naive, naive_removed = timed(lambda: naive_cross_batch(batches))
+
+        print(f"   re-check all history   {naive:7.2f}s   "
+              f"removed {naive_removed:,}")
+
+        for memory_mb in [1, 4, 16]:
+
+            index_dir = os.path.join(tmp, f"index-{memory_mb}")
+
+            seconds, (removed, lookup, stats) = timed(
+                lambda: indexed_cross_batch(batches, index_dir, memory_mb)
+            )
+
+            print(
+                f"   index, {memory_mb:2d} MB Bloom    {seconds:7.2f}s   "
+                f"removed {removed:,}   lookups "
+                f"{total / lookup / 1e6:5.1f}M rows/s   "
+                f"est. FPR {stats['bloom_fpr']:.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
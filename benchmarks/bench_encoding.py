@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from agents.etl_agent import ETLAgent
+
+
+# ---------------- CONFIG ---------------- #
+
+VOCABULARIES = [50, 1_000, 10_000, 100_000, 1_000_000]
+
+
+# ---------------- DATA ---------------- #
+
+def text_column(rows, vocabulary, seed=42):
+
+    # Invoice-like identifiers drawn from a fixed vocabulary
+    rng = np.random.default_rng(seed)
+
+    values = np.array(
+        [f"C{v:07d}" for v in rng.permutation(10_000_000)[:vocabulary]],
+        dtype=object
+    )
+
+    return pd.DataFrame({
+        "Key": pd.array(values[rng.integers(0, vocabulary, rows)],
+                        dtype="str")
+    })
+
+
+# ---------------- STRATEGIES ---------------- #
+
+def label_encode(df):
+
+    # Before: LabelEncoder on every text column (sorts the vocabulary)
+    df["Key"] = LabelEncoder().fit_transform(df["Key"].astype(str))
+
+    return "label"
+
+
+def strategy_encode(df, feature_dir):
+
+    etl = ETLAgent(
+        clean_dir=feature_dir,
+        feature_dir=feature_dir,
+        schema_dir=os.path.join(feature_dir, "schemas")
+    )
+
+    etl.encode_categorical(df)
+
+    return etl.encodings["Key"]["strategy"]
+
+
+def measure(func, df):
+
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    result = func(df.copy())
+
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds, peak / 1e6, result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Categorical encoding cost as the vocabulary grows"
+    )
+
+    parser.add_argument("--rows", default="1M")
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    print(f"\n🔤 Encoding one text column ({rows:,} rows)\n")
+    print(f"   {'vocabulary':>11s}{'strategy':>12s}"
+          f"{'LabelEncoder':>16s}{'by cardinality':>22s}")
+
+    for vocabulary in VOCABULARIES:
+
+        df = text_column(rows, vocabulary)
+
+        legacy_s, legacy_mb, _ = measure(label_encode, df)
+
+        # Fresh feature dir each time: the strategy is chosen, not reused
+        with tempfile.TemporaryDirectory() as tmp, \
+                contextlib.redirect_stdout(open(os.devnull, "w")):
+            new_s, new_mb, strategy = measure(
+                lambda d: strategy_encode(d, tmp), df
+            )
+
+        print(f"   {vocabulary:11,d}{strategy:>12s}"
+              f"{legacy_s:8.2f}s {legacy_mb:6.0f} MB"
+              f"{new_s:12.2f}s {new_mb:6.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
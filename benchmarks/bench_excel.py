@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from core.excel import ExcelReader, resolve_engine
+
+
+# ---------------- WORKBOOK ---------------- #
+
+def build_workbook(rows, path):
+
+    # One sheet per month, like the finance team's workbooks
+    csv_path = path + ".csv"
+    generate(rows, csv_path, encoding="utf-8")
+
+    df = pd.read_csv(csv_path)
+    os.remove(csv_path)
+
+    month = pd.to_datetime(df["InvoiceDate"]).dt.strftime("%Y-%m")
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, sheet in df.groupby(month, sort=True):
+            sheet.to_excel(writer, sheet_name=name, index=False)
+
+    return month.nunique()
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+def timed(reader, path):
+
+    started = time.perf_counter()
+    df = reader.load(path)
+
+    return time.perf_counter() - started, len(df)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Time Excel ingestion per engine, parallelism and cache"
+    )
+
+    parser.add_argument("--rows", default="100k")
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path = os.path.join(tmp, "workbook.xlsx")
+
+        print(f"\n📗 Building workbook ({rows:,} rows)...")
+        sheets = build_workbook(rows, path)
+
+        size_mb = os.path.getsize(path) / 1e6
+
+        print(f"   {sheets} sheets, {size_mb:.1f} MB\n")
+
+        engines = ["openpyxl"]
+        if resolve_engine("auto") == "calamine":
+            engines.append("calamine")
+
+        # Serial, plus one process per sheet up to the CPU count
+        worker_counts = sorted({1, min(sheets, os.cpu_count() or 1)})
+
+        results = []
+
+        for engine in engines:
+            for workers in worker_counts:
+
+                # Fresh cache dir per case so every run parses the workbook
+                reader = ExcelReader(
+                    cache_dir=os.path.join(tmp, f"cache-{engine}-{workers}"),
+                    engine=engine,
+                    max_workers=workers
+                )
+
+                seconds, n = timed(reader, path)
+
+                results.append((f"{engine}, {workers} proc", seconds, n))
+
+        # Second load of the same content hits the Parquet cache
+        seconds, n = timed(reader, path)
+        results.append(("cached Parquet", seconds, n))
+
+    baseline = results[0][1]
+
+    print("\n⏱️ Excel Load Times\n")
+
+    for label, seconds, n in results:
+        print(
+            f"   {label:26s} {seconds:8.2f}s   "
+            f"{baseline / seconds:6.1f}x   ({n:,} rows)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from core.feature_store import FeatureStore, row_dates
+from core.dashboard_data import DashboardDataService
+
+
+# ---------------- CONFIG ---------------- #
+
+HISTORY_MONTHS = [3, 6, 12, 24]
+
+WINDOW_DAYS = 7
+
+START = pd.Timestamp("2010-01-01")
+
+
+# ---------------- DATA ---------------- #
+
+def feature_month(rng, index, rows):
+
+    # One month of ETL-shaped output: date parts plus scaled numerics
+    first = START + pd.DateOffset(months=index)
+    days = (first + pd.DateOffset(months=1) - first).days
+
+    dates = first + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+
+    df = pd.DataFrame({
+        f"f{i}": rng.standard_normal(rows) for i in range(8)
+    })
+
+    df["Quantity"] = rng.standard_normal(rows)
+    df["Revenue"] = rng.standard_normal(rows)
+    df["year"] = dates.year
+    df["month"] = dates.month
+    df["day"] = dates.day
+
+    return df
+
+
+def clean_rows(rng, rows, months):
+
+    # Clean transactions over the whole history, in no particular order
+    # (as Quality leaves them after dedup)
+    end = START + pd.DateOffset(months=months)
+    span = int((end - START).total_seconds())
+
+    seconds = rng.integers(0, span, rows)
+
+    return pd.DataFrame({
+        "InvoiceDate": (START + pd.to_timedelta(seconds, unit="s"))
+        .strftime("%Y-%m-%d %H:%M:%S"),
+        "StockCode": rng.integers(10000, 14000, rows).astype(str),
+        "Description": "ITEM",
+        "Quantity": rng.integers(1, 25, rows),
+        "UnitPrice": np.round(rng.lognormal(1.0, 0.9, rows), 2),
+        "Country": "United Kingdom"
+    })
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+def best_of(func, repeat=3):
+
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+
+    return min(timings), result
+
+
+def full_scan(path):
+
+    # Before: every feature row is parsed, then filtered to the window
+    df = pd.read_csv(path)
+
+    days = row_dates(df)
+    last = days.max()
+
+    return df[(days > last - pd.Timedelta(days=WINDOW_DAYS)).to_numpy()]
+
+
+def bench_store(tmp, months, rows_per_month):
+
+    rng = np.random.default_rng(42)
+
+    store = FeatureStore(os.path.join(tmp, "store"))
+    csv_path = os.path.join(tmp, "features.csv")
+
+    # One ETL batch per month, appended to a single history file too
+    for index in range(months):
+
+        df = feature_month(rng, index, rows_per_month)
+
+        store.write(df, f"batch_{index:03d}.csv")
+        df.to_csv(csv_path, mode="a", index=False, header=(index == 0))
+
+    scan_s, expected = best_of(lambda: full_scan(csv_path))
+    window_s, window = best_of(
+        lambda: FeatureStore(store.root).window(WINDOW_DAYS)
+    )
+
+    assert len(window) == len(expected)
+
+    return scan_s, window_s, len(window)
+
+
+def bench_dashboard(tmp, months, rows_per_month):
+
+    rng = np.random.default_rng(7)
+
+    source = os.path.join(tmp, "clean.csv")
+    clean_rows(rng, months * rows_per_month, months).to_csv(
+        source, index=False
+    )
+
+    service = DashboardDataService(source, os.path.join(tmp, "cache"))
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        service.refresh()
+
+    # Before: the same rows in one Parquet file, filtered on the date only
+    single = os.path.join(tmp, "single.parquet")
+    pq.write_table(service.dataset().to_table(), single,
+                   row_group_size=256_000)
+
+    end = START + pd.DateOffset(months=months) - pd.Timedelta(days=1)
+    start = end - pd.Timedelta(days=WINDOW_DAYS - 1)
+
+    def single_kpis():
+
+        return ds.dataset(single).to_table(
+            columns=["Revenue"],
+            filter=(ds.field("InvoiceDate") >= start) &
+                   (ds.field("InvoiceDate") < end + pd.Timedelta(days=1))
+        ).num_rows
+
+    single_s, expected = best_of(single_kpis)
+    part_s, kpis = best_of(lambda: service.kpis(start=start, end=end))
+
+    assert kpis["total_orders"] == expected
+
+    return single_s, part_s
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Windowed reads from the partitioned feature store"
+    )
+
+    parser.add_argument("--rows-per-month", default="100k")
+
+    args = parser.parse_args()
+
+    rows_per_month = parse_rows(args.rows_per_month)
+
+    print(f"\n🗂️ Last {WINDOW_DAYS} days as history grows "
+          f"({rows_per_month:,} rows/month)\n")
+    print(f"   {'history':>9s}{'CSV scan':>12s}{'store':>10s}{'speedup':>10s}"
+          f"{'dashboard 1 file':>20s}{'partitioned':>13s}{'speedup':>10s}")
+
+    for months in HISTORY_MONTHS:
+
+        with tempfile.TemporaryDirectory() as tmp:
+
+            scan_s, window_s, _ = bench_store(tmp, months, rows_per_month)
+            single_s, part_s = bench_dashboard(tmp, months, rows_per_month)
+
+        print(f"   {f'{months} mo':>9s}{scan_s:11.2f}s{window_s:9.3f}s"
+              f"{scan_s / window_s:9.1f}x"
+              f"{single_s:19.3f}s{part_s:12.3f}s{single_s / part_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import joblib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from benchmarks.bench_schema import build_workspace
+from agents.ml_agent import MLAgent
+from core.forest import CompiledForest, compiled_path
+
+
+# ---------------- CONFIG ---------------- #
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000]
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+def latency(func, min_seconds=1.0, min_calls=5):
+
+    # Median of repeated calls, for at least min_seconds
+    timings = []
+    started = time.perf_counter()
+
+    while len(timings) < min_calls or \
+            time.perf_counter() - started < min_seconds:
+        t = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t)
+
+    return float(np.median(timings))
+
+
+def fmt(seconds):
+
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.0f}µs"
+
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f}ms"
+
+    return f"{seconds:8.2f}s "
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compiled forest vs RandomForestRegressor.predict"
+    )
+
+    parser.add_argument("--rows", default="200k")
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        print(f"\n🏗️ Building workspace and training ({rows:,} rows)...")
+
+        dirs = build_workspace(rows, tmp)
+
+        ml = MLAgent(
+            dirs["features"],
+            os.path.join(tmp, "models"),
+            schema_dir=dirs["schemas"],
+            matrix_dir=os.path.join(tmp, "matrix"),
+            mode="full"
+        )
+
+        df = ml.load_data("data.csv")
+        X_train, X_test, y_train, _ = ml.prepare_data(df, "data.csv")
+        columns = df.columns.drop("Revenue")
+        del df
+
+        forest = ml.train_models(X_train, y_train)["RandomForest"]
+        model_path = ml.save_model(forest, "RandomForest", columns)
+        path = compiled_path(model_path)
+
+        load_sk = latency(lambda: joblib.load(model_path), min_calls=3)
+        load_compiled = latency(lambda: CompiledForest.load(path))
+
+        model = joblib.load(model_path)
+        compiled = CompiledForest.load(path)
+
+        X_test = np.asarray(X_test)
+
+        # Bare arrays for both (the frame path adds the same column
+        # check to each)
+        model.feature_names_in_ = None
+        del model.feature_names_in_
+
+        diff = np.abs(model.predict(X_test) - compiled.predict(X_test))
+
+        sizes = [n for n in BATCH_SIZES if n < len(X_test)] + [len(X_test)]
+
+        print(f"\n⚡ Forest Inference ({len(model.estimators_)} trees, "
+              f"{compiled.feature.shape[0]:,} nodes)\n")
+
+        print(f"   {'':14s}{'sklearn':>12s}{'compiled':>12s}{'speedup':>10s}")
+        print(f"   {'load':14s}{fmt(load_sk)}  {fmt(load_compiled)}  "
+              f"{load_sk / load_compiled:8.1f}x")
+
+        for n in sizes:
+
+            batch = X_test[:n]
+
+            sk = latency(lambda: model.predict(batch))
+            fast = latency(lambda: compiled.predict(batch))
+
+            print(f"   {f'{n:,} rows':14s}{fmt(sk)}  {fmt(fast)}  "
+                  f"{sk / fast:8.1f}x")
+
+        print(f"\n   artifact  {os.path.getsize(model_path) / 1e6:7.1f} MB "
+              f"joblib, {os.path.getsize(path) / 1e6:7.1f} MB compiled")
+        print(f"   max |sklearn - compiled| = {diff.max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from benchmarks.bench_schema import build_workspace
+from agents.ml_agent import MLAgent
+from core.incremental import ModelRegistry
+
+
+# ---------------- BATCHES ---------------- #
+
+def write_batches(dirs, n_batches):
+
+    # Daily feature files, as ETL writes them in watch mode, plus one
+    # more that neither strategy trains on, to score the final models
+    df = pd.read_csv(os.path.join(dirs["features"], "data.csv"))
+
+    batch_dir = os.path.join(dirs["tmp"], "batches")
+    os.makedirs(batch_dir)
+
+    parts = np.array_split(np.arange(len(df)), n_batches + 1)
+    names = []
+
+    for i, part in enumerate(parts[:-1]):
+        name = f"batch_{i:03d}.csv"
+        df.iloc[part].to_csv(os.path.join(batch_dir, name), index=False)
+        names.append(name)
+
+    holdout = df.iloc[parts[-1]]
+
+    return batch_dir, names, holdout
+
+
+def timed(func):
+
+    started = time.perf_counter()
+    result = func()
+
+    return time.perf_counter() - started, result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Retrain time per batch: full refit vs incremental"
+    )
+
+    parser.add_argument("--rows", default="200k")
+    parser.add_argument("--batches", type=int, default=8)
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        print(f"\n🏗️ Building workspace ({rows:,} rows)...")
+
+        dirs = build_workspace(rows, tmp)
+        dirs["tmp"] = tmp
+
+        batch_dir, names, holdout = write_batches(dirs, args.batches)
+
+        full = MLAgent(
+            batch_dir, os.path.join(tmp, "full"),
+            schema_dir=dirs["schemas"],
+            matrix_dir=os.path.join(tmp, "matrix"),
+            mode="full"
+        )
+        incremental = MLAgent(
+            batch_dir, os.path.join(tmp, "incremental"),
+            schema_dir=dirs["schemas"],
+            matrix_dir=os.path.join(tmp, "matrix"),
+            mode="incremental"
+        )
+
+        quiet = open(os.devnull, "w")
+        timings = []
+
+        for i, name in enumerate(names):
+
+            # Before: refit both models on the whole history so far
+            def refit():
+                history = pd.concat(
+                    [full.load_data(n) for n in names[:i + 1]],
+                    ignore_index=True
+                )
+                X_train, _, y_train, _ = full.prepare_data(history)
+                return full.train_models(X_train, y_train)
+
+            with contextlib.redirect_stdout(quiet):
+                full_s, full_models = timed(refit)
+                inc_s, _ = timed(lambda: incremental.run(files=[name]))
+
+            timings.append((full_s, inc_s))
+
+        registry = ModelRegistry(incremental.state_dir)
+
+        inc_models = {
+            "LinearRegression": incremental.load_linear(registry),
+            "RandomForest": incremental.load_forest()
+        }
+
+        X_test = holdout.drop(columns=["Revenue"]).to_numpy(np.float32)
+        y_test = holdout["Revenue"].to_numpy()
+
+        scores = [
+            full.evaluate_models(full_models, X_test, y_test),
+            incremental.evaluate_models(inc_models, X_test, y_test)
+        ]
+        trees = len(inc_models["RandomForest"].estimators_)
+
+    print(f"\n⏱️ Retrain per Batch ({args.batches} batches of "
+          f"~{rows // (args.batches + 1):,} rows)\n")
+    print(f"   {'batch':>6s}{'full refit':>14s}{'incremental':>14s}")
+
+    for i, (f, inc) in enumerate(timings):
+        print(f"   {i + 1:6d}{f:13.2f}s{inc:13.2f}s")
+
+    total_full = sum(f for f, _ in timings)
+    total_inc = sum(inc for _, inc in timings)
+
+    print(f"\n   total  {total_full:12.2f}s{total_inc:13.2f}s   "
+          f"({total_full / total_inc:.1f}x)")
+
+    print(f"\n🎯 R2 on an unseen batch (incremental forest: {trees} trees)\n")
+    print(f"   {'':18s}{'full refit':>10s}{'incremental':>14s}")
+
+    for name in scores[0]:
+        print(f"   {name:18s}{scores[0][name]['r2']:10.4f}"
+              f"{scores[1][name]['r2']:14.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import os
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from agents.quality_agent import QualityAgent
+from agents.etl_agent import ETLAgent
+from agents.ml_agent import MLAgent
+from core.frames import split_target
+
+
+# ---------------- CONFIG ---------------- #
+
+# Minimum relative drop in peak memory versus the copy-chaining
+# implementation; below this the script exits non-zero.
+MIN_REDUCTION = 0.15
+
+
+# ---------------- LEGACY CHAIN ---------------- #
+
+# The transformations as they were written before copy-on-write: every
+# step returns or assigns a fresh copy of the frame.
+
+def legacy_chain(df):
+
+    from sklearn.preprocessing import StandardScaler, LabelEncoder
+    from sklearn.model_selection import train_test_split
+
+    df = df.drop_duplicates()
+
+    for col in df.columns:
+        if df[col].isnull().sum() > 0:
+            if df[col].dtype in ["int64", "float64"]:
+                df[col] = df[col].fillna(df[col].median())
+            else:
+                df[col] = df[col].fillna("Unknown")
+
+    df["InvoiceDate"] = pd.to_datetime(df["InvoiceDate"], errors="coerce")
+    df["Description"] = df["Description"].astype(str).str.lower().str.strip()
+
+    df["year"] = df["InvoiceDate"].dt.year
+    df["month"] = df["InvoiceDate"].dt.month
+    df["day"] = df["InvoiceDate"].dt.day
+    df["weekday"] = df["InvoiceDate"].dt.weekday
+    df["Revenue"] = df["Quantity"] * df["UnitPrice"]
+
+    encoder = LabelEncoder()
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        df[col] = df[col].astype(str)
+        df[col] = encoder.fit_transform(df[col])
+
+    numeric_cols = df.select_dtypes(include=["int64", "float64"]).columns
+    df[numeric_cols] = StandardScaler().fit_transform(df[numeric_cols])
+
+    df = df.drop(columns=["InvoiceDate"])
+
+    X = df.drop(columns=["Revenue"])
+    y = df["Revenue"]
+    splits = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    X_eval = df.drop(columns=["Revenue"])
+
+    return df, splits, X_eval
+
+
+# ---------------- CURRENT CHAIN ---------------- #
+
+def current_chain(df, workspace):
+
+    # Agents built as the pipeline builds them, on a scratch workspace
+    def path(name):
+        return os.path.join(workspace, name)
+
+    quality = QualityAgent(
+        path("processed"), path("clean"),
+        schema_dir=path("schemas"),
+        dedup_dir=path("dedup"),
+        violations_dir=path("quality"),
+        profile_dir=path("profiles")
+    )
+    etl = ETLAgent(
+        path("clean"), path("features"),
+        schema_dir=path("schemas"),
+        customer_history=path("history.parquet"),
+        store_dir=path("store")
+    )
+    ml = MLAgent(
+        path("features"), path("models"),
+        schema_dir=path("schemas"),
+        matrix_dir=path("matrix")
+    )
+
+    df, _, _ = quality.remove_duplicates(df)
+    df, _ = quality.handle_missing(df)
+    df = quality.fix_dates(df)
+    df = quality.clean_text(df)
+
+    df = etl.create_features(df)
+    df = etl.encode_categorical(df)
+    df = etl.scale_numeric(df)
+    df = etl.select_features(df)
+
+    splits = ml.prepare_data(df)
+    X_eval, _ = split_target(df)
+
+    return df, splits, X_eval
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+def peak_bytes(chain, *args):
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    base, _ = tracemalloc.get_traced_memory()
+
+    result = chain(*args)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+
+    return peak - base
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Peak-memory regression check for the agent transforms"
+    )
+
+    parser.add_argument("--rows", default="1M")
+    parser.add_argument("--min-reduction", type=float, default=MIN_REDUCTION)
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path = os.path.join(tmp, "raw.csv")
+        generate(rows, path, encoding="utf-8")
+
+        frame = pd.read_csv(path)
+
+        legacy = peak_bytes(legacy_chain, frame.copy())
+        current = peak_bytes(current_chain, frame.copy(), tmp)
+
+    input_mb = frame.memory_usage(deep=True).sum() / 1e6
+
+    reduction = 1 - current / legacy
+
+    print(f"\n🧠 Peak Memory ({rows:,} rows, input {input_mb:,.0f} MB)\n")
+    print(f"   Copy-chaining:  {legacy / 1e6:10,.0f} MB")
+    print(f"   Current:        {current / 1e6:10,.0f} MB")
+    print(f"   Reduction:      {reduction:10.1%}")
+
+    if reduction < args.min_reduction:
+        print(f"\n❌ Expected at least {args.min_reduction:.0%} reduction")
+        sys.exit(1)
+
+    print("\n✅ Peak memory within target")
+
+
+if __name__ == "__main__":
+    main()
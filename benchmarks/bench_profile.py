@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from core.sketches import (
+    HEAVY_HITTERS,
+    QUANTILES,
+    CHUNK_ROWS,
+    profile_chunks,
+    combine
+)
+
+
+# ---------------- CONFIG ---------------- #
+
+ENCODING = "cp1252"
+
+# The data split into this many files, profiled separately and merged
+PARTS = 4
+
+
+# ---------------- EXACT ---------------- #
+
+def exact_profile(path):
+
+    # Whole file in memory: exact distinct counts, quantiles and value
+    # counts, as a profile without sketches would compute them
+    df = pd.read_csv(path, encoding=ENCODING)
+
+    numeric = df.select_dtypes(include=["number"]).columns
+
+    return {
+        "rows": len(df),
+        "nulls": df.isnull().sum().to_dict(),
+        "distinct": df.nunique().to_dict(),
+        "quantiles": {
+            col: df[col].quantile(QUANTILES).to_dict() for col in numeric
+        },
+        "top": {
+            col: df[col].astype(str).value_counts().head(5).to_dict()
+            for col in HEAVY_HITTERS
+        }
+    }
+
+
+def sketch_profile(path):
+
+    # One streaming pass over CSV chunks
+    return profile_chunks(
+        pd.read_csv(path, encoding=ENCODING, chunksize=CHUNK_ROWS)
+    )
+
+
+def measure(func):
+
+    # Timed on its own: tracemalloc slows allocations down several-fold
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed, peak / 1e6
+
+
+# ---------------- ACCURACY ---------------- #
+
+def errors(exact, sketches):
+
+    summary = sketches.summary()["columns"]
+
+    distinct = max(
+        abs(summary[col]["distinct"] - n) / n
+        for col, n in exact["distinct"].items() if n
+    )
+
+    # Quantile error relative to the p1–p99 spread, so columns on
+    # different scales compare
+    ranks = []
+
+    for col, values in exact["quantiles"].items():
+
+        spread = values[QUANTILES[-1]] - values[QUANTILES[0]] or 1.0
+
+        for q, value in values.items():
+            estimate = summary[col]["quantiles"][str(q)]
+            ranks.append(abs(estimate - value) / spread)
+
+    top = []
+
+    for col, counts in exact["top"].items():
+
+        estimated = dict(summary[col]["top"])
+
+        for value, n in counts.items():
+            top.append(abs(estimated.get(value, 0) - n) / n)
+
+    return distinct, max(ranks), max(top)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Streaming sketch profile vs exact in-memory profile"
+    )
+
+    parser.add_argument("--rows", default="1M")
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path = os.path.join(tmp, "raw.csv")
+        generate(rows, path)
+
+        exact, exact_s, exact_mb = measure(lambda: exact_profile(path))
+        sketches, sketch_s, sketch_mb = measure(lambda: sketch_profile(path))
+
+        # Merging per-file profiles vs profiling the union again
+        df = pd.read_csv(path, encoding=ENCODING)
+        parts = np.array_split(np.arange(len(df)), PARTS)
+
+        profiles = [
+            profile_chunks([df.iloc[p[0]:p[-1] + 1]]) for p in parts
+        ]
+
+        started = time.perf_counter()
+        merged = combine(profiles)
+        merge_s = time.perf_counter() - started
+
+    print(f"\n🔎 Profiling {rows:,} rows\n")
+    print(f"   {'':24s}{'time':>9s}{'peak MB':>10s}")
+    print(f"   {'exact (in memory)':24s}{exact_s:8.2f}s{exact_mb:10.0f}")
+    print(f"   {'sketches (streaming)':24s}{sketch_s:8.2f}s{sketch_mb:10.0f}")
+    print(f"   {f'merge {PARTS} file profiles':24s}{merge_s:8.2f}s")
+
+    distinct, quantile, top = errors(exact, sketches)
+    merged_distinct, merged_quantile, merged_top = errors(exact, merged)
+
+    print(f"\n   {'max relative error':24s}{'streamed':>10s}{'merged':>10s}")
+    print(f"   {'distinct count':24s}{distinct:10.2%}{merged_distinct:10.2%}")
+    print(f"   {'quantile (of p1–p99)':24s}{quantile:10.2%}"
+          f"{merged_quantile:10.2%}")
+    print(f"   {'top-5 frequencies':24s}{top:10.2%}{merged_top:10.2%}")
+
+
+if __name__ == "__main__":
+    main()
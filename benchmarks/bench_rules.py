@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from core.rules import RuleSet, load_spec, DEFAULT_RULES
+
+
+# ---------------- CONFIG ---------------- #
+
+# The default spec repeated (renamed) up to this many rules
+RULE_COUNTS = [6, 12, 24, 48]
+
+
+def spec_of(n):
+
+    base = load_spec(DEFAULT_RULES)["rules"]
+
+    return {"rules": [
+        dict(base[i % len(base)], name=f"{base[i % len(base)]['name']}_{i}")
+        for i in range(n)
+    ]}
+
+
+# ---------------- PER-RULE PANDAS ---------------- #
+
+def per_rule(df, rules):
+
+    # Before: each rule is its own pandas expression over the full
+    # column, a count, and a filtered copy or flag column per rule
+    counts = {}
+
+    for rule in rules.rules:
+
+        col = df[rule.column]
+
+        if rule.check == "not_null":
+            bad = col.isna()
+
+        elif rule.check == "in":
+            bad = col.notna() & ~col.isin(rule.values)
+
+        elif rule.check == "matches":
+            bad = col.notna() & \
+                ~col.astype(str).str.fullmatch(rule.pattern.pattern)
+
+        elif rule.check == "between":
+            bad = col.notna() & ~col.between(rule.low, rule.high)
+
+        else:
+            ok = {
+                "gt": col > rule.value,
+                "ge": col >= rule.value,
+                "lt": col < rule.value,
+                "le": col <= rule.value
+            }[rule.check]
+            bad = col.notna() & ~ok
+
+        counts[rule.name] = int(bad.sum())
+
+        if rule.action == "drop":
+            df = df[~bad]
+
+        elif rule.action == "fix":
+            df = df.assign(**{rule.column: col.where(~bad, rule.fix)})
+
+        else:
+            df = df.assign(**{f"flag_{rule.name}": bad})
+
+    return df, counts
+
+
+def compiled(df, rules):
+
+    out, _, _, _, counts = rules.apply(df)
+
+    return out, counts
+
+
+def best_of(func, repeat=3):
+
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+
+    return min(timings), result
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compiled rule pass vs one pandas pass per rule"
+    )
+
+    parser.add_argument("--rows", default="1M")
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        path = os.path.join(tmp, "raw.csv")
+        generate(rows, path)
+
+        df = pd.read_csv(path, encoding="cp1252")
+
+    print(f"\n📏 Validating {len(df):,} rows\n")
+    print(f"   {'rules':>6s}{'per-rule pandas':>18s}{'compiled':>12s}"
+          f"{'speedup':>10s}")
+
+    for n in RULE_COUNTS:
+
+        rules = RuleSet.from_spec(spec_of(n))
+
+        legacy_s, (_, legacy) = best_of(lambda: per_rule(df, rules))
+        new_s, (_, counts) = best_of(lambda: compiled(df, rules))
+
+        # Drop rules filter as they go in the per-rule version, so only
+        # the rules before the first drop see the same rows
+        assert counts[rules.rules[0].name] == legacy[rules.rules[0].name]
+
+        print(f"   {n:6d}{legacy_s:17.2f}s{new_s:11.2f}s"
+              f"{legacy_s / new_s:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
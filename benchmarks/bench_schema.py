@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import generate, parse_rows
+from agents.ingestion_agent import IngestionAgent
+from agents.quality_agent import QualityAgent
+from agents.etl_agent import ETLAgent
+from core.schema import SchemaRegistry
+
+
+# ---------------- CONFIG ---------------- #
+
+# (loader, stage that wrote the file, directory, projected columns)
+LOADERS = [
+    ("quality", "ingestion", "processed", None),
+    ("etl", "quality", "clean", None),
+    ("analytics", "etl", "features", ["Revenue", "Quantity", "month"]),
+    ("ml / monitor", "etl", "features", None)
+]
+
+
+# ---------------- WORKSPACE ---------------- #
+
+def build_workspace(rows, tmp):
+
+    dirs = {
+        name: os.path.join(tmp, name)
+        for name in ["raw", "processed", "clean", "features", "schemas"]
+    }
+
+    os.makedirs(dirs["raw"])
+    generate(rows, os.path.join(dirs["raw"], "data.csv"))
+
+    # The agents print a lot; only the timings matter here
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+
+        IngestionAgent(
+            dirs["raw"], dirs["processed"], schema_dir=dirs["schemas"]
+        ).run()
+        QualityAgent(
+            dirs["processed"], dirs["clean"], schema_dir=dirs["schemas"]
+        ).run()
+        ETLAgent(
+            dirs["clean"], dirs["features"], schema_dir=dirs["schemas"]
+        ).run()
+
+    return dirs
+
+
+def read_inferred(path, registry, stage, columns):
+
+    # What a stage did before the registry: infer every column, then
+    # convert the date columns itself (ETL's create_features did this)
+    df = pd.read_csv(path)
+
+    for col in registry.read_options(stage, path)["parse_dates"]:
+        df[col] = pd.to_datetime(df[col])
+
+    return df
+
+
+def best_of(funcs, repeat):
+
+    # Alternate the strategies each round so background noise on the
+    # box hits both equally, then keep each one's best time
+    timings = [[] for _ in funcs]
+
+    for _ in range(repeat):
+        for func, runs in zip(funcs, timings):
+            started = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - started)
+
+    return [min(runs) for runs in timings]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compare inferred vs registry-typed CSV parsing"
+    )
+
+    parser.add_argument("--rows", default="1M")
+    parser.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        print(f"\n🏗️ Building workspace ({rows:,} rows)...")
+        dirs = build_workspace(rows, tmp)
+
+        registry = SchemaRegistry(dirs["schemas"])
+
+        print(f"\n⏱️ Parse Time (best of {args.repeat})\n")
+        print(f"   {'loader':14s}{'inferred':>12s}{'registry':>12s}"
+              f"{'speedup':>10s}")
+
+        for loader, stage, directory, columns in LOADERS:
+
+            path = os.path.join(dirs[directory], "data.csv")
+
+            inferred, typed = best_of(
+                [
+                    lambda: read_inferred(path, registry, stage, columns),
+                    lambda: registry.read_csv(path, stage, columns)
+                ],
+                args.repeat
+            )
+
+            print(f"   {loader:14s}{inferred:11.2f}s{typed:11.2f}s"
+                  f"{inferred / typed:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
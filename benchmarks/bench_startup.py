@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+
+# ---------------- CONFIG ---------------- #
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "startup_baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+TOLERANCE = 0.25
+REPEAT = 5
+
+# Timed in the same run as the entry points. The baseline stores each
+# entry point as a multiple of it, so a slower or faster host shifts
+# both sides and only a change in what an entry point imports shows up.
+REFERENCE = ["pandas"]
+
+# Entry point → modules it imports at startup
+ENTRY_POINTS = {
+    "orchestrator": ["orchestrator"],
+    "main": ["main"],
+    "dashboard": ["streamlit", "core.dashboard_data"],
+    "ingestion": ["agents.ingestion_agent"],
+    "quality": ["agents.quality_agent"],
+    "customer": ["agents.customer_agent"],
+    "etl": ["agents.etl_agent"],
+    "analytics": ["agents.analytics_agent"],
+    "ml": ["agents.ml_agent"],
+    "monitor": ["agents.monitoring_agent"],
+    "llm": ["agents.llm_agent"]
+}
+
+
+# ---------------- MEASUREMENT ---------------- #
+
+def parse_importtime(stderr):
+
+    # Lines look like: "import time:  self [us] | cumulative | name", with
+    # two spaces of indentation per nesting level before the name.
+    # Returns {name: (depth, cumulative ms)} for depth 0 and 1.
+    imports = {}
+
+    for line in stderr.splitlines():
+
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        if depth <= 1:
+            imports[name.strip()] = (depth, int(cumulative) / 1000)
+
+    return imports
+
+
+def measure(modules):
+
+    code = "; ".join(f"import {m}" for m in modules)
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    return parse_importtime(proc.stderr)
+
+
+def total_ms(run):
+    return sum(ms for depth, ms in run.values() if depth == 0)
+
+
+def bench_entry_point(modules, repeat=REPEAT):
+
+    # Best of N: the first run also pays for bytecode compilation. The
+    # reference is timed in between, so load on the host hits both.
+    runs, reference = [], []
+
+    for _ in range(repeat):
+        reference.append(total_ms(measure(REFERENCE)))
+        runs.append(measure(modules))
+
+    best = min(runs, key=total_ms)
+
+    heaviest = sorted(
+        (
+            (name, ms) for name, (depth, ms) in best.items()
+            if depth == 1 or (depth == 0 and name not in modules)
+        ),
+        key=lambda kv: kv[1],
+        reverse=True
+    )
+
+    return {
+        "total_ms": total_ms(best),
+        "reference_ms": min(reference),
+        "relative": total_ms(best) / min(reference),
+        "heaviest": heaviest[:5]
+    }
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Measure cold import time per entry point"
+    )
+
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+
+    args = parser.parse_args()
+
+    results = {}
+
+    print("\n🚀 Startup Import Times\n")
+
+    print(f"   (relative to import {', '.join(REFERENCE)}, "
+          f"timed alongside each entry point)\n")
+
+    for name, modules in ENTRY_POINTS.items():
+
+        result = bench_entry_point(modules, args.repeat)
+        results[name] = result
+
+        heaviest = ", ".join(
+            f"{mod} {ms:.0f}ms" for mod, ms in result["heaviest"][:3]
+        )
+
+        print(f"   {name:13s} {result['total_ms']:8.1f} ms "
+              f"{result['relative']:6.2f}x   ({heaviest})")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    out_path = os.path.join(
+        RESULTS_DIR,
+        "startup-" + time.strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n💾 Results saved to: {out_path}")
+
+    if args.save_baseline:
+
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(
+                {k: round(v["relative"], 3) for k, v in results.items()},
+                f,
+                indent=2
+            )
+
+        print(f"📌 Baseline updated: {BASELINE_FILE}")
+        return
+
+    if not os.path.exists(BASELINE_FILE):
+        print("⚠️ No baseline found. Run with --save-baseline first.")
+        return
+
+    with open(BASELINE_FILE, "r") as f:
+        baseline = json.load(f)
+
+    regressions = [
+        f"{name}: {baseline[name]:.2f}x → {result['relative']:.2f}x "
+        f"the reference"
+        for name, result in results.items()
+        if name in baseline
+        and result["relative"] > baseline[name] * (1 + args.tolerance)
+    ]
+
+    if regressions:
+
+        print("\n❌ Startup regressions:")
+        for line in regressions:
+            print(f"   {line}")
+
+        sys.exit(1)
+
+    print("\n✅ No startup regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
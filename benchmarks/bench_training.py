@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generate_data import parse_rows
+from benchmarks.bench_schema import build_workspace
+
+
+# ---------------- FITS ---------------- #
+
+def load(ml):
+
+    # Loaded inside each fit so the frame can actually be released
+    df = ml.load_data("data.csv")
+
+    return df, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def legacy_fit(ml):
+
+    # Before: float64 frames, copied by the split, converted again by
+    # each model
+    from sklearn.model_selection import train_test_split
+
+    df, loaded = load(ml)
+
+    X = df.drop(columns=["Revenue"])
+    y = df["Revenue"]
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+    del df, X, y
+
+    models = ml.train_models(X_train, y_train)
+
+    return loaded, ml.evaluate_models(models, X_test, y_test)
+
+
+def mapped_fit(ml):
+
+    df, loaded = load(ml)
+
+    splits = ml.prepare_data(df, "bench.csv")
+    del df
+
+    X_train, X_test, y_train, y_test = splits
+
+    models = ml.train_models(X_train, y_train)
+
+    return loaded, ml.evaluate_models(models, X_test, y_test)
+
+
+def child(mode, dirs):
+
+    # One fresh process per strategy so ru_maxrss is its own peak
+    from agents.ml_agent import MLAgent
+
+    ml = MLAgent(
+        dirs["features"],
+        os.path.join(dirs["tmp"], "models"),
+        schema_dir=dirs["schemas"],
+        matrix_dir=os.path.join(dirs["tmp"], "matrix")
+    )
+
+    fit = legacy_fit if mode == "legacy" else mapped_fit
+
+    started = time.perf_counter()
+    loaded, results = fit(ml)
+    seconds = time.perf_counter() - started
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "loaded_mb": loaded / 1024,
+        "peak_mb": peak / 1024,
+        "seconds": seconds,
+        "r2": {name: m["r2"] for name, m in results.items()}
+    }))
+
+
+def run_child(mode, dirs):
+
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode,
+         "--dirs", json.dumps(dirs)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Peak RSS and fit time of MLAgent's training matrix"
+    )
+
+    parser.add_argument("--rows", default="300k")
+    parser.add_argument("--child")
+    parser.add_argument("--dirs")
+
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, json.loads(args.dirs))
+        return
+
+    rows = parse_rows(args.rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        print(f"\n🏗️ Building workspace ({rows:,} rows)...")
+
+        dirs = build_workspace(rows, tmp)
+        dirs["tmp"] = tmp
+
+        legacy = run_child("legacy", dirs)
+        mapped = run_child("mapped", dirs)
+
+    print("\n⏱️ MLAgent Training (LinearRegression + RandomForest)\n")
+    print(f"   {'':22s}{'float64 frames':>16s}{'float32 mmap':>16s}")
+
+    for label, key in [("RSS after load (MB)", "loaded_mb"),
+                       ("peak RSS (MB)", "peak_mb"),
+                       ("load + fit + eval (s)", "seconds")]:
+        print(f"   {label:22s}{legacy[key]:16.1f}{mapped[key]:16.1f}")
+
+    added_legacy = legacy["peak_mb"] - legacy["loaded_mb"]
+    added_mapped = mapped["peak_mb"] - mapped["loaded_mb"]
+
+    print(f"\n   peak RSS      {mapped['peak_mb'] / legacy['peak_mb'] - 1:+.1%}"
+          f"   (training overhead {added_legacy:.0f} → "
+          f"{added_mapped:.0f} MB)")
+    print(f"   fit time      {mapped['seconds'] / legacy['seconds'] - 1:+.1%}")
+
+    for name in legacy["r2"]:
+        print(f"   {name} R2   {legacy['r2'][name]:.6f} → "
+              f"{mapped['r2'][name]:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.vector_index import VectorIndex
+
+
+# ---------------- CONFIG ---------------- #
+
+N_DOCS = int(os.getenv("BENCH_DOCS", "10000"))
+N_QUERIES = 200
+
+
+def synthetic_report(rng):
+
+    revenue = rng.uniform(1e4, 1e7)
+    quantity = rng.randint(1000, 500000)
+    orders = rng.randint(100, 100000)
+
+    return (
+        "=== BUSINESS ANALYTICS REPORT ===\n\n"
+        "KEY PERFORMANCE INDICATORS\n"
+        f"total_revenue: {revenue:.2f}\n"
+        f"avg_revenue: {revenue / orders:.4f}\n"
+        f"total_quantity: {quantity}\n"
+        f"avg_quantity: {quantity / orders:.4f}\n"
+        f"total_orders: {orders}\n\n"
+        "ANOMALIES\n"
+        f"high_revenue_orders: {rng.randint(0, 500)}\n\n"
+        "CHARTS\n"
+        f"data/reports/period_{rng.randint(0, 10 ** 6)}_trend.png\n"
+    )
+
+
+def main():
+
+    rng = random.Random(42)
+    docs = [synthetic_report(rng) for _ in range(N_DOCS)]
+
+    index_dir = tempfile.mkdtemp(prefix="adip_index_")
+
+    try:
+        index = VectorIndex(index_dir)
+
+        start = time.perf_counter()
+        index.embedder.embed_many(docs[:1000])
+        embed_rate = 1000 / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index.add_reports(docs, [f"doc_{i}" for i in range(N_DOCS)])
+        build_time = time.perf_counter() - start
+
+        latencies = []
+
+        for doc in rng.sample(docs, N_QUERIES):
+
+            start = time.perf_counter()
+            index.query(doc, k=3)
+            latencies.append(time.perf_counter() - start)
+
+        latencies = np.array(latencies) * 1000
+
+        print(f"Documents:        {N_DOCS}")
+        print(f"Embedding:        {embed_rate:,.0f} docs/s")
+        print(f"Index build:      {build_time:.2f}s")
+        print(f"Query p50:        {np.percentile(latencies, 50):.2f} ms")
+        print(f"Query p95:        {np.percentile(latencies, 95):.2f} ms")
+
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ---------------- #
+
+COLUMNS = [
+    "InvoiceNo",
+    "StockCode",
+    "Description",
+    "Quantity",
+    "InvoiceDate",
+    "UnitPrice",
+    "CustomerID",
+    "Country"
+]
+
+COUNTRIES = [
+    "United Kingdom", "Germany", "France", "EIRE", "Spain",
+    "Netherlands", "Belgium", "Switzerland", "Portugal", "Australia",
+    "Norway", "Italy", "Channel Islands", "Finland", "Cyprus",
+    "Sweden", "Austria", "Denmark", "Japan", "Poland",
+    "Israel", "USA", "Hong Kong", "Singapore", "Iceland",
+    "Canada", "Greece", "Malta", "United Arab Emirates",
+    "European Community", "RSA", "Lebanon", "Lithuania", "Brazil",
+    "Czech Republic", "Bahrain", "Saudi Arabia", "Unspecified"
+]
+
+WORDS = [
+    "white", "red", "blue", "pink", "vintage", "heart", "hanging",
+    "metal", "glass", "ceramic", "lantern", "mug", "bag", "candle",
+    "holder", "set", "of", "jumbo", "lunch", "box", "retro", "spot",
+    "christmas", "paper", "cake", "cases", "tea", "light", "sign",
+    "doormat", "bottle", "clock", "garden", "union", "jack", "love"
+]
+
+# Non-ASCII words: written as cp1252 these are invalid UTF-8, which
+# exercises the ingestion encoding fallback like real retail exports.
+ACCENTED = ["café", "crème", "château", "fiancée", "£ deal", "naïve"]
+
+SIZES = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+
+# ---------------- GENERATOR ---------------- #
+
+def parse_rows(value):
+
+    value = value.lower().replace("_", "")
+
+    if value in SIZES:
+        return SIZES[value]
+
+    # Any "<n>k" / "<n>m", e.g. "250k" or "2.5m"
+    for suffix, scale in [("k", 1_000), ("m", 1_000_000)]:
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * scale)
+
+    return int(value)
+
+
+def build_catalog(rng, n_products):
+
+    codes = np.array(
+        [str(c) for c in rng.choice(np.arange(10000, 99999), n_products,
+                                    replace=False)],
+        dtype=object
+    )
+
+    descriptions = np.array([
+        " ".join(rng.choice(WORDS, rng.integers(2, 5))).upper()
+        for _ in range(n_products)
+    ], dtype=object)
+
+    accented = rng.random(n_products) < 0.01
+    descriptions[accented] = [
+        f"{d} {rng.choice(ACCENTED).upper()}" for d in descriptions[accented]
+    ]
+
+    prices = np.round(rng.lognormal(1.0, 0.9, n_products), 2)
+
+    return codes, descriptions, prices
+
+
+def generate_chunk(rng, n, offset, catalog, n_customers, start, span_s,
+                   null_rate, duplicate_rate):
+
+    codes, descriptions, prices = catalog
+
+    # Zipf-like product popularity
+    product = np.minimum(rng.zipf(1.3, n) - 1, len(codes) - 1)
+
+    # ~20 lines per invoice, in order
+    invoice = 536365 + (offset + np.arange(n)) // 20
+    cancelled = rng.random(n) < 0.02
+
+    invoice_no = invoice.astype(str).astype(object)
+    invoice_no[cancelled] = "C" + invoice_no[cancelled]
+
+    quantity = rng.integers(1, 25, n)
+    quantity[cancelled] *= -1
+
+    # Customer and country are per invoice, not per line
+    inv_idx = invoice - invoice[0]
+    n_inv = int(inv_idx[-1]) + 1
+
+    country = np.where(
+        rng.random(n_inv) < 0.9,
+        0,
+        rng.integers(1, len(COUNTRIES), n_inv)
+    )[inv_idx]
+
+    customer = rng.integers(12346, 12346 + n_customers, n_inv).astype(float)
+    customer[rng.random(n_inv) < 0.25] = np.nan
+    customer = customer[inv_idx]
+
+    seconds = np.sort(rng.integers(0, span_s, n))
+    dates = start + pd.to_timedelta(seconds, unit="s")
+
+    df = pd.DataFrame({
+        "InvoiceNo": invoice_no,
+        "StockCode": codes[product],
+        "Description": descriptions[product],
+        "Quantity": quantity,
+        "InvoiceDate": dates.strftime("%m/%d/%Y %H:%M"),
+        "UnitPrice": prices[product],
+        "CustomerID": customer,
+        "Country": np.array(COUNTRIES, dtype=object)[country]
+    })
+
+    missing = rng.random(n) < null_rate
+    df.loc[missing, "Description"] = None
+
+    # Exact duplicate lines, as produced by overlapping exports
+    n_dup = int(n * duplicate_rate)
+
+    if n_dup:
+        dup_rows = df.iloc[rng.integers(0, n, n_dup)]
+        df = pd.concat([df, dup_rows]).sort_index(kind="stable")
+
+    return df
+
+
+def generate(rows, path, seed=42, chunk_size=1_000_000, null_rate=0.003,
+             duplicate_rate=0.01, encoding="cp1252"):
+
+    rng = np.random.default_rng(seed)
+
+    n_products = min(4000, max(100, rows // 100))
+    n_customers = min(400_000, max(100, rows // 100))
+
+    catalog = build_catalog(rng, n_products)
+
+    start = pd.Timestamp("2010-12-01 08:00")
+    span_s = 365 * 24 * 3600
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    written = 0
+    base = int(rows / (1 + duplicate_rate))
+
+    with open(path, "w", encoding=encoding, newline="") as f:
+
+        for offset in range(0, base, chunk_size):
+
+            n = min(chunk_size, base - offset)
+
+            chunk_start = start + pd.Timedelta(
+                seconds=int(span_s * offset / base)
+            )
+
+            df = generate_chunk(
+                rng,
+                n,
+                offset,
+                catalog,
+                n_customers,
+                chunk_start,
+                max(1, int(span_s * n / base)),
+                null_rate,
+                duplicate_rate
+            )
+
+            df.to_csv(f, index=False, header=(offset == 0),
+                      columns=COLUMNS)
+
+            written += len(df)
+
+    return written
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic e-commerce transactions"
+    )
+
+    parser.add_argument("--rows", default="100k",
+                        help="row count, e.g. 100k, 1M, 10M or an integer")
+    parser.add_argument("--out", default="data/raw/ecommerce_data.csv")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--encoding", default="cp1252")
+
+    args = parser.parse_args()
+
+    written = generate(
+        parse_rows(args.rows),
+        args.out,
+        seed=args.seed,
+        encoding=args.encoding
+    )
+
+    print(f"✅ Wrote {written:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
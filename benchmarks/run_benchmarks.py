@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.generate_data import generate, parse_rows
+
+
+# ---------------- CONFIG ---------------- #
+
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# Relative slowdown / memory growth tolerated before flagging a regression
+TOLERANCE = 0.25
+
+# Stage → (module, class). LLM is excluded: it needs the live Groq API.
+STAGES = {
+    "ingestion": ("agents.ingestion_agent", "IngestionAgent"),
+    "quality": ("agents.quality_agent", "QualityAgent"),
+    "customer": ("agents.customer_agent", "CustomerAgent"),
+    "etl": ("agents.etl_agent", "ETLAgent"),
+    "analytics": ("agents.analytics_agent", "AnalyticsAgent"),
+    "ml": ("agents.ml_agent", "MLAgent"),
+    "monitor": ("agents.monitoring_agent", "MonitoringAgent")
+}
+
+# Runs one stage in a fresh interpreter and reports its own peak RSS,
+# so each measurement is isolated from the others.
+STAGE_SCRIPT = """
+import sys, json, time, resource, importlib
+module, cls = sys.argv[1], sys.argv[2]
+agent = getattr(importlib.import_module(module), cls)
+start = time.perf_counter()
+agent().run()
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("BENCH_RESULT " + json.dumps({"seconds": elapsed, "peak_rss_kb": peak}))
+"""
+
+GRAPH_SCRIPT = """
+import sys, json, time, resource
+import orchestrator
+app = orchestrator.build_graph()
+start = time.perf_counter()
+app.invoke({
+    "from_stage": "ingestion", "to_stage": ["analytics", "monitor"],
+    "force": True,
+    "completed": [], "errors": {}, "retries": {}, "timings": {}
+})
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print("BENCH_RESULT " + json.dumps({"seconds": elapsed, "peak_rss_kb": peak}))
+"""
+
+
+# ---------------- HARNESS ---------------- #
+
+def run_script(script, args, workspace):
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    env["ADIP_TRACE_DIR"] = os.path.join(workspace, "data", "traces")
+
+    proc = subprocess.run(
+        [sys.executable, "-c", script] + args,
+        cwd=workspace,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH_RESULT "):
+            return json.loads(line[len("BENCH_RESULT "):])
+
+    raise RuntimeError(
+        f"Benchmark run failed:\n{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}"
+    )
+
+
+def bench_size(rows, keep=False):
+
+    workspace = tempfile.mkdtemp(prefix=f"adip_bench_{rows}_")
+
+    try:
+        raw = os.path.join(workspace, "data", "raw", "ecommerce_data.csv")
+
+        start = time.perf_counter()
+        written = generate(rows, raw)
+        print(f"🧪 Generated {written:,} rows "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+
+        for stage, (module, cls) in STAGES.items():
+
+            result = run_script(STAGE_SCRIPT, [module, cls], workspace)
+            result["rows_per_s"] = written / result["seconds"]
+
+            results[stage] = result
+
+            print(
+                f"   {stage:10s} {result['seconds']:8.2f}s "
+                f"{result['rows_per_s']:12,.0f} rows/s "
+                f"{result['peak_rss_kb'] / 1024:8.0f} MB peak"
+            )
+
+        result = run_script(GRAPH_SCRIPT, [], workspace)
+        result["rows_per_s"] = written / result["seconds"]
+
+        results["graph"] = result
+
+        print(
+            f"   {'graph':10s} {result['seconds']:8.2f}s "
+            f"{result['rows_per_s']:12,.0f} rows/s "
+            f"{result['peak_rss_kb'] / 1024:8.0f} MB peak"
+        )
+
+        return results
+
+    finally:
+        if keep:
+            print(f"📁 Workspace kept at: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+def compare(results, baseline, tolerance):
+
+    regressions = []
+
+    for size, stages in results.items():
+
+        for stage, result in stages.items():
+
+            base = baseline.get(size, {}).get(stage)
+
+            if not base:
+                continue
+
+            for metric in ("seconds", "peak_rss_kb"):
+
+                ratio = result[metric] / base[metric]
+
+                if ratio > 1 + tolerance:
+                    regressions.append(
+                        f"{size}/{stage} {metric}: "
+                        f"{base[metric]:.2f} → {result[metric]:.2f} "
+                        f"({ratio:.2f}x)"
+                    )
+
+    return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark each agent and the full pipeline graph"
+    )
+
+    parser.add_argument("--sizes", default="100k",
+                        help="comma-separated row counts, e.g. 100k,1M,10M")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the benchmark workspaces")
+
+    args = parser.parse_args()
+
+    results = {}
+
+    for size in args.sizes.split(","):
+
+        print(f"\n📏 Benchmark: {size} rows\n")
+
+        results[size] = bench_size(parse_rows(size), keep=args.keep)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    out_path = os.path.join(
+        RESULTS_DIR,
+        time.strftime("%Y%m%d-%H%M%S") + ".json"
+    )
+
+    with open(out_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"\n💾 Results saved to: {out_path}")
+
+    if args.save_baseline:
+
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE, "r") as f:
+                baseline = json.load(f)
+
+        baseline.update(results)
+
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=2)
+
+        print(f"📌 Baseline updated: {BASELINE_FILE}")
+        return
+
+    if not os.path.exists(BASELINE_FILE):
+        print("⚠️ No baseline found. Run with --save-baseline first.")
+        return
+
+    with open(BASELINE_FILE, "r") as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+
+    if regressions:
+
+        print("\n❌ Performance regressions:")
+        for line in regressions:
+            print(f"   {line}")
+
+        sys.exit(1)
+
+    print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
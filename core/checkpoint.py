@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import hashlib
+
+
+class CheckpointStore:
+
+    # One JSON checkpoint per pipeline stage. A checkpoint records a
+    # fingerprint (path, size, mtime) of the stage inputs and outputs;
+    # it stays valid while neither side has changed since the stage ran.
+
+    def __init__(self, checkpoint_dir="data/checkpoints"):
+
+        self.checkpoint_dir = checkpoint_dir
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+    def path(self, stage):
+
+        return os.path.join(self.checkpoint_dir, f"{stage}.json")
+
+    def list_files(self, paths):
+
+        files = []
+
+        for path in paths:
+
+            if os.path.isfile(path):
+                files.append(path)
+                continue
+
+            if not os.path.isdir(path):
+                continue
+
+            for root, _, names in os.walk(path):
+                for name in names:
+                    files.append(os.path.join(root, name))
+
+        return sorted(files)
+
+    def fingerprint(self, paths):
+
+        digest = hashlib.sha256()
+        files = {}
+
+        for file in self.list_files(paths):
+
+            stat = os.stat(file)
+
+            files[file] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns
+            }
+
+            digest.update(
+                f"{file}|{stat.st_size}|{stat.st_mtime_ns}\n".encode()
+            )
+
+        return digest.hexdigest(), files
+
+    def load(self, stage):
+
+        try:
+            with open(self.path(stage), "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save(self, stage, inputs, outputs):
+
+        input_hash, input_files = self.fingerprint(inputs)
+        output_hash, output_files = self.fingerprint(outputs)
+
+        checkpoint = {
+            "stage": stage,
+            "created_at": time.time(),
+            "input_hash": input_hash,
+            "output_hash": output_hash,
+            "inputs": input_files,
+            "outputs": output_files
+        }
+
+        tmp_path = self.path(stage) + ".tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f, indent=2)
+
+        os.replace(tmp_path, self.path(stage))
+
+        return checkpoint
+
+    def is_valid(self, stage, inputs, outputs):
+
+        checkpoint = self.load(stage)
+
+        if checkpoint is None or not checkpoint["outputs"]:
+            return False
+
+        input_hash, _ = self.fingerprint(inputs)
+        output_hash, _ = self.fingerprint(outputs)
+
+        return (
+            checkpoint["input_hash"] == input_hash
+            and checkpoint["output_hash"] == output_hash
+        )
+
+    def clear(self, stage=None):
+
+        stages = [stage] if stage else [
+            f[:-len(".json")] for f in os.listdir(self.checkpoint_dir)
+            if f.endswith(".json")
+        ]
+
+        for name in stages:
+            if os.path.exists(self.path(name)):
+                os.remove(self.path(name))
@@ -0,0 +1,192 @@
+import io
+import bz2
+import gzip
+import queue
+import zipfile
+import threading
+
+
+# ---------------- CONFIG ---------------- #
+
+# Compressed single-file CSVs, and archives that may hold several CSVs
+COMPRESSED_SUFFIXES = (".csv.gz", ".csv.bz2", ".csv.zst")
+ARCHIVE_SUFFIXES = (".zip",)
+
+CHUNK_SIZE = 1 << 20     # decompressed bytes per queue item
+QUEUE_DEPTH = 8          # chunks buffered ahead of the parser
+
+
+def is_compressed(filename):
+
+    return filename.endswith(COMPRESSED_SUFFIXES + ARCHIVE_SUFFIXES)
+
+
+def strip_suffix(filename):
+
+    # "orders.csv.gz" → "orders.csv", "export.zip" → "export.csv"
+    for suffix in COMPRESSED_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)] + ".csv"
+
+    for suffix in ARCHIVE_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)] + ".csv"
+
+    return filename
+
+
+# ---------------- DECOMPRESSORS ---------------- #
+
+def open_zstd(path):
+
+    try:
+        import zstandard
+
+    except ImportError:
+        raise ImportError(
+            "Reading .zst files requires the zstandard package"
+        ) from None
+
+    f = open(path, "rb")
+
+    return zstandard.ZstdDecompressor().stream_reader(f, closefd=True)
+
+
+def csv_members(path):
+
+    # Returns [(name, opener)]: each opener yields a fresh binary stream
+    # of decompressed CSV bytes, so a read can be retried from the start.
+    if path.endswith(".csv.gz"):
+        return [(path, lambda: gzip.open(path, "rb"))]
+
+    if path.endswith(".csv.bz2"):
+        return [(path, lambda: bz2.open(path, "rb"))]
+
+    if path.endswith(".csv.zst"):
+        return [(path, lambda: open_zstd(path))]
+
+    with zipfile.ZipFile(path) as archive:
+        names = [
+            info.filename for info in archive.infolist()
+            if not info.is_dir()
+            and info.filename.lower().endswith(".csv")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+
+    def member_opener(name):
+
+        def opener():
+            # The member keeps the archive's file handle alive after
+            # the ZipFile itself is closed
+            with zipfile.ZipFile(path) as archive:
+                return archive.open(name)
+
+        return opener
+
+    return [(name, member_opener(name)) for name in names]
+
+
+# ---------------- BACKGROUND READER ---------------- #
+
+class BackgroundReader(io.RawIOBase):
+
+    # Decompresses on a background thread into a bounded queue while the
+    # caller (the CSV parser) consumes from the other end. zlib, bz2 and
+    # zstd release the GIL, so decompression overlaps with parsing.
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE, depth=QUEUE_DEPTH):
+
+        self.source = source
+        self.chunk_size = chunk_size
+
+        self.chunks = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+        self.error = None
+
+        self.current = memoryview(b"")
+        self.eof = False
+
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+
+    def put(self, item):
+
+        # Give up if the consumer closed early and nobody will drain
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def fill(self):
+
+        try:
+            while True:
+
+                chunk = self.source.read(self.chunk_size)
+
+                if not chunk or not self.put(chunk):
+                    break
+
+        except Exception as e:
+            self.error = e
+
+        finally:
+            self.put(None)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+
+        if not self.current:
+
+            if self.eof:
+                return 0
+
+            chunk = self.chunks.get()
+
+            if chunk is None:
+
+                self.eof = True
+
+                if self.error is not None:
+                    raise self.error
+
+                return 0
+
+            self.current = memoryview(chunk)
+
+        n = min(len(buffer), len(self.current))
+
+        buffer[:n] = self.current[:n]
+        self.current = self.current[n:]
+
+        return n
+
+    def close(self):
+
+        if self.closed:
+            return
+
+        self.stopped.set()
+
+        # Unblock a producer waiting on a full queue
+        while not self.chunks.empty():
+            self.chunks.get_nowait()
+
+        self.thread.join()
+        self.source.close()
+
+        super().close()
+
+
+def background_stream(opener, chunk_size=CHUNK_SIZE):
+
+    return io.BufferedReader(
+        BackgroundReader(opener(), chunk_size=chunk_size),
+        buffer_size=chunk_size
+    )
@@ -0,0 +1,148 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+def topological_order(deps):
+
+    order = []
+    done = set()
+
+    while len(order) < len(deps):
+
+        ready = [
+            name for name, parents in deps.items()
+            if name not in done and all(p in done for p in parents)
+        ]
+
+        if not ready:
+            raise ValueError("Dependency cycle in pipeline DAG")
+
+        for name in ready:
+            order.append(name)
+            done.add(name)
+
+    return order
+
+
+def critical_path(timings, deps):
+
+    # Longest chain of dependent stages, weighted by stage wall time
+    finish = {}
+    previous = {}
+
+    for name in topological_order(deps):
+
+        if name not in timings:
+            continue
+
+        parents = [p for p in deps[name] if p in finish]
+        start = max((finish[p] for p in parents), default=0.0)
+
+        previous[name] = max(parents, key=finish.get) if parents else None
+        finish[name] = start + timings[name]
+
+    if not finish:
+        return [], 0.0
+
+    last = max(finish, key=finish.get)
+    path = []
+    node = last
+
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+
+    return path[::-1], finish[last]
+
+
+def timing_report(timings, deps, wall_time):
+
+    path, path_time = critical_path(timings, deps)
+    sequential = sum(timings.values())
+
+    return {
+        "stage_times": timings,
+        "critical_path": path,
+        "critical_path_time": path_time,
+        "sequential_time": sequential,
+        "wall_time": wall_time,
+        "speedup": sequential / wall_time if wall_time > 0 else None
+    }
+
+
+def print_timing_report(report):
+
+    print("\n⏱️ Stage Timings:")
+    for name, seconds in report["stage_times"].items():
+        print(f"   {name}: {seconds:.2f}s")
+
+    print(
+        f"\n🛤️ Critical path: {' → '.join(report['critical_path'])} "
+        f"({report['critical_path_time']:.2f}s)"
+    )
+    print(f"   Sequential time: {report['sequential_time']:.2f}s")
+    print(f"   Wall time: {report['wall_time']:.2f}s")
+
+    if report["speedup"]:
+        print(f"   Speedup: {report['speedup']:.2f}x")
+
+
+def run_dag(tasks, deps, max_workers=None):
+
+    # Runs each task as soon as all of its dependencies have succeeded.
+    # Tasks whose dependencies failed are reported as blocked.
+    timings = {}
+    errors = {}
+
+    pending = set(tasks)
+    running = {}
+    succeeded = set()
+
+    def timed(name):
+
+        start = time.perf_counter()
+
+        try:
+            tasks[name]()
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as pool:
+
+        while pending or running:
+
+            for name in sorted(pending):
+
+                parents = [p for p in deps.get(name, []) if p in tasks]
+
+                if any(p in errors for p in parents):
+                    errors[name] = "blocked by " + ", ".join(
+                        p for p in parents if p in errors
+                    )
+                    pending.discard(name)
+
+                elif all(p in succeeded for p in parents):
+                    running[pool.submit(timed, name)] = name
+                    pending.discard(name)
+
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+
+                name = running.pop(future)
+                error = future.exception()
+
+                if error is not None:
+                    errors[name] = str(error)
+                else:
+                    succeeded.add(name)
+
+    report = timing_report(timings, deps, time.perf_counter() - start)
+    report["errors"] = errors
+
+    return report
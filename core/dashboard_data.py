@@ -0,0 +1,345 @@
+import os
+import json
+import shutil
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+
+# ---------------- CONFIG ---------------- #
+
+COLUMNS = {
+    "InvoiceDate": pa.timestamp("s"),
+    "StockCode": pa.string(),
+    "Description": pa.string(),
+    "Quantity": pa.float64(),
+    "UnitPrice": pa.float64(),
+    "Country": pa.string()
+}
+
+ROW_GROUP_SIZE = 256_000
+
+# Each CSV batch is split across months; without a floor every slice
+# would become its own tiny row group. Rows are buffered per open
+# partition until this many, which bounds the conversion's memory.
+MIN_ROW_GROUP_SIZE = 64_000
+
+# The cache is split into year=/month= directories; date filters also
+# constrain these keys, so a window only opens the months it overlaps
+PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int32()), ("month", pa.int32())]),
+    flavor="hive"
+)
+
+
+class DashboardDataService:
+
+    # Serves aggregated, filtered views of the clean transaction data.
+    # The CSV is converted once into month-partitioned Parquet (keyed by
+    # its mtime and size) and queries push column selection, partition
+    # pruning and row filters down to the scan, so only the aggregated
+    # result is materialised as pandas.
+    #
+    # Every conversion goes to its own directory named after the source
+    # signature, and the meta file (replaced atomically) points at the
+    # current one. Readers never see a half-written dataset, and two
+    # sessions refreshing at once don't share a temporary directory.
+
+    def __init__(self, source="data/clean/ecommerce_data.csv",
+                 cache_dir="data/cache/dashboard"):
+
+        self.source = source
+        self.cache_dir = cache_dir
+
+        self.name = os.path.splitext(os.path.basename(source))[0]
+        self.meta_path = os.path.join(cache_dir, f"{self.name}.json")
+
+    # ---------- Cache ---------- #
+
+    def exists(self):
+        return os.path.exists(self.source)
+
+    def signature(self):
+
+        stat = os.stat(self.source)
+
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def meta(self):
+
+        try:
+            with open(self.meta_path, "r") as f:
+                meta = json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return meta if isinstance(meta, dict) else {}
+
+    def cached_signature(self):
+        return self.meta().get("signature")
+
+    def dataset_dir(self):
+
+        # None until the first refresh writes the pointer
+        dataset = self.meta().get("dataset")
+
+        return os.path.join(self.cache_dir, dataset) if dataset else None
+
+    def version_dir(self, signature):
+        return os.path.join(self.cache_dir, f"{self.name}-{signature}")
+
+    def refresh(self):
+
+        signature = self.signature()
+        current = self.dataset_dir()
+
+        if signature == self.cached_signature() and current and \
+                os.path.isdir(current):
+            return signature
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        target = self.version_dir(signature)
+
+        if not os.path.isdir(target):
+            self.convert(target)
+
+        # Sessions are threads of one process, so the pid alone would
+        # not keep their temporary files apart
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f"{self.name}.", suffix=".tmp", dir=self.cache_dir
+        )
+
+        with os.fdopen(fd, "w") as f:
+            json.dump({
+                "signature": signature,
+                "source": self.source,
+                "dataset": os.path.basename(target)
+            }, f)
+
+        os.replace(tmp_path, self.meta_path)
+
+        self.prune(keep={target, current})
+
+        return signature
+
+    def convert(self, target):
+
+        header = pd.read_csv(self.source, nrows=0).columns
+        columns = [c for c in COLUMNS if c in header]
+
+        reader = pv.open_csv(
+            self.source,
+            convert_options=pv.ConvertOptions(
+                include_columns=columns,
+                column_types={c: COLUMNS[c] for c in columns}
+            )
+        )
+
+        fields = [(c, COLUMNS[c]) for c in columns]
+        revenue = "Quantity" in columns and "UnitPrice" in columns
+
+        if revenue:
+            fields.append(("Revenue", pa.float64()))
+
+        schema = pa.schema(fields + [
+            ("year", pa.int32()),
+            ("month", pa.int32())
+        ])
+
+        def batches():
+
+            # Stream batches so the conversion never holds the full file
+            for batch in reader:
+
+                table = pa.Table.from_batches([batch])
+
+                if revenue:
+                    table = table.append_column(
+                        "Revenue",
+                        pc.multiply(table["Quantity"], table["UnitPrice"])
+                    )
+
+                dates = table["InvoiceDate"]
+
+                table = table.append_column(
+                    "year", pc.year(dates).cast(pa.int32())
+                ).append_column(
+                    "month", pc.month(dates).cast(pa.int32())
+                )
+
+                yield from table.to_batches()
+
+        tmp_dir = tempfile.mkdtemp(
+            prefix=f"{self.name}.", suffix=".tmp", dir=self.cache_dir
+        )
+
+        try:
+            ds.write_dataset(
+                pa.RecordBatchReader.from_batches(schema, batches()),
+                tmp_dir,
+                format="parquet",
+                partitioning=PARTITIONING,
+                min_rows_per_group=MIN_ROW_GROUP_SIZE,
+                max_rows_per_group=ROW_GROUP_SIZE
+            )
+
+            try:
+                os.rename(tmp_dir, target)
+
+            except OSError:
+                # Another session finished the same version first
+                if not os.path.isdir(target):
+                    raise
+
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def prune(self, keep):
+
+        # Older versions go once they are two refreshes behind; the one
+        # just replaced stays for queries that resolved it a moment ago
+        keep = {os.path.basename(path) for path in keep if path}
+
+        for entry in os.listdir(self.cache_dir):
+
+            path = os.path.join(self.cache_dir, entry)
+
+            # The bare name is the unversioned layout of earlier caches
+            versioned = entry.startswith(f"{self.name}-") or \
+                entry == self.name
+
+            if versioned and entry not in keep and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    # ---------- Queries ---------- #
+
+    def dataset(self):
+        return ds.dataset(
+            self.dataset_dir(),
+            format="parquet",
+            partitioning=PARTITIONING
+        )
+
+    def build_filter(self, start=None, end=None, countries=None,
+                     product=None):
+
+        expr = None
+
+        def combine(left, right):
+            return right if left is None else left & right
+
+        year, month = ds.field("year"), ds.field("month")
+
+        if start is not None:
+            start = pd.Timestamp(start)
+            expr = combine(
+                expr,
+                (year > start.year)
+                | ((year == start.year) & (month >= start.month))
+            )
+            expr = combine(expr, ds.field("InvoiceDate") >= start)
+
+        if end is not None:
+            end = pd.Timestamp(end)
+            expr = combine(
+                expr,
+                (year < end.year)
+                | ((year == end.year) & (month <= end.month))
+            )
+            # End date is inclusive
+            expr = combine(
+                expr,
+                ds.field("InvoiceDate") < end + pd.Timedelta(days=1)
+            )
+
+        if countries:
+            expr = combine(expr, ds.field("Country").isin(list(countries)))
+
+        if product:
+            expr = combine(
+                expr,
+                (ds.field("StockCode") == product)
+                | pc.match_substring(
+                    ds.field("Description"),
+                    product,
+                    ignore_case=True
+                )
+            )
+
+        return expr
+
+    def scan(self, columns, **filters):
+
+        return self.dataset().to_table(
+            columns=columns,
+            filter=self.build_filter(**filters)
+        )
+
+    def options(self):
+
+        table = self.dataset().to_table(columns=["InvoiceDate", "Country"])
+
+        dates = pc.min_max(table["InvoiceDate"]).as_py()
+        countries = pc.unique(table["Country"]).drop_null().to_pylist()
+
+        return {
+            "min_date": dates["min"],
+            "max_date": dates["max"],
+            "countries": sorted(countries)
+        }
+
+    def kpis(self, **filters):
+
+        table = self.scan(["Revenue"], **filters)
+
+        revenue = table["Revenue"]
+
+        return {
+            "total_revenue": pc.sum(revenue).as_py() or 0.0,
+            "avg_revenue": pc.mean(revenue).as_py() or 0.0,
+            "total_orders": table.num_rows
+        }
+
+    def revenue_trend(self, **filters):
+
+        table = self.scan(["InvoiceDate", "Revenue"], **filters)
+
+        if table.num_rows == 0:
+            return pd.Series(dtype="float64", name="Revenue")
+
+        month = pc.strftime(table["InvoiceDate"], format="%Y-%m")
+
+        trend = (
+            pa.table({"month": month, "Revenue": table["Revenue"]})
+            .group_by("month")
+            .aggregate([("Revenue", "sum")])
+            .to_pandas()
+            .sort_values("month")
+            .set_index("month")["Revenue_sum"]
+        )
+
+        trend.name = "Revenue"
+
+        return trend
+
+    def top_products(self, n=10, **filters):
+
+        table = self.scan(["StockCode", "Description", "Revenue"], **filters)
+
+        if table.num_rows == 0:
+            return pd.DataFrame(columns=["StockCode", "Description", "Revenue"])
+
+        return (
+            table.group_by(["StockCode", "Description"])
+            .aggregate([("Revenue", "sum")])
+            .to_pandas()
+            .rename(columns={"Revenue_sum": "Revenue"})
+            .nlargest(n, "Revenue")
+            .reset_index(drop=True)
+        )
@@ -0,0 +1,295 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ---------------- #
+
+DEDUP_DIR = "data/dedup"
+
+# RAM for the Bloom filter; the exact hashes stay on disk (8 bytes/row)
+MEMORY_MB = float(os.getenv("ADIP_DEDUP_MEMORY_MB", "16"))
+NUM_HASHES = 4
+
+HASH_SUFFIX = ".rowhash.npy"
+
+# Distinct text values converted to Python strings at a time
+HASH_CHUNK = 16_384
+
+
+# ---------------- ROW HASHES ---------------- #
+
+def column_hashes(series):
+
+    if series.dtype.kind in "biufcmM":
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+    # Text: hash each distinct value once and gather by code; same
+    # values as hashing the column directly, at a fraction of the cost.
+    # Hashing needs Python strings, so the distinct values are converted
+    # a chunk at a time: a column of nearly unique timestamps would
+    # otherwise hold one object per row at once.
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+
+    hashed = np.empty(len(uniques), dtype=np.uint64)
+
+    for start in range(0, len(uniques), HASH_CHUNK):
+        hashed[start:start + HASH_CHUNK] = pd.util.hash_pandas_object(
+            pd.Series(uniques[start:start + HASH_CHUNK], dtype=object),
+            index=False
+        ).to_numpy()
+
+    return hashed[codes]
+
+
+def row_hashes(df):
+
+    # One 64-bit hash per row over all column values. Bit-identical to
+    # pd.util.hash_pandas_object(df, index=False): the per-column hashes
+    # are mixed the same way pandas combines them.
+    out = np.full(len(df), 0x345678, dtype=np.uint64)
+    mult = np.uint64(1000003)
+
+    for i, col in enumerate(df.columns):
+
+        remaining = len(df.columns) - i
+
+        out ^= column_hashes(df[col])
+        out *= mult
+        mult += np.uint64(82520 + remaining + remaining)
+
+    out += np.uint64(97531)
+
+    return out
+
+
+def hash_path(csv_path):
+
+    return os.path.splitext(csv_path)[0] + HASH_SUFFIX
+
+
+def save_hashes(csv_path, hashes):
+
+    path = hash_path(csv_path)
+
+    np.save(path, hashes)
+
+    return path
+
+
+def load_hashes(csv_path, rows):
+
+    # Reuse hashes written next to a CSV only if they belong to it:
+    # same row count, and not older than the CSV itself
+    path = hash_path(csv_path)
+
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(csv_path):
+            return None
+
+        hashes = np.load(path)
+
+    except (OSError, ValueError):
+        return None
+
+    return hashes if len(hashes) == rows else None
+
+
+def duplicated(hashes):
+
+    # Same as df.duplicated() (first occurrence kept), from the hashes
+    return pd.Series(hashes).duplicated().to_numpy()
+
+
+# ---------------- INDEX ---------------- #
+
+class RowHashIndex:
+
+    # Remembers the row hashes of every batch seen so far. Each batch
+    # gets a sorted shard on disk and a sequence number; a batch is only
+    # deduplicated against batches registered before it, so re-running
+    # the same file is idempotent. An in-memory Bloom filter (size set
+    # by memory_mb) answers "definitely new" in O(1) per row; only its
+    # positives are confirmed against the memory-mapped shards, so a
+    # false positive never drops a row.
+
+    def __init__(self, index_dir=DEDUP_DIR, memory_mb=None,
+                 num_hashes=NUM_HASHES):
+
+        if memory_mb is None:
+            memory_mb = MEMORY_MB
+
+        self.index_dir = index_dir
+        self.num_hashes = num_hashes
+        self.num_bits = max(int(memory_mb * 8 * 2 ** 20), 64)
+
+        self.meta_path = os.path.join(index_dir, "index.json")
+        self.bloom_path = os.path.join(index_dir, "bloom.npy")
+
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        self.meta = self.load_meta()
+        self.bloom = self.load_bloom()
+
+    # ---------- Persistence ---------- #
+
+    def load_meta(self):
+
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"next_seq": 0, "batches": {}}
+
+    def load_bloom(self):
+
+        try:
+            bloom = np.load(self.bloom_path)
+
+            if len(bloom) * 8 == self.num_bits and \
+                    self.meta.get("num_hashes") == self.num_hashes:
+                return bloom
+
+        except (OSError, ValueError):
+            pass
+
+        # Missing or sized differently: rebuild from the exact shards
+        bloom = np.zeros(self.num_bits // 8, dtype=np.uint8)
+
+        for batch in self.meta["batches"].values():
+            self.set_bits(bloom, self.shard(batch))
+
+        return bloom
+
+    def save(self):
+
+        self.meta["num_hashes"] = self.num_hashes
+
+        tmp_path = self.meta_path + ".tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+        np.save(self.bloom_path, self.bloom)
+        os.replace(tmp_path, self.meta_path)
+
+    def shard(self, batch):
+
+        path = os.path.join(self.index_dir, batch["shard"])
+
+        return np.load(path, mmap_mode="r")
+
+    # ---------- Bloom Filter ---------- #
+
+    def positions(self, hashes):
+
+        # Double hashing: bit_i = h1 + i * h2 (mod m), from one 64-bit hash
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+
+        for i in range(self.num_hashes):
+            yield (h1 + np.uint64(i) * h2) % np.uint64(self.num_bits)
+
+    def set_bits(self, bloom, hashes):
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+
+        for pos in self.positions(hashes):
+            np.bitwise_or.at(
+                bloom,
+                pos >> np.uint64(3),
+                np.left_shift(1, pos & np.uint64(7)).astype(np.uint8)
+            )
+
+    def maybe_contains(self, hashes):
+
+        hit = np.ones(len(hashes), dtype=bool)
+
+        for pos in self.positions(hashes):
+            byte = self.bloom[pos >> np.uint64(3)]
+            shift = (pos & np.uint64(7)).astype(np.uint8)
+            hit &= ((byte >> shift) & 1).astype(bool)
+
+        return hit
+
+    # ---------- Lookups ---------- #
+
+    def earlier_batches(self, name):
+
+        seq = self.meta["batches"].get(name, {}).get("seq")
+
+        return [
+            batch for other, batch in self.meta["batches"].items()
+            if other != name and (seq is None or batch["seq"] < seq)
+        ]
+
+    def seen(self, name, hashes):
+
+        # True for rows whose hash is in a batch registered before `name`
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        found = np.zeros(len(hashes), dtype=bool)
+
+        candidates = np.flatnonzero(self.maybe_contains(hashes))
+
+        if len(candidates) == 0:
+            return found
+
+        values = hashes[candidates]
+        confirmed = np.zeros(len(values), dtype=bool)
+
+        for batch in self.earlier_batches(name):
+
+            shard = self.shard(batch)
+
+            if len(shard) == 0:
+                continue
+
+            idx = np.searchsorted(shard, values)
+            idx[idx == len(shard)] = len(shard) - 1
+
+            confirmed |= shard[idx] == values
+
+        found[candidates] = confirmed
+
+        return found
+
+    def add(self, name, hashes):
+
+        # Register (or replace) the rows of batch `name`; it keeps its
+        # original sequence number when re-run
+        batch = self.meta["batches"].get(name)
+
+        if batch is None:
+            batch = {
+                "seq": self.meta["next_seq"],
+                "shard": f"shard-{self.meta['next_seq']:06d}.npy"
+            }
+            self.meta["next_seq"] += 1
+
+        unique = np.unique(np.asarray(hashes, dtype=np.uint64))
+
+        np.save(os.path.join(self.index_dir, batch["shard"]), unique)
+
+        batch["rows"] = int(len(unique))
+        self.meta["batches"][name] = batch
+
+        self.set_bits(self.bloom, unique)
+        self.save()
+
+    def stats(self):
+
+        rows = sum(b["rows"] for b in self.meta["batches"].values())
+
+        # Expected false-positive rate: (1 - e^(-k n / m))^k
+        fpr = (1 - np.exp(-self.num_hashes * rows / self.num_bits)) \
+            ** self.num_hashes
+
+        return {
+            "batches": len(self.meta["batches"]),
+            "rows": rows,
+            "bloom_mb": self.bloom.nbytes / 2 ** 20,
+            "bloom_fpr": float(fpr)
+        }
@@ -0,0 +1,173 @@
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from core.sketches import CMS_DEPTH, CountMin, value_hashes
+
+
+# ---------------- CONFIG ---------------- #
+
+# Strategy by distinct values in the first batch a column appears in:
+# dictionary codes up to DICT_MAX_UNIQUE, a signed hash block up to
+# HASH_MAX_UNIQUE, frequency above that
+DICT_MAX_UNIQUE = 64
+HASH_MAX_UNIQUE = 1024
+
+# ~16 values per bucket at HASH_MAX_UNIQUE; signs cancel part of the
+# collisions. Kept dense: features go to CSV, Parquet and a dense
+# training matrix, none of which hold sparse columns.
+HASH_WIDTH = 64
+
+# Frequency counts: a count-min table per column under the feature dir.
+# 2^18 counters per row keep the overcount of a 1M-row, 66k-invoice
+# column at ~0.02 on average; the size doesn't grow with the vocabulary.
+COUNT_DIR = "counts"
+COUNT_WIDTH = 1 << 18
+
+
+def choose_strategy(n_unique):
+
+    if n_unique <= DICT_MAX_UNIQUE:
+        return "dictionary"
+
+    if n_unique <= HASH_MAX_UNIQUE:
+        return "hash"
+
+    return "frequency"
+
+
+# ---------------- ENCODERS ---------------- #
+
+# Each takes factorize() output (codes per row, distinct values), so the
+# per-row work is a gather and nothing ever sorts the full vocabulary.
+
+def dictionary_codes(codes, uniques, vocabulary, limit=DICT_MAX_UNIQUE):
+
+    # Codes stay stable across batches: known values keep theirs, new
+    # ones are appended to `vocabulary` (updated in place). The strategy
+    # was picked from the first batch, so the vocabulary stops at
+    # `limit`; values after that share the overflow code `limit`.
+    index = pd.Index(vocabulary, dtype=object)
+    known = index.get_indexer(uniques)
+
+    new = uniques[known < 0]
+    room = limit - len(vocabulary)
+
+    if len(new) and room > 0:
+        vocabulary.extend(sorted(new)[:room])
+        index = pd.Index(vocabulary, dtype=object)
+        known = index.get_indexer(uniques)
+
+    known[known < 0] = limit
+
+    return known.astype(np.int32)[codes]
+
+
+def hash_block(codes, uniques, width=HASH_WIDTH):
+
+    # Signed feature hashing: one +/-1 per row in `width` int8 columns.
+    # hash_array is a fixed-key hash, so buckets agree across processes.
+    hashed = pd.util.hash_array(uniques)
+
+    bucket = (hashed % np.uint64(width)).astype(np.intp)
+    sign = np.where(hashed >> np.uint64(63), -1, 1).astype(np.int8)
+
+    block = np.zeros((len(codes), width), dtype=np.int8)
+    block[np.arange(len(codes)), bucket[codes]] = sign[codes]
+
+    return block
+
+
+class ValueCounts:
+
+    # How often each value of a frequency-encoded column occurs over
+    # every batch encoded so far: one running count-min table per
+    # column (<feature_dir>/counts/<column>/total.npz), plus each
+    # batch's own (value hash, count) pairs, which are as small as the
+    # batch's vocabulary. Re-encoding a batch subtracts its previous
+    # pairs before adding the new ones, so nothing is counted twice and
+    # an update never reads the other batches.
+    #
+    # A batch's pairs go to a new file each time and the table names the
+    # file it includes, so a crash between the two writes leaves the old
+    # table and its old file consistent; unnamed files are removed.
+
+    def __init__(self, root, column, width=COUNT_WIDTH):
+
+        self.dir = os.path.join(root, COUNT_DIR, column)
+        self.width = width
+        self.total_path = os.path.join(self.dir, "total.npz")
+
+    def write(self, path, **arrays):
+
+        # Mostly zeros: compresses to a fraction of its size
+        with open(path + ".tmp", "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+        os.replace(path + ".tmp", path)
+
+    def load_total(self):
+
+        # (table, {batch: file of the pairs it includes})
+        try:
+            with np.load(self.total_path) as f:
+                return f["table"], dict(zip(f["batches"], f["parts"]))
+
+        except FileNotFoundError:
+            return np.zeros((CMS_DEPTH, self.width), dtype=np.int64), {}
+
+    def load_part(self, part):
+
+        with np.load(os.path.join(self.dir, part)) as f:
+            return f["hashes"], f["counts"]
+
+    def update(self, batch, hashes, counts):
+
+        # Returns the running table, this batch's counts included
+        os.makedirs(self.dir, exist_ok=True)
+
+        table, parts = self.load_total()
+        total = CountMin(width=self.width, top_k=0, table=table)
+
+        if batch in parts:
+            old_hashes, old_counts = self.load_part(parts[batch])
+            total.add(old_hashes, -old_counts, None)
+
+        part = f"{batch}.{uuid.uuid4().hex[:12]}.npz"
+
+        self.write(os.path.join(self.dir, part), hashes=hashes, counts=counts)
+        total.add(hashes, counts, None)
+
+        parts[batch] = part
+
+        self.write(
+            self.total_path,
+            table=total.table,
+            batches=np.array(list(parts), dtype=str),
+            parts=np.array(list(parts.values()), dtype=str)
+        )
+
+        keep = set(parts.values()) | {os.path.basename(self.total_path)}
+
+        for name in os.listdir(self.dir):
+            if name.endswith(".npz") and name not in keep:
+                os.remove(os.path.join(self.dir, name))
+
+        return total
+
+
+def frequency(codes, uniques, counts, batch):
+
+    # Occurrences of each row's value across all batches so far: the
+    # same value gets the same number whatever the batch size
+    hashes = value_hashes(uniques, numeric=False)
+
+    total = counts.update(
+        batch,
+        hashes,
+        np.bincount(codes, minlength=len(uniques))
+    )
+
+    return total.estimate(hashes)[codes].astype(np.float64)
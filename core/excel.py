@@ -0,0 +1,153 @@
+import os
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from core.resources import resources
+
+
+# ---------------- CONFIG ---------------- #
+
+# "auto" picks the Rust-based calamine reader when python-calamine is
+# installed (several times faster than openpyxl) and falls back otherwise
+EXCEL_ENGINE = os.getenv("ADIP_EXCEL_ENGINE", "auto")
+
+CACHE_DIR = "data/cache/excel"
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+# ---------------- ENGINES ---------------- #
+
+def resolve_engine(engine="auto"):
+
+    if engine != "auto":
+        return engine
+
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+
+    except ImportError:
+        return "openpyxl"
+
+
+def content_hash(path):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def sheet_names(path, engine):
+
+    with pd.ExcelFile(path, engine=engine) as book:
+        return book.sheet_names
+
+
+def read_sheet(path, sheet, engine):
+
+    # Module-level so worker processes can unpickle it
+    return pd.read_excel(path, sheet_name=sheet, engine=engine)
+
+
+def arrow_safe(df):
+
+    # Excel columns often mix numbers and text (e.g. "C536379" among
+    # invoice numbers). Parquet needs one type per column, so mixed
+    # columns are stored as text; nulls stay null.
+    for col in df.columns:
+
+        if df[col].dtype != object:
+            continue
+
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+
+    return df
+
+
+# ---------------- READER ---------------- #
+
+class ExcelReader:
+
+    # Reads every sheet of a workbook (in parallel across processes when
+    # there are several) and concatenates them. The result is cached as
+    # Parquet keyed by the workbook's content hash, so an unchanged
+    # workbook is never parsed twice, even if renamed or touched.
+
+    def __init__(self, cache_dir=CACHE_DIR, engine=None, max_workers=None):
+
+        self.cache_dir = cache_dir
+        self.engine = resolve_engine(engine or EXCEL_ENGINE)
+        self.max_workers = max_workers
+
+    def cache_path(self, digest):
+
+        return os.path.join(self.cache_dir, f"{digest}.parquet")
+
+    def read_sheets(self, path):
+
+        sheets = sheet_names(path, self.engine)
+        workers = min(len(sheets), self.max_workers or resources.threads())
+
+        if workers <= 1:
+            frames = [read_sheet(path, s, self.engine) for s in sheets]
+
+        else:
+            # Spawned workers start from a fresh interpreter; a forked
+            # child inherits locks held by the parent's other threads
+            # (the watch daemon's pool, pyarrow's) and can hang on them
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                frames = list(pool.map(
+                    read_sheet,
+                    [path] * len(sheets),
+                    sheets,
+                    [self.engine] * len(sheets)
+                ))
+
+        counts = dict(zip(sheets, (len(f) for f in frames)))
+
+        # Keep sheet order; skip sheets with no rows at all
+        frames = [f for f in frames if not f.empty]
+
+        if not frames:
+            return pd.DataFrame(), counts
+
+        return pd.concat(frames, ignore_index=True), counts
+
+    def load(self, path):
+
+        digest = content_hash(path)
+        cached = self.cache_path(digest)
+
+        if os.path.exists(cached):
+            print(f"⚡ Loaded cached conversion: {cached}")
+            return pd.read_parquet(cached)
+
+        df, counts = self.read_sheets(path)
+
+        print(
+            f"✅ Loaded Excel file ({len(counts)} sheets, "
+            f"engine: {self.engine})"
+        )
+        for sheet, rows in counts.items():
+            print(f"   {sheet}: {rows} rows")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        tmp_path = cached + ".tmp"
+
+        arrow_safe(df).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, cached)
+
+        return df
@@ -0,0 +1,294 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.sketches import (
+    PROFILE_SUFFIX,
+    profile_frame,
+    combine,
+    save_profile,
+    load_profile
+)
+
+
+# ---------------- CONFIG ---------------- #
+
+STORE_DIR = "data/feature_store"
+
+# Date parts ETL derives from InvoiceDate (kept unscaled)
+DATE_PARTS = ["year", "month", "day"]
+
+
+def partition_dir(year, month):
+
+    return f"year={int(year)}/month={int(month):02d}"
+
+
+def row_dates(df):
+
+    # NaT where a date part is missing or out of range
+    return pd.to_datetime(pd.DataFrame({
+        "year": df["year"],
+        "month": df["month"],
+        "day": df["day"]
+    }), errors="coerce")
+
+
+# ---------------- STORE ---------------- #
+
+class FeatureStore:
+
+    # ETL output partitioned by year/month into Parquet, one file per
+    # source batch per partition:
+    #
+    #   data/feature_store/year=2011/month=03/<batch>.parquet
+    #
+    # index.json keeps, per partition and batch, the row count, the
+    # first/last day and min/max of every numeric column, so a windowed
+    # read opens only the files whose days overlap the window and the
+    # cost follows the window, not the history. Each file also gets a
+    # sketch profile (<batch>.profile.json) that merges with the others
+    # into the profile of any set of partitions without reading them.
+
+    def __init__(self, root=STORE_DIR):
+
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+
+        self.index = self.load_index()
+
+    # ---------- Index ---------- #
+
+    def load_index(self):
+
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"partitions": {}}
+
+    def save_index(self):
+
+        os.makedirs(self.root, exist_ok=True)
+
+        with open(self.index_path + ".tmp", "w") as f:
+            json.dump(self.index, f, indent=2)
+
+        os.replace(self.index_path + ".tmp", self.index_path)
+
+    def entries(self):
+
+        # (partition, batch name, stats) for every file in the store
+        for partition, files in sorted(self.index["partitions"].items()):
+            for name, stats in sorted(files.items()):
+                yield partition, name, stats
+
+    def empty(self):
+
+        return not self.index["partitions"]
+
+    def date_range(self):
+
+        days = [
+            (stats["min_date"], stats["max_date"])
+            for _, _, stats in self.entries()
+        ]
+
+        if not days:
+            return None, None
+
+        return (
+            pd.Timestamp(min(d[0] for d in days)),
+            pd.Timestamp(max(d[1] for d in days))
+        )
+
+    # ---------- Write ---------- #
+
+    def file_path(self, partition, name):
+
+        return os.path.join(self.root, partition, f"{name}.parquet")
+
+    def profile_path(self, partition, name):
+
+        return os.path.join(self.root, partition, f"{name}{PROFILE_SUFFIX}")
+
+    def write(self, df, source, dates=None):
+
+        # (Re)write one source batch: its old files go first, since its
+        # rows may now fall into different months. Rows are partitioned
+        # by `dates` (the batch's InvoiceDate; by default rebuilt from
+        # the date parts); rows without a date fit no window and are
+        # left out.
+        name = os.path.splitext(os.path.basename(source))[0]
+
+        for partition, files in list(self.index["partitions"].items()):
+
+            if name in files:
+
+                for path in (self.file_path(partition, name),
+                             self.profile_path(partition, name)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+                del files[name]
+
+                if not files:
+                    del self.index["partitions"][partition]
+
+        if dates is None:
+            dates = row_dates(df)
+
+        days = pd.to_datetime(pd.Series(dates)).dt.normalize().to_numpy()
+        dated = ~np.isnat(days)
+
+        df, days = df[dated], pd.DatetimeIndex(days[dated])
+
+        numeric = df.select_dtypes(include=["number"]).columns
+        groups = pd.Series(np.arange(len(df))).groupby(
+            [days.year, days.month], sort=True
+        ).indices
+        written = 0
+
+        for (year, month), rows in sorted(groups.items()):
+
+            part = df.iloc[rows]
+            partition = partition_dir(year, month)
+            path = self.file_path(partition, name)
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            part.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+
+            save_profile(
+                self.profile_path(partition, name),
+                profile_frame(part, heavy_hitters=[])
+            )
+
+            lows = part[numeric].min()
+            highs = part[numeric].max()
+
+            self.index["partitions"].setdefault(partition, {})[name] = {
+                "rows": int(len(part)),
+                "min_date": days[rows].min().strftime("%Y-%m-%d"),
+                "max_date": days[rows].max().strftime("%Y-%m-%d"),
+                "stats": {
+                    col: [float(lows[col]), float(highs[col])]
+                    for col in numeric
+                }
+            }
+
+            written += 1
+
+        self.save_index()
+
+        return written
+
+    # ---------- Read ---------- #
+
+    def prune(self, start=None, end=None):
+
+        # Files whose [min_date, max_date] overlaps [start, end]
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+
+        selected = []
+
+        for partition, name, stats in self.entries():
+
+            if start is not None and pd.Timestamp(stats["max_date"]) < start:
+                continue
+
+            if end is not None and pd.Timestamp(stats["min_date"]) > end:
+                continue
+
+            selected.append((partition, name, stats))
+
+        return selected
+
+    def read(self, start=None, end=None, columns=None):
+
+        # Rows with start <= day <= end (both inclusive, either open)
+        selected = self.prune(start, end)
+
+        if not selected:
+            return pd.DataFrame(columns=columns)
+
+        load = None if columns is None else \
+            list(dict.fromkeys(list(columns) + DATE_PARTS))
+
+        frames = []
+
+        for partition, name, stats in selected:
+
+            part = pd.read_parquet(
+                self.file_path(partition, name),
+                columns=load
+            )
+
+            # Only files straddling a window edge need a row filter
+            inside = (
+                (start is None or
+                 pd.Timestamp(stats["min_date"]) >= pd.Timestamp(start)) and
+                (end is None or
+                 pd.Timestamp(stats["max_date"]) <= pd.Timestamp(end))
+            )
+
+            if not inside:
+                days = row_dates(part)
+                keep = np.ones(len(part), dtype=bool)
+
+                if start is not None:
+                    keep &= (days >= pd.Timestamp(start)).to_numpy()
+                if end is not None:
+                    keep &= (days <= pd.Timestamp(end)).to_numpy()
+
+                part = part[keep]
+
+            frames.append(part if columns is None else part[list(columns)])
+
+        return pd.concat(frames, ignore_index=True)
+
+    def profile(self, start=None, end=None):
+
+        # Merged sketch profile of the files lying entirely inside
+        # [start, end]: profiles can't be cut at a day, so a file
+        # straddling an edge is left out rather than leak rows from
+        # outside the range
+        profiles = []
+
+        for partition, name, stats in self.prune(start, end):
+
+            if start is not None and \
+                    pd.Timestamp(stats["min_date"]) < pd.Timestamp(start):
+                continue
+
+            if end is not None and \
+                    pd.Timestamp(stats["max_date"]) > pd.Timestamp(end):
+                continue
+
+            profile = load_profile(self.profile_path(partition, name))
+
+            if profile is not None:
+                profiles.append(profile)
+
+        return combine(profiles) if profiles else None
+
+    def window(self, days, columns=None):
+
+        # The last `days` days of data, ending at the newest day stored
+        _, last = self.date_range()
+
+        if last is None:
+            return pd.DataFrame(columns=columns)
+
+        return self.read(
+            last - pd.Timedelta(days=days - 1),
+            last,
+            columns
+        )
@@ -0,0 +1,286 @@
+import os
+import json
+
+import numpy as np
+
+
+# ---------------- CONFIG ---------------- #
+
+FOREST_SUFFIX = ".forest.npy"
+
+# Below this many rows all trees are walked together (per-call overhead
+# dominates); above it, one tree at a time over the whole chunk so that
+# tree's nodes stay in cache
+TREE_BY_TREE_ROWS = 5_000
+
+# Rows per tree-by-tree pass; bounds the working arrays
+CHUNK_ROWS = 1 << 18
+
+# Rows of the packed node table; floats are stored bit-cast in int32
+FEATURE, THRESHOLD, CHILD, VALUE = range(4)
+
+
+def compiled_path(model_path):
+
+    return os.path.splitext(model_path)[0] + FOREST_SUFFIX
+
+
+def meta_path(path):
+
+    return path[:-len(".npy")] + ".json"
+
+
+# ---------------- EXPORT ---------------- #
+
+def float32_thresholds(threshold):
+
+    # sklearn tests float32(x) <= float64(t). Rounding t *down* to the
+    # nearest float32 keeps every comparison identical in float32.
+    down = threshold.astype(np.float32)
+    above = down.astype(np.float64) > threshold
+    down[above] = np.nextafter(down[above], np.float32(-np.inf))
+
+    return down
+
+
+def breadth_first(tree):
+
+    # Old node ids, level by level, with each node's two children next
+    # to each other: the right child is always left + 1
+    frontier = np.array([0])
+    order = [frontier]
+
+    while len(frontier):
+
+        inner = frontier[tree.children_left[frontier] >= 0]
+        frontier = np.column_stack([
+            tree.children_left[inner],
+            tree.children_right[inner]
+        ]).ravel()
+
+        order.append(frontier)
+
+    return np.concatenate(order)
+
+
+def export_forest(model, path):
+
+    # Flatten every tree into one (4, nodes) int32 table: feature,
+    # threshold, first child, value. Leaves absorb: threshold +inf and
+    # child pointing to themselves, so a finished traversal stays put.
+    tables = []
+    roots = []
+    offset = 0
+
+    for estimator in model.estimators_:
+
+        tree = estimator.tree_
+        order = breadth_first(tree)
+
+        new_id = np.empty(tree.node_count, dtype=np.int64)
+        new_id[order] = np.arange(tree.node_count)
+
+        left = tree.children_left[order]
+        leaf = left < 0
+
+        threshold = float32_thresholds(tree.threshold[order])
+        threshold[leaf] = np.inf
+
+        child = np.where(
+            leaf,
+            np.arange(tree.node_count),
+            new_id[np.maximum(left, 0)]
+        )
+
+        table = np.empty((4, tree.node_count), dtype=np.int32)
+        table[FEATURE] = np.where(leaf, 0, tree.feature[order])
+        table[THRESHOLD] = threshold.view(np.int32)
+        table[CHILD] = child + offset
+        table[VALUE] = tree.value[order, 0, 0].astype(np.float32) \
+            .view(np.int32)
+
+        tables.append(table)
+        roots.append(offset)
+        offset += tree.node_count
+
+    tmp_path = path + ".tmp.npy"
+
+    np.save(tmp_path, np.concatenate(tables, axis=1))
+    os.replace(tmp_path, path)
+
+    names = getattr(model, "feature_names_in_", None)
+
+    with open(meta_path(path), "w") as f:
+        json.dump({
+            "roots": roots,
+            "n_features": int(model.n_features_in_),
+            "feature_names": None if names is None else list(names)
+        }, f)
+
+    return path
+
+
+# ---------------- PREDICTOR ---------------- #
+
+class CompiledForest:
+
+    # Vectorized traversal over the packed table: (row, tree) pairs step
+    # down one level per iteration with four array gathers. Leaves are
+    # absorbing, so finished pairs are only dropped every few levels
+    # (compacting copies every working array). Inputs are expected
+    # NaN-free (Quality fills missing values); NaN would go left.
+
+    def __init__(self, table, roots, n_features, feature_names=None):
+
+        # Plain ndarray views of the mapping: np.memmap results carry
+        # per-call overhead that adds up over thousands of gathers
+        table = np.asarray(table)
+
+        self.feature = table[FEATURE]
+        self.threshold = table[THRESHOLD].view(np.float32)
+        self.child = table[CHILD]
+        self.value = table[VALUE].view(np.float32)
+
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.n_features = n_features
+        self.feature_names = feature_names
+
+    @classmethod
+    def load(cls, path):
+
+        with open(meta_path(path), "r") as f:
+            meta = json.load(f)
+
+        return cls(
+            np.load(path, mmap_mode="r"),
+            meta["roots"],
+            meta["n_features"],
+            meta["feature_names"]
+        )
+
+    def as_matrix(self, X):
+
+        if hasattr(X, "columns"):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+
+        X = np.asarray(X, dtype=np.float32)
+
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, "
+                f"forest expects {self.n_features}"
+            )
+
+        return X
+
+    def descend(self, values, offset, node, owner, out, compact_every):
+
+        # values[offset + feature] is the row's value for the split
+        # feature; out[owner] collects leaf values as pairs finish
+        level = 0
+
+        # mode="clip" skips the bounds check; every index is valid
+        while len(node):
+
+            index = np.take(self.feature, node, mode="clip")
+            index *= offset[0]
+            index += offset[1]
+
+            right = np.take(values, index, mode="clip") > \
+                np.take(self.threshold, node, mode="clip")
+
+            node = np.take(self.child, node, mode="clip")
+            node += right
+
+            level += 1
+
+            if level % compact_every:
+                continue
+
+            leaf = np.isinf(np.take(self.threshold, node, mode="clip"))
+
+            if leaf.any():
+                out += np.bincount(
+                    owner[leaf],
+                    weights=np.take(self.value, node[leaf]),
+                    minlength=len(out)
+                )
+
+                keep = ~leaf
+                node, owner = node[keep], owner[keep]
+                offset = (offset[0], offset[1][keep])
+
+        return out
+
+    def predict_together(self, X):
+
+        # Row-major X; one flat pair list, tree-major
+        rows, k = X.shape
+        trees = len(self.roots)
+
+        row = np.tile(np.arange(rows, dtype=np.int32), trees)
+
+        total = self.descend(
+            np.ascontiguousarray(X).ravel(),
+            (1, row * k),
+            np.repeat(self.roots, rows),
+            row,
+            np.zeros(rows),
+            compact_every=4
+        )
+
+        return total / trees
+
+    def predict_by_tree(self, X):
+
+        # Column-major X: a split reads one contiguous feature column
+        rows = len(X)
+        columns = np.ascontiguousarray(X.T).ravel()
+        row = np.arange(rows, dtype=np.int32)
+
+        total = np.zeros(rows)
+
+        for root in self.roots:
+            self.descend(
+                columns,
+                (rows, row),
+                np.full(rows, root, dtype=np.int32),
+                row,
+                total,
+                compact_every=8
+            )
+
+        return total / len(self.roots)
+
+    def predict(self, X):
+
+        X = self.as_matrix(X)
+
+        if len(X) < TREE_BY_TREE_ROWS:
+            return self.predict_together(X)
+
+        return np.concatenate([
+            self.predict_by_tree(X[start:start + CHUNK_ROWS])
+            for start in range(0, len(X), CHUNK_ROWS)
+        ])
+
+
+def load_compiled(model_path):
+
+    # The compiled copy of a saved forest, if it is at least as new as
+    # the model itself
+    path = compiled_path(model_path)
+
+    try:
+        if os.path.getmtime(path) < os.path.getmtime(model_path):
+            return None
+
+        return CompiledForest.load(path)
+
+    except (OSError, ValueError, KeyError):
+        return None
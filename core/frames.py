@@ -0,0 +1,22 @@
+import pandas as pd
+
+
+def enable_copy_on_write():
+
+    # Copy-on-write is always on from pandas 3.0 (and the option is
+    # deprecated there); on 2.x it has to be opted into.
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+enable_copy_on_write()
+
+
+def split_target(df, target="Revenue"):
+
+    # Under copy-on-write both are lazy views of df's columns: no data
+    # is copied until one side is modified.
+    X = df.drop(columns=[target])
+    y = df[target]
+
+    return X, y
@@ -0,0 +1,174 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+
+# ---------------- CONFIG ---------------- #
+
+# "full" refits every file from scratch; "incremental" only trains on
+# batches the models have not seen yet
+TRAINING_MODE = "full"
+
+# Trees in a full retrain
+FOREST_TREES = 100
+
+# New trees grown per batch, and the forest size past which the oldest
+# trees are retired (0 keeps every tree)
+TREES_PER_BATCH = int(os.getenv("ADIP_TREES_PER_BATCH", "50"))
+MAX_TREES = int(os.getenv("ADIP_MAX_TREES", "500"))
+
+
+def training_mode():
+
+    # Read at call time so the orchestrator's --incremental flag applies
+    return os.getenv("ADIP_TRAINING_MODE", TRAINING_MODE)
+
+
+def forest_trees():
+
+    # Read at call time too: --preview trains smaller forests
+    return int(os.getenv("ADIP_FOREST_TREES", FOREST_TREES))
+
+
+def file_digest(path):
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+# ---------------- ONLINE OLS ---------------- #
+
+def ols_stats(X, y, chunk_size=100_000):
+
+    # Sufficient statistics of one batch. Summed over batches they give
+    # exactly the least-squares fit of all rows seen, so updating costs
+    # the batch, not the history. Accumulated in float64 per chunk.
+    k = X.shape[1]
+
+    stats = {
+        "n": np.zeros(1),
+        "sum_x": np.zeros(k),
+        "sum_y": np.zeros(1),
+        "xtx": np.zeros((k, k)),
+        "xty": np.zeros(k)
+    }
+
+    for start in range(0, len(X), chunk_size):
+
+        xc = np.asarray(X[start:start + chunk_size], dtype=np.float64)
+        yc = np.asarray(y[start:start + chunk_size], dtype=np.float64)
+
+        stats["n"] += len(xc)
+        stats["sum_x"] += xc.sum(axis=0)
+        stats["sum_y"] += yc.sum()
+        stats["xtx"] += xc.T @ xc
+        stats["xty"] += xc.T @ yc
+
+    return stats
+
+
+def combine_stats(parts):
+
+    return {key: sum(p[key] for p in parts) for key in parts[0]}
+
+
+def solve_ols(stats):
+
+    # Centred normal equations, so the intercept is not penalised and
+    # constant columns get a zero coefficient (min-norm, as lstsq does)
+    n = stats["n"][0]
+    mean_x = stats["sum_x"] / n
+    mean_y = stats["sum_y"][0] / n
+
+    cov = stats["xtx"] - n * np.outer(mean_x, mean_x)
+    cross = stats["xty"] - n * mean_x * mean_y
+
+    coef = np.linalg.lstsq(cov, cross, rcond=None)[0]
+
+    model = LinearRegression()
+    model.coef_ = coef
+    model.intercept_ = float(mean_y - mean_x @ coef)
+    model.n_features_in_ = len(coef)
+
+    return model
+
+
+# ---------------- REGISTRY ---------------- #
+
+class ModelRegistry:
+
+    # Which batches (file + content digest) each incremental model has
+    # been trained on, in training order. For the forest it also keeps
+    # how many trees each batch contributed, oldest first, matching the
+    # order of estimators_.
+
+    def __init__(self, state_dir):
+
+        self.state_dir = state_dir
+        self.path = os.path.join(state_dir, "registry.json")
+
+        os.makedirs(state_dir, exist_ok=True)
+
+        self.data = self.load()
+
+    def load(self):
+
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"columns": None, "models": {}}
+
+    def save(self):
+
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(self.data, f, indent=2)
+
+        os.replace(self.path + ".tmp", self.path)
+
+    def reset(self, columns):
+
+        # Features changed: nothing trained so far can be extended
+        self.data = {"columns": list(columns), "models": {}}
+
+    def batches(self, model):
+
+        return self.data["models"].setdefault(model, [])
+
+    def has_seen(self, model, file, digest):
+
+        return any(
+            b["file"] == file and b["digest"] == digest
+            for b in self.batches(model)
+        )
+
+    def record(self, model, file, digest, rows, trees=None):
+
+        # A re-trained batch moves to the end: its contribution is newest
+        batches = [b for b in self.batches(model) if b["file"] != file]
+
+        entry = {"file": file, "digest": digest, "rows": int(rows)}
+
+        if trees is not None:
+            entry["trees"] = int(trees)
+
+        batches.append(entry)
+        self.data["models"][model] = batches
+
+    def retire(self, model, file):
+
+        # Kept in the list (so the batch still counts as seen), with no
+        # trees left in the forest
+        for b in self.batches(model):
+            if b["file"] == file:
+                b["trees"] = 0
+                b["retired"] = True
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+
+
+# ---------------- CONFIG ---------------- #
+
+MATRIX_DIR = "data/matrix"
+
+MATRIX_SUFFIX = ".f32.npy"
+
+
+# ---------------- TRAINING MATRIX ---------------- #
+
+def matrix_path(matrix_dir, filename):
+
+    stem = os.path.splitext(filename)[0]
+
+    return os.path.join(matrix_dir, stem + MATRIX_SUFFIX)
+
+
+def write_matrix(X, path, order=None):
+
+    # One C-contiguous float32 matrix on disk, filled a column at a time
+    # so at most one converted column is in memory besides the frame.
+    # Rows are written in `order` (e.g. train rows then test rows), which
+    # turns a split into two slices of the same mapping.
+    rows = len(X) if order is None else len(order)
+
+    tmp_path = path + ".tmp.npy"
+
+    out = np.lib.format.open_memmap(
+        tmp_path,
+        mode="w+",
+        dtype=np.float32,
+        shape=(rows, X.shape[1])
+    )
+
+    for j, col in enumerate(X.columns):
+
+        values = X[col].to_numpy(dtype=np.float32)
+
+        out[:, j] = values if order is None else values[order]
+
+    out.flush()
+    del out
+
+    os.replace(tmp_path, path)
+
+    return open_matrix(path)
+
+
+def open_matrix(path):
+
+    # Read-only mapping: every fit, predict and worker shares the page
+    # cache instead of holding its own copy
+    return np.load(path, mmap_mode="r")
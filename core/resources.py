@@ -0,0 +1,181 @@
+import os
+import sys
+import itertools
+import threading
+import contextlib
+import contextvars
+
+from threadpoolctl import threadpool_limits
+
+
+# ---------------- CONFIG ---------------- #
+
+# Relative claim on the thread budget when stages run side by side:
+# ML (forest fitting) scales with threads, the others mostly don't
+STAGE_WEIGHTS = {"ml": 4}
+
+DEFAULT_WEIGHT = 1
+
+
+def available_cpus():
+
+    # CPUs this process may run on (cgroup/taskset aware on Linux)
+    try:
+        return len(os.sched_getaffinity(0))
+
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_budget():
+
+    # Set by the scheduler for each pipeline it starts
+    return int(os.getenv("ADIP_CPU_BUDGET", "0")) or available_cpus()
+
+
+# ---------------- COORDINATOR ---------------- #
+
+class ResourceCoordinator:
+
+    # Hands every stage an explicit thread budget on entry, so stages
+    # overlapping in the DAG (analytics/ml, monitor/llm) never ask for
+    # more threads than there are CPUs:
+    #
+    #   - a stage's share is its weight over the weights of the stages
+    #     that can run alongside it, capped by what is not leased yet
+    #   - sklearn n_jobs and executor sizes use the caller's own lease
+    #     (threads())
+    #   - BLAS/OpenMP and Arrow pools are process-wide, so they are set
+    #     to the smallest lease among running stages whenever one enters
+    #     or leaves
+    #
+    # A stage always gets at least one thread, so running stages are
+    # never blocked.
+
+    def __init__(self, budget=None, weights=None):
+
+        self.budget = budget or default_budget()
+        self.weights = dict(STAGE_WEIGHTS if weights is None else weights)
+
+        # stage → stages with no dependency path to or from it
+        self.concurrent = {}
+
+        # (stage, n) → threads; n tells apart re-entries of one stage
+        self.leases = {}
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.current = contextvars.ContextVar("threads", default=None)
+
+        self.limiter = None
+
+    def configure(self, budget=None, deps=None):
+
+        if budget is not None:
+            self.budget = budget
+
+        if deps is not None:
+            self.concurrent = concurrent_stages(deps)
+
+    def weight(self, stage):
+
+        return self.weights.get(stage, DEFAULT_WEIGHT)
+
+    def share(self, stage):
+
+        peers = self.concurrent.get(stage, set())
+        total = self.weight(stage) + sum(self.weight(p) for p in peers)
+
+        return max(1, self.budget * self.weight(stage) // total)
+
+    def threads(self):
+
+        # The calling stage's lease; the whole budget outside any stage
+        return self.current.get() or self.budget
+
+    # ---------- Leases ---------- #
+
+    @contextlib.contextmanager
+    def stage(self, name):
+
+        with self.lock:
+
+            leased = sum(self.leases.values())
+            threads = max(1, min(self.share(name), self.budget - leased))
+
+            key = (name, next(self.ids))
+            self.leases[key] = threads
+            self.apply()
+
+        token = self.current.set(threads)
+
+        try:
+            yield threads
+
+        finally:
+
+            self.current.reset(token)
+
+            with self.lock:
+                del self.leases[key]
+                self.apply()
+
+    def apply(self):
+
+        # Process-wide pools follow the smallest running lease; once
+        # nothing runs, BLAS/OpenMP get their original sizes back and
+        # Arrow the whole budget. Lock held.
+        if self.limiter is not None:
+            self.limiter.restore_original_limits()
+            self.limiter = None
+
+        if not self.leases:
+            set_arrow_threads(self.budget)
+            return
+
+        threads = min(self.leases.values())
+
+        self.limiter = threadpool_limits(limits=threads)
+        set_arrow_threads(threads)
+
+
+def set_arrow_threads(threads):
+
+    # Only if a stage already loaded pyarrow; importing it here would
+    # cost every stage that doesn't use it
+    pa = sys.modules.get("pyarrow")
+
+    if pa is not None:
+        pa.set_cpu_count(threads)
+
+
+def concurrent_stages(deps):
+
+    # For each stage, the stages that are neither its ancestors nor its
+    # descendants, i.e. that the DAG may run at the same time
+    ancestors = {}
+
+    def collect(name):
+
+        if name not in ancestors:
+            ancestors[name] = set()
+
+            for parent in deps.get(name, []):
+                ancestors[name] |= {parent} | collect(parent)
+
+        return ancestors[name]
+
+    for name in deps:
+        collect(name)
+
+    return {
+        name: {
+            other for other in deps
+            if other != name
+            and other not in ancestors[name]
+            and name not in ancestors[other]
+        }
+        for name in deps
+    }
+
+
+resources = ResourceCoordinator()
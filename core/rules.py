@@ -0,0 +1,336 @@
+import os
+import re
+import json
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ---------------- #
+
+# A quality_rules.json/.yaml in the working directory (or workspace)
+# overrides the defaults shipped with the repo
+RULES_FILES = ["quality_rules.json", "quality_rules.yaml", "quality_rules.yml"]
+
+DEFAULT_RULES = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "rules",
+    "quality_rules.json"
+)
+
+CHECKS = {"not_null", "gt", "ge", "lt", "le", "between", "in", "matches"}
+
+ACTIONS = {"drop", "flag", "fix"}
+
+# One bit per rule in a uint64 mask
+MAX_RULES = 64
+
+
+def rules_path():
+
+    path = os.getenv("ADIP_QUALITY_RULES")
+
+    if path:
+        return path
+
+    for name in RULES_FILES:
+        if os.path.exists(name):
+            return name
+
+    return DEFAULT_RULES
+
+
+def load_spec(path):
+
+    with open(path, "r") as f:
+
+        if path.endswith((".yaml", ".yml")):
+
+            try:
+                import yaml
+
+            except ImportError:
+                raise ImportError(
+                    "YAML rule files require the PyYAML package"
+                ) from None
+
+            return yaml.safe_load(f)
+
+        return json.load(f)
+
+
+# ---------------- RULES ---------------- #
+
+class Rule:
+
+    # One column check from the spec, e.g.
+    #   {"name": "positive_quantity", "column": "Quantity",
+    #    "check": "gt", "value": 0, "action": "flag"}
+    # Nulls never violate a value check; use "not_null" for those.
+
+    def __init__(self, spec, bit):
+
+        self.name = spec.get("name") or f"{spec['column']}_{spec['check']}"
+        self.column = spec["column"]
+        self.check = spec["check"]
+        self.action = spec.get("action", "flag")
+        self.bit = bit
+
+        if self.check not in CHECKS:
+            raise ValueError(f"Rule {self.name}: unknown check {self.check}")
+
+        if self.action not in ACTIONS:
+            raise ValueError(f"Rule {self.name}: unknown action {self.action}")
+
+        self.value = spec.get("value")
+        self.low = spec.get("min")
+        self.high = spec.get("max")
+        self.values = spec.get("values")
+        self.pattern = re.compile(spec["pattern"]) \
+            if self.check == "matches" else None
+
+        # "clip" (range checks) or a constant replacement
+        self.fix = spec.get("fix")
+
+        if self.action == "fix" and self.fix is None:
+            raise ValueError(f"Rule {self.name}: action fix needs 'fix'")
+
+    @property
+    def textual(self):
+
+        return self.check in {"in", "matches"}
+
+    def passes(self, values):
+
+        # Elementwise on non-null values: True where the check holds.
+        # Text checks get a Series of distinct values (Arrow kernels for
+        # string dtypes), the others a float array.
+        if self.check == "in":
+            return values.isin(self.values).to_numpy()
+
+        if self.check == "matches":
+            return values.astype(str).str.fullmatch(self.pattern.pattern) \
+                .to_numpy(dtype=bool, na_value=False)
+
+        if self.check == "gt":
+            return values > self.value
+
+        if self.check == "ge":
+            return values >= self.value
+
+        if self.check == "lt":
+            return values < self.value
+
+        if self.check == "le":
+            return values <= self.value
+
+        # between
+        ok = np.ones(len(values), dtype=bool)
+
+        if self.low is not None:
+            ok &= values >= self.low
+        if self.high is not None:
+            ok &= values <= self.high
+
+        return ok
+
+    def fixed(self, values, violated):
+
+        if self.fix == "clip":
+            low = self.low if self.check == "between" else self.value
+            high = self.high if self.check == "between" else self.value
+
+            if self.check in {"gt", "ge"}:
+                high = None
+            if self.check in {"lt", "le"}:
+                low = None
+
+            return np.where(violated, np.clip(values, low, high), values)
+
+        return np.where(violated, self.fix, values)
+
+
+class RuleSet:
+
+    # The spec compiled per column: each column is pulled out of the
+    # frame once, numeric checks run as array comparisons, and text
+    # checks run once per distinct value (factorize) and are gathered
+    # back to rows, so more rules on a column cost little more. Every
+    # rule's result is OR-ed into one bit of a uint64 mask in place.
+
+    def __init__(self, rules):
+
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"At most {MAX_RULES} rules are supported")
+
+        self.rules = rules
+
+        self.by_column = {}
+        for rule in rules:
+            self.by_column.setdefault(rule.column, []).append(rule)
+
+        self.drop_bits = self.bits("drop")
+        self.flag_bits = self.bits("flag")
+
+    @classmethod
+    def from_spec(cls, spec):
+
+        return cls([
+            Rule(rule, bit) for bit, rule in enumerate(spec.get("rules", []))
+        ])
+
+    @classmethod
+    def load(cls, path=None):
+
+        return cls.from_spec(load_spec(path or rules_path()))
+
+    def bits(self, action):
+
+        mask = 0
+
+        for rule in self.rules:
+            if rule.action == action:
+                mask |= 1 << rule.bit
+
+        return np.uint64(mask)
+
+    # ---------- Evaluation ---------- #
+
+    def column_values(self, series, rules):
+
+        # (values, valid) as numpy, converted once for all of the
+        # column's rules; non-numbers fail numeric checks
+        valid = series.notna().to_numpy()
+
+        if all(r.textual or r.check == "not_null" for r in rules):
+            return None, valid
+
+        if pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+
+        else:
+            values = pd.to_numeric(series, errors="coerce") \
+                .to_numpy(dtype=float, na_value=np.nan)
+
+        return values, valid
+
+    def violations(self, series, rules):
+
+        # {rule: violated rows} for one column
+        values, valid = self.column_values(series, rules)
+
+        textual = [r for r in rules if r.textual]
+        result = {}
+
+        # A lone check on an Arrow string column runs faster on the
+        # column itself than factorizing it first
+        if len(textual) == 1 and isinstance(series.dtype, pd.StringDtype):
+
+            result[textual[0]] = valid & ~textual[0].passes(series)
+
+        elif textual:
+
+            codes, uniques = pd.factorize(series)
+            uniques = pd.Series(uniques)
+
+            for rule in textual:
+                bad = ~rule.passes(uniques)
+                result[rule] = valid & bad[np.maximum(codes, 0)]
+
+        for rule in rules:
+
+            if rule.textual:
+                continue
+
+            if rule.check == "not_null":
+                result[rule] = ~valid
+                continue
+
+            with np.errstate(invalid="ignore"):
+                ok = rule.passes(values)
+
+            result[rule] = valid & ~ok
+
+        return result
+
+    def evaluate(self, df):
+
+        # Bitmask per row; rules on columns the frame lacks are skipped
+        mask = np.zeros(len(df), dtype=np.uint64)
+
+        for column, rules in self.by_column.items():
+
+            if column not in df.columns:
+                continue
+
+            for rule, violated in self.violations(df[column], rules).items():
+                np.bitwise_or(
+                    mask,
+                    np.uint64(1 << rule.bit),
+                    out=mask,
+                    where=violated
+                )
+
+        return mask
+
+    def counts(self, mask):
+
+        return {
+            rule.name: int(np.count_nonzero(mask & np.uint64(1 << rule.bit)))
+            for rule in self.rules
+        }
+
+    # ---------- Actions ---------- #
+
+    def apply(self, df):
+
+        # (kept rows, their mask, dropped rows, their mask, per-rule
+        # counts). fix rules rewrite their column in place of the bad
+        # values; dropped rows keep the values they were evaluated with.
+        mask = self.evaluate(df)
+        counts = self.counts(mask)
+
+        drop = (mask & self.drop_bits) != 0
+
+        if drop.any():
+            dropped, dropped_mask = df[drop], mask[drop]
+
+        else:
+            drop = None
+            dropped, dropped_mask = df.iloc[:0], mask[:0]
+
+        fixes = [
+            r for r in self.rules
+            if r.action == "fix" and counts[r.name] and r.column in df.columns
+        ]
+
+        if fixes:
+
+            updates = {}
+
+            for rule in fixes:
+
+                column = updates.get(rule.column, df[rule.column].to_numpy())
+                violated = (mask >> np.uint64(rule.bit)) & np.uint64(1)
+
+                updates[rule.column] = rule.fixed(column, violated == 1)
+
+            df = df.assign(**updates)
+
+        if drop is None:
+            return df, mask, dropped, dropped_mask, counts
+
+        return df[~drop], mask[~drop], dropped, dropped_mask, counts
+
+    def describe(self, counts):
+
+        return {
+            rule.name: {
+                "column": rule.column,
+                "check": rule.check,
+                "action": rule.action,
+                "bit": rule.bit,
+                "violations": counts[rule.name]
+            }
+            for rule in self.rules
+        }
@@ -0,0 +1,348 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.compressed import is_compressed, strip_suffix, csv_members
+from core.dedup import row_hashes
+
+
+# ---------------- CONFIG ---------------- #
+
+PREVIEW_DIR = "preview"
+
+PREVIEW_ROWS = int(os.getenv("ADIP_PREVIEW_ROWS", "20000"))
+
+# Forest size for preview runs; a preview model is only a smoke test
+PREVIEW_TREES = 20
+
+# Every Country × month keeps at least this many rows, however small
+MIN_PER_STRATUM = 20
+
+CHUNK_ROWS = 200_000
+
+STRATA_FILE = "data/preview/strata.json"
+
+# Raw bytes pass through unchanged: latin1 maps every byte to one char
+RAW_ENCODING = "latin1"
+
+# z for the 95% intervals around the estimates
+Z_95 = 1.96
+
+
+def stratum_columns(df):
+
+    # (country, YYYYMM) per row; formatting dates as text costs more
+    # than parsing them, so months stay integers (-1: no usable date).
+    # Invoice lines share timestamps: each distinct one is parsed once.
+    codes, uniques = pd.factorize(df["InvoiceDate"])
+
+    dates = pd.to_datetime(pd.Series(uniques), errors="coerce")
+    months = (dates.dt.year * 100 + dates.dt.month).fillna(-1) \
+        .astype(int).to_numpy()
+
+    month = np.where(codes < 0, -1, months[codes])
+
+    if "Country" in df.columns:
+        country = df["Country"].astype(str)
+    else:
+        country = pd.Series("all", index=df.index)
+
+    return country.to_numpy(dtype=object), month
+
+
+def stratum_name(country, month):
+
+    if month < 0:
+        return f"{country}|unknown"
+
+    return f"{country}|{month // 100}-{month % 100:02d}"
+
+
+def stratum_keys(df):
+
+    # "<Country>|<YYYY-MM>" per row
+    country, month = stratum_columns(df)
+
+    names = pd.DataFrame({"c": country, "m": month})
+    pairs, uniques = pd.MultiIndex.from_frame(names).factorize()
+
+    return np.array(
+        [stratum_name(c, m) for c, m in uniques],
+        dtype=object
+    )[pairs]
+
+
+# ---------------- SAMPLER ---------------- #
+
+class StratifiedSampler:
+
+    # One streaming pass per raw file. Every row gets a key in [0, 1);
+    # a row stays if its key is among the `rows` smallest of the file
+    # (proportional to stratum size) or among the MIN_PER_STRATUM
+    # smallest of its Country × month stratum (so small strata show up
+    # at all). Either way the rows kept from a stratum are the ones
+    # with its smallest keys, i.e. a random sample of it, and
+    # population / sample size is its weight.
+    #
+    # The key is the row's content hash, not a random draw: exact
+    # duplicates are kept or dropped together, so Quality's dedup
+    # removes the same share of the preview as of the full data, and
+    # the same raw file always gives the same preview.
+
+    def __init__(self, rows=PREVIEW_ROWS, min_per_stratum=MIN_PER_STRATUM,
+                 chunk_rows=CHUNK_ROWS):
+
+        self.rows = rows
+        self.min_per_stratum = min_per_stratum
+        self.chunk_rows = chunk_rows
+
+    def chunks(self, path):
+
+        if path.endswith(".csv"):
+            openers = [lambda: open(path, "rb")]
+
+        elif is_compressed(path):
+            openers = [opener for _, opener in csv_members(path)]
+
+        else:
+            # Workbooks can't be streamed; read once, then sliced
+            from core.excel import ExcelReader
+
+            df = ExcelReader().load(path)
+
+            for start in range(0, len(df), self.chunk_rows):
+                yield df.iloc[start:start + self.chunk_rows]
+
+            return
+
+        for opener in openers:
+            with opener() as f:
+                yield from pd.read_csv(
+                    f,
+                    encoding=RAW_ENCODING,
+                    dtype=str,
+                    keep_default_na=False,
+                    chunksize=self.chunk_rows
+                )
+
+    def keep(self, kept):
+
+        # Bottom-k on the key, overall and within each stratum
+        kept = kept.sort_values("_key", kind="stable")
+
+        overall = np.arange(len(kept)) < self.rows
+        in_stratum = kept.groupby(["_country", "_month"], sort=False) \
+            .cumcount().to_numpy() < self.min_per_stratum
+
+        return kept[overall | in_stratum]
+
+    def sample(self, path):
+
+        kept = None
+        population = None
+
+        for chunk in self.chunks(path):
+
+            keys = row_hashes(chunk) / np.float64(2**64)
+
+            chunk["_country"], chunk["_month"] = stratum_columns(chunk)
+            chunk["_key"] = keys
+
+            counts = chunk.groupby(["_country", "_month"]).size()
+            population = counts if population is None else \
+                population.add(counts, fill_value=0)
+
+            kept = self.keep(
+                chunk if kept is None else pd.concat([kept, chunk])
+            )
+
+        if kept is None:
+            return pd.DataFrame(), {}
+
+        sampled = kept.groupby(["_country", "_month"]).size()
+
+        strata = {
+            stratum_name(country, month): [
+                int(n), int(sampled.get((country, month), 0))
+            ]
+            for (country, month), n in population.sort_index().items()
+        }
+
+        # Back in file order, without the sampler's columns
+        sample = kept.sort_index(kind="stable").drop(
+            columns=["_country", "_month", "_key"]
+        )
+
+        return sample, strata
+
+    def sample_dir(self, raw_dir, out_dir, is_supported):
+
+        # Samples every supported raw file into out_dir as plain CSV;
+        # returns {output name: strata}
+        os.makedirs(out_dir, exist_ok=True)
+
+        results = {}
+
+        for file in sorted(os.listdir(raw_dir)):
+
+            if not is_supported(file):
+                continue
+
+            name = strip_suffix(file)
+            name = os.path.splitext(name)[0] + ".csv"
+
+            sample, strata = self.sample(os.path.join(raw_dir, file))
+
+            path = os.path.join(out_dir, name)
+
+            sample.to_csv(path + ".tmp", index=False, encoding=RAW_ENCODING)
+            os.replace(path + ".tmp", path)
+
+            population = sum(p for p, _ in strata.values())
+
+            print(f"🎯 {file}: {len(sample):,} of {population:,} rows "
+                  f"from {len(strata)} Country × month strata")
+
+            results[name] = strata
+
+        return results
+
+
+# ---------------- ESTIMATES ---------------- #
+
+def save_strata(strata, signature, path=STRATA_FILE):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path + ".tmp", "w") as f:
+        json.dump({"signature": signature, "files": strata}, f, indent=2)
+
+    os.replace(path + ".tmp", path)
+
+
+def load_strata(path=STRATA_FILE):
+
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def estimate_totals(df, strata):
+
+    # Full-data totals from one sampled file's clean rows. Weights use
+    # the raw sample size, so rows Quality dropped from the sample count
+    # as dropped from the full data in the same proportion. Variance is
+    # the stratified SRS variance with finite population correction.
+    revenue = df["Quantity"] * df["UnitPrice"]
+
+    frame = pd.DataFrame({
+        "stratum": stratum_keys(df),
+        "rows": 1.0,
+        "revenue": revenue.to_numpy(dtype=float),
+        "quantity": df["Quantity"].to_numpy(dtype=float)
+    })
+
+    sizes = pd.DataFrame(strata, index=["population", "sample"]).T
+    frame = frame[frame["stratum"].isin(sizes.index)]
+
+    totals = {}
+
+    for column in ["rows", "revenue", "quantity"]:
+
+        # Per stratum: sum and variance over the n_h raw sample rows,
+        # where rows Quality dropped count as zeros
+        grouped = frame.groupby("stratum")[column]
+
+        n = sizes["sample"].astype(float)
+        N = sizes["population"].astype(float)
+
+        total = grouped.sum().reindex(n.index, fill_value=0.0)
+        squares = (frame[column] ** 2).groupby(frame["stratum"]).sum() \
+            .reindex(n.index, fill_value=0.0)
+
+        mean = total / n
+        variance = (squares / n - mean ** 2) * n / (n - 1).clip(lower=1)
+
+        estimate = (N * mean).sum()
+        se = np.sqrt((N ** 2 * (1 - n / N) * variance / n).sum())
+
+        totals[column] = (float(estimate), float(se))
+
+    return totals
+
+
+def estimate_kpis(clean_frames, strata_by_file):
+
+    # Full-data KPIs next to what the preview itself shows, named like
+    # AnalyticsAgent.compute_kpis
+    estimates = {"rows": [0.0, 0.0], "revenue": [0.0, 0.0],
+                 "quantity": [0.0, 0.0]}
+    preview = {"rows": 0, "revenue": 0.0, "quantity": 0.0}
+
+    for name, df in clean_frames.items():
+
+        if name not in strata_by_file:
+            continue
+
+        for column, (value, se) in \
+                estimate_totals(df, strata_by_file[name]).items():
+            estimates[column][0] += value
+            estimates[column][1] += se ** 2
+
+        preview["rows"] += len(df)
+        preview["revenue"] += float((df["Quantity"] * df["UnitPrice"]).sum())
+        preview["quantity"] += float(df["Quantity"].sum())
+
+    def interval(column):
+
+        value, variance = estimates[column]
+        half = Z_95 * np.sqrt(variance)
+
+        return value, value - half, value + half
+
+    rows, rows_low, rows_high = interval("rows")
+    revenue, revenue_low, revenue_high = interval("revenue")
+    quantity, quantity_low, quantity_high = interval("quantity")
+
+    return {
+        "total_orders": {
+            "preview": preview["rows"],
+            "estimate": rows,
+            "ci95": [rows_low, rows_high]
+        },
+        "total_revenue": {
+            "preview": preview["revenue"],
+            "estimate": revenue,
+            "ci95": [revenue_low, revenue_high]
+        },
+        "total_quantity": {
+            "preview": preview["quantity"],
+            "estimate": quantity,
+            "ci95": [quantity_low, quantity_high]
+        },
+        "avg_revenue": {
+            "preview": preview["revenue"] / max(preview["rows"], 1),
+            "estimate": revenue / rows if rows else 0.0,
+            "ci95": None
+        }
+    }
+
+
+def print_estimates(estimates):
+
+    print("\n🔭 Full-data KPI estimates (from the preview sample)\n")
+    print(f"   {'':16s}{'preview':>16s}{'full (est.)':>18s}"
+          f"{'95% interval':>32s}")
+
+    for name, values in estimates.items():
+
+        ci = values["ci95"]
+        span = f"{ci[0]:,.0f} – {ci[1]:,.0f}" if ci else "-"
+
+        print(f"   {name:16s}{values['preview']:16,.2f}"
+              f"{values['estimate']:18,.2f}{span:>32s}")
@@ -0,0 +1,398 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import subprocess
+
+import pandas as pd
+
+from core.schema import SchemaRegistry
+
+
+# ---------------- CONFIG ---------------- #
+
+# One directory per dataset, laid out like the repo root (data/raw,
+# models, monitoring...), so every stage's relative paths stay apart
+WORKSPACE_ROOT = os.getenv("ADIP_WORKSPACE_ROOT", "workspaces")
+
+SCHEDULER_LOG = "monitoring/scheduler.jsonl"
+
+# Interpreter plus pandas/sklearn/langgraph, before any data is loaded
+BASE_MEMORY = 420 * 2**20
+
+# Peak over one run in multiples of the largest raw frame (files are
+# processed one at a time). Fitted against measured peak RSS: the
+# forest, which grows with the training rows, dominates.
+WORKING_COPIES = 10
+
+# Bytes read from the head of a CSV to estimate rows and row width
+SAMPLE_BYTES = 1 << 20
+
+# In-memory bytes per byte on disk where the file can't be sampled
+EXPANSION = {".gz": 12, ".bz2": 15, ".zst": 12, ".zip": 12, ".xlsx": 8}
+
+# Thread pools a job may start are capped to its CPU share
+THREAD_ENV = [
+    "ADIP_CPU_BUDGET",
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "LOKY_MAX_CPU_COUNT"
+]
+
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+UNITS = {"k": 2**10, "m": 2**20, "g": 2**30, "t": 2**40}
+
+
+def parse_size(value):
+
+    # "512M", "4g", "1.5G" or plain bytes
+    value = str(value).strip().lower().rstrip("b")
+
+    if value and value[-1] in UNITS:
+        return int(float(value[:-1]) * UNITS[value[-1]])
+
+    return int(value)
+
+
+def fmt_size(n):
+
+    return f"{n / 2**20:,.0f} MB"
+
+
+# ---------------- WORKSPACES ---------------- #
+
+def workspace_dir(name, root=WORKSPACE_ROOT):
+
+    if not NAME_PATTERN.match(name) or name in {".", ".."}:
+        raise ValueError(f"Invalid dataset name: {name!r}")
+
+    return os.path.join(root, name)
+
+
+def prepare_workspace(name, root=WORKSPACE_ROOT):
+
+    path = workspace_dir(name, root)
+
+    os.makedirs(os.path.join(path, "data", "raw"), exist_ok=True)
+
+    return path
+
+
+# ---------------- ESTIMATES ---------------- #
+
+def sample_csv(path, registry):
+
+    # (disk bytes per row, memory bytes per row) from the first
+    # SAMPLE_BYTES, parsed with the dtypes ingestion recorded last time
+    with open(path, "rb") as f:
+        head = f.read(SAMPLE_BYTES)
+
+    head = head[:head.rfind(b"\n") + 1] or head
+
+    options = registry.read_options("ingestion", path)
+
+    try:
+        df = pd.read_csv(io.BytesIO(head), encoding="latin1", **options)
+
+    except (ValueError, TypeError):
+        df = pd.read_csv(io.BytesIO(head), encoding="latin1")
+
+    rows = max(len(df), 1)
+
+    return len(head) / rows, df.memory_usage(deep=True).sum() / rows
+
+
+def estimate_memory(workspace):
+
+    # Peak resident memory of one pipeline run over the workspace's raw
+    # files, from their size and the row width ingestion last recorded
+    raw_dir = os.path.join(workspace, "data", "raw")
+    registry = SchemaRegistry(os.path.join(workspace, "data", "schemas"))
+
+    largest = 0
+    rows = 0
+    raw_bytes = 0
+
+    files = sorted(os.listdir(raw_dir)) if os.path.isdir(raw_dir) else []
+
+    for file in files:
+
+        path = os.path.join(raw_dir, file)
+        size = os.path.getsize(path)
+
+        if file.endswith(".csv"):
+
+            disk_row, memory_row = sample_csv(path, registry)
+
+            rows += size / disk_row
+            frame = size / disk_row * memory_row
+
+        elif os.path.splitext(file)[1] in EXPANSION:
+
+            frame = size * EXPANSION[os.path.splitext(file)[1]]
+
+        else:
+            continue
+
+        largest = max(largest, frame)
+        raw_bytes += size
+
+    return {
+        "memory": int(BASE_MEMORY + WORKING_COPIES * largest),
+        "rows": int(rows),
+        "raw_bytes": raw_bytes
+    }
+
+
+# ---------------- JOBS ---------------- #
+
+class PipelineJob:
+
+    # One orchestrator run in a dataset workspace. Timestamps are
+    # time.time(); peak_rss comes from the child's rusage.
+
+    def __init__(self, dataset, workspace, priority, cpus, args, seq):
+
+        self.dataset = dataset
+        self.workspace = workspace
+        self.priority = priority
+        self.cpus = cpus
+        self.args = list(args)
+        self.seq = seq
+
+        estimate = estimate_memory(workspace)
+
+        self.memory = estimate["memory"]
+        self.rows = estimate["rows"]
+        self.raw_bytes = estimate["raw_bytes"]
+
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+
+        self.process = None
+        self.log = None
+        self.returncode = None
+        self.peak_rss = None
+
+    def sort_key(self):
+
+        # Highest priority first, then submission order
+        return (-self.priority, self.seq)
+
+    def record(self):
+
+        run_s = self.finished - self.started
+
+        return {
+            "dataset": self.dataset,
+            "priority": self.priority,
+            "cpus": self.cpus,
+            "returncode": self.returncode,
+            "estimated_memory": self.memory,
+            "peak_rss": self.peak_rss,
+            "rows": self.rows,
+            "raw_bytes": self.raw_bytes,
+            "submitted_at": self.submitted,
+            "started_at": self.started,
+            "finished_at": self.finished,
+            "wait_s": self.started - self.submitted,
+            "run_s": run_s,
+            "rows_per_s": self.rows / run_s if run_s else None,
+            "mb_per_s": self.raw_bytes / 2**20 / run_s if run_s else None
+        }
+
+
+# ---------------- SCHEDULER ---------------- #
+
+class PipelineScheduler:
+
+    # Runs several dataset pipelines at once, each as its own
+    # orchestrator process inside its workspace. A job is admitted when
+    # its memory estimate and CPU share fit in what the running jobs
+    # leave of the budgets; the queue is strictly by priority, so a big
+    # high-priority job is never starved by smaller ones behind it. A
+    # job larger than a whole budget runs alone.
+
+    def __init__(self, memory_budget, cpu_budget=None,
+                 script="orchestrator.py", root=WORKSPACE_ROOT,
+                 log_path=SCHEDULER_LOG, poll_interval=0.2):
+
+        self.memory_budget = memory_budget
+        self.cpu_budget = cpu_budget or os.cpu_count() or 1
+        self.script = os.path.abspath(script)
+        self.root = root
+        self.log_path = log_path
+        self.poll_interval = poll_interval
+
+        self.queue = []
+        self.running = {}
+        self.done = []
+        self.seq = 0
+
+    def submit(self, dataset, priority=0, cpus=1, args=()):
+
+        workspace = prepare_workspace(dataset, self.root)
+
+        job = PipelineJob(
+            dataset,
+            workspace,
+            priority,
+            min(cpus, self.cpu_budget),
+            args,
+            self.seq
+        )
+
+        self.seq += 1
+        heapq.heappush(self.queue, (job.sort_key(), job))
+
+        print(f"📝 Queued {dataset} (priority {priority}, "
+              f"~{fmt_size(job.memory)}, {job.cpus} CPU)")
+
+        return job
+
+    # ---------- Admission ---------- #
+
+    def in_use(self):
+
+        return (
+            sum(job.memory for job in self.running.values()),
+            sum(job.cpus for job in self.running.values())
+        )
+
+    def fits(self, job):
+
+        if not self.running:
+            return True
+
+        memory, cpus = self.in_use()
+
+        return memory + job.memory <= self.memory_budget and \
+            cpus + job.cpus <= self.cpu_budget
+
+    def admit(self):
+
+        while self.queue and self.fits(self.queue[0][1]):
+
+            _, job = heapq.heappop(self.queue)
+            self.start(job)
+
+    def start(self, job):
+
+        env = dict(os.environ)
+
+        for name in THREAD_ENV:
+            env[name] = str(job.cpus)
+
+        job.log = open(os.path.join(job.workspace, "pipeline.log"), "w")
+
+        job.process = subprocess.Popen(
+            [sys.executable, self.script] + job.args,
+            cwd=job.workspace,
+            env=env,
+            stdout=job.log,
+            stderr=subprocess.STDOUT
+        )
+
+        job.started = time.time()
+        self.running[job.process.pid] = job
+
+        over = " (over budget, running alone)" \
+            if job.memory > self.memory_budget else ""
+
+        print(f"🚀 Started {job.dataset} after "
+              f"{job.started - job.submitted:.1f}s in queue{over}")
+
+    # ---------- Completion ---------- #
+
+    def reap(self):
+
+        # wait4 rather than Popen.poll: it also returns the child's rusage
+        for pid, job in list(self.running.items()):
+
+            finished, status, usage = os.wait4(pid, os.WNOHANG)
+
+            if not finished:
+                continue
+
+            job.finished = time.time()
+            job.returncode = os.waitstatus_to_exitcode(status)
+            job.process.returncode = job.returncode
+            job.peak_rss = usage.ru_maxrss * 1024
+            job.log.close()
+
+            del self.running[pid]
+            self.done.append(job)
+
+            status = "✅" if job.returncode == 0 else "❌"
+
+            print(f"{status} {job.dataset} finished in "
+                  f"{job.finished - job.started:.1f}s "
+                  f"(peak {fmt_size(job.peak_rss)}, "
+                  f"estimated {fmt_size(job.memory)})")
+
+            self.log(job.record())
+
+    def log(self, record):
+
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def run(self):
+
+        started = time.time()
+
+        print(f"\n🗓️ Scheduling {len(self.queue)} pipelines "
+              f"(memory {fmt_size(self.memory_budget)}, "
+              f"{self.cpu_budget} CPU)\n")
+
+        while self.queue or self.running:
+
+            self.admit()
+            time.sleep(self.poll_interval)
+            self.reap()
+
+        return self.report(time.time() - started)
+
+    # ---------- Report ---------- #
+
+    def report(self, wall_time):
+
+        records = [job.record() for job in self.done]
+
+        return {
+            "wall_time": wall_time,
+            "jobs": records,
+            "failed": [r["dataset"] for r in records if r["returncode"]]
+        }
+
+
+def print_scheduler_report(report):
+
+    print("\n📊 Scheduler Report\n")
+    print(f"   {'dataset':16s}{'prio':>5s}{'wait':>8s}{'run':>8s}"
+          f"{'rows/s':>10s}{'MB/s':>7s}{'estimate':>11s}{'peak':>10s}")
+
+    for r in report["jobs"]:
+
+        rate = f"{r['rows_per_s']:,.0f}" if r["rows_per_s"] else "-"
+        mb = f"{r['mb_per_s']:.1f}" if r["mb_per_s"] is not None else "-"
+
+        print(f"   {r['dataset']:16s}{r['priority']:5d}"
+              f"{r['wait_s']:7.1f}s{r['run_s']:7.1f}s"
+              f"{rate:>10s}{mb:>7s}"
+              f"{fmt_size(r['estimated_memory']):>11s}"
+              f"{fmt_size(r['peak_rss']):>10s}")
+
+    print(f"\n   wall time {report['wall_time']:.1f}s")
+
+    if report["failed"]:
+        print(f"   ❌ failed: {', '.join(report['failed'])} "
+              f"(see <workspace>/pipeline.log)")
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+
+import pandas as pd
+
+
+# ---------------- CONFIG ---------------- #
+
+SCHEMA_DIR = "data/schemas"
+
+TEXT_DTYPES = {"object", "str", "string"}
+
+
+def dataset_name(filename):
+
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def describe_changes(changes):
+
+    lines = []
+
+    for col, dtype in changes.get("added", {}).items():
+        lines.append(f"+ {col} ({dtype})")
+
+    for col, dtype in changes.get("removed", {}).items():
+        lines.append(f"- {col} ({dtype})")
+
+    for col, (old, new) in changes.get("changed", {}).items():
+        lines.append(f"~ {col}: {old} → {new}")
+
+    return lines
+
+
+def print_changes(filename, changes):
+
+    if not changes or not any(changes.values()):
+        return
+
+    print(f"🧬 Schema changed since last run: {filename}")
+
+    for line in describe_changes(changes):
+        print(f"   {line}")
+
+
+class SchemaRegistry:
+
+    # Persists the column → dtype map each stage writes, one JSON file
+    # per stage and dataset (data/schemas/<stage>/<dataset>.json). The
+    # next stage turns it into explicit read_csv arguments instead of
+    # re-inferring every column. Files are only rewritten when the
+    # schema changes, so unchanged runs leave checkpoints valid.
+
+    def __init__(self, schema_dir=SCHEMA_DIR):
+
+        self.schema_dir = schema_dir
+
+    def path(self, stage, dataset):
+
+        return os.path.join(self.schema_dir, stage, f"{dataset}.json")
+
+    def load(self, stage, dataset):
+
+        try:
+            with open(self.path(stage, dataset), "r") as f:
+                return json.load(f)
+
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    # ---------- Recording ---------- #
+
+    def diff(self, old, new):
+
+        return {
+            "added": {c: t for c, t in new.items() if c not in old},
+            "removed": {c: t for c, t in old.items() if c not in new},
+            "changed": {
+                c: (old[c], t) for c, t in new.items()
+                if c in old and old[c] != t
+            }
+        }
+
+    def record(self, stage, filename, df):
+
+        # Returns None for a first sighting, else the diff against the
+        # previous run (empty sections when nothing changed)
+        dataset = dataset_name(filename)
+        columns = {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+        previous = self.load(stage, dataset)
+        changes = None
+
+        if previous is not None:
+
+            changes = self.diff(previous["columns"], columns)
+
+            if not any(changes.values()):
+                return changes
+
+        schema = {
+            "dataset": dataset,
+            "stage": stage,
+            "columns": columns,
+            "updated": time.time(),
+            "last_change": changes
+        }
+
+        path = self.path(stage, dataset)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = path + ".tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(schema, f, indent=2)
+
+        os.replace(tmp_path, path)
+
+        return changes
+
+    # ---------- Loading ---------- #
+
+    def read_options(self, stage, filename, columns=None):
+
+        schema = self.load(stage, dataset_name(filename))
+
+        if schema is None:
+            return {"usecols": lambda c: c in columns} if columns else {}
+
+        dtypes = schema["columns"]
+        options = {"dtype": {}, "parse_dates": []}
+
+        # usecols has a cost of its own, so only pass it to project
+        if columns is not None:
+            dtypes = {c: t for c, t in dtypes.items() if c in columns}
+            options["usecols"] = list(dtypes)
+
+        for col, dtype in dtypes.items():
+
+            if dtype.startswith("datetime64"):
+                options["parse_dates"].append(col)
+
+            elif dtype in TEXT_DTYPES:
+                options["dtype"][col] = str
+
+            else:
+                options["dtype"][col] = dtype
+
+        return options
+
+    def read_csv(self, path, stage, columns=None):
+
+        # stage is the stage that wrote the file; columns projects the
+        # read down to what the caller uses
+        options = self.read_options(stage, path, columns)
+
+        try:
+            return pd.read_csv(path, **options)
+
+        except (ValueError, TypeError) as e:
+
+            # File and registry disagree (e.g. written by an older run):
+            # fall back to inference rather than fail the stage
+            print(f"⚠️ Schema mismatch for {os.path.basename(path)}: {e}")
+
+            if columns:
+                return pd.read_csv(path, usecols=lambda c: c in columns)
+
+            return pd.read_csv(path)
@@ -0,0 +1,730 @@
+import os
+import json
+import zlib
+import base64
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------- CONFIG ---------------- #
+
+PROFILE_DIR = "data/profiles"
+
+PROFILE_SUFFIX = ".profile.json"
+
+CHUNK_ROWS = 200_000
+
+# 2^12 registers per column: ~1.6% standard error on distinct counts
+HLL_PRECISION = 12
+
+# t-digest size: ~100 centroids, tails kept finest
+COMPRESSION = 200
+
+# Count-min table: errors stay under ~e/width of the rows counted
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+
+# Columns whose most frequent values are tracked
+HEAVY_HITTERS = ["StockCode", "Country"]
+TOP_K = 20
+
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+# Max CDF gap (two-sample KS statistic) that counts as drift
+DRIFT_KS = float(os.getenv("ADIP_DRIFT_KS", "0.1"))
+
+
+# ---------------- ENCODING ---------------- #
+
+def encode_array(array):
+
+    # Sketch state inside JSON: compressed bytes, base64
+    return {
+        "dtype": str(array.dtype),
+        "shape": list(array.shape),
+        "data": base64.b64encode(zlib.compress(array.tobytes())).decode()
+    }
+
+
+def decode_array(blob):
+
+    data = zlib.decompress(base64.b64decode(blob["data"]))
+
+    return np.frombuffer(data, dtype=blob["dtype"]) \
+        .reshape(blob["shape"]).copy()
+
+
+def value_hashes(values, numeric):
+
+    # 64-bit hash per value; numbers hash as float64 and everything else
+    # as text, so an int column in one file and a float column in
+    # another still count the same values once
+    if numeric:
+        values = np.asarray(values, dtype=float)
+    else:
+        values = pd.Series(values, dtype=object).astype(str).to_numpy()
+
+    # Values are distinct already: no need for hash_array to factorize
+    return pd.util.hash_array(values, categorize=False)
+
+
+def bit_length(values):
+
+    # Exact for uint64: float64 holds each 32-bit half without rounding
+    high = (values >> np.uint64(32)).astype(float)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(float)
+
+    return np.where(
+        high > 0,
+        32 + np.frexp(high)[1],
+        np.frexp(low)[1]
+    )
+
+
+# ---------------- HYPERLOGLOG ---------------- #
+
+class HyperLogLog:
+
+    # Distinct count from 2^p one-byte registers. The first p bits of a
+    # value's hash pick a register, which keeps the longest run of
+    # leading zeros seen in the remaining bits. Merging is a register-
+    # wise max, so it's exact: merged sketches equal one over all rows.
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+
+        self.precision = precision
+
+        self.registers = registers if registers is not None else \
+            np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, hashes):
+
+        bits = 64 - self.precision
+
+        index = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+
+        rank = (bits - bit_length(rest) + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+
+        harmonic = np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        estimate = alpha * m * m / harmonic
+        zeros = int(np.count_nonzero(self.registers == 0))
+
+        # Small cardinalities: linear counting on the empty registers
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+
+        return int(round(estimate))
+
+    def to_dict(self):
+
+        return {"precision": self.precision,
+                "registers": encode_array(self.registers)}
+
+    @classmethod
+    def from_dict(cls, state):
+
+        return cls(state["precision"], decode_array(state["registers"]))
+
+
+# ---------------- T-DIGEST ---------------- #
+
+class TDigest:
+
+    # Quantiles from weighted centroids. Compressing sorts the centroids
+    # and merges neighbours that fall into the same unit of the k1 scale
+    # (k = δ/2π · asin(2q - 1)), which is steep near q = 0 and 1: the
+    # tails stay in small clusters, the middle in large ones. Merging two
+    # digests is compressing their centroids together.
+
+    def __init__(self, compression=COMPRESSION, means=None, weights=None,
+                 low=np.inf, high=-np.inf):
+
+        self.compression = compression
+
+        self.means = means if means is not None else np.empty(0)
+        self.weights = weights if weights is not None else np.empty(0)
+
+        # Exact extremes anchor the outer quantiles
+        self.low = low
+        self.high = high
+
+    @property
+    def total(self):
+
+        return float(self.weights.sum())
+
+    def add(self, values):
+
+        values = values[np.isfinite(values)]
+
+        if not len(values):
+            return
+
+        self.low = min(self.low, float(values.min()))
+        self.high = max(self.high, float(values.max()))
+
+        self.compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))])
+        )
+
+    def merge(self, other):
+
+        if not len(other.means):
+            return
+
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+
+        self.compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights])
+        )
+
+    def compress(self, means, weights):
+
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k).astype(np.int64)
+
+        starts = np.flatnonzero(np.r_[True, cluster[1:] != cluster[:-1]])
+
+        merged = np.add.reduceat(weights, starts)
+        centers = np.add.reduceat(means * weights, starts) / merged
+
+        # A cluster of one repeated value keeps that value exactly, not
+        # a weighted mean a rounding error away from it
+        low = np.minimum.reduceat(means, starts)
+        high = np.maximum.reduceat(means, starts)
+
+        self.means = np.where(low == high, low, np.clip(centers, low, high))
+        self.weights = merged
+
+    def positions(self):
+
+        # Rank of each centroid's middle, with the extremes at both ends
+        ranks = np.cumsum(self.weights) - self.weights / 2
+
+        return (
+            np.r_[self.low, self.means, self.high],
+            np.r_[0.0, ranks, self.total]
+        )
+
+    def quantile(self, q):
+
+        if not len(self.means):
+            return None
+
+        values, ranks = self.positions()
+
+        return float(np.interp(q * self.total, ranks, values))
+
+    def cdf(self, x):
+
+        values, ranks = self.positions()
+
+        return np.interp(x, values, ranks) / self.total
+
+    def to_dict(self):
+
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "low": self.low,
+            "high": self.high
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+
+        return cls(
+            state["compression"],
+            np.array(state["means"], dtype=float),
+            np.array(state["weights"], dtype=float),
+            state["low"],
+            state["high"]
+        )
+
+
+# ---------------- COUNT-MIN ---------------- #
+
+class CountMin:
+
+    # Frequencies in a depth × width table of counters: each value adds
+    # its count to one counter per row (picked by a different slice of
+    # its hash) and reads back the smallest of them, which may
+    # overcount but never undercounts. Candidates for the top values
+    # are the top of each chunk plus the previous top, re-ranked by the
+    # table; tables merge by addition.
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH, top_k=TOP_K,
+                 table=None, top=None):
+
+        self.width = width
+        self.depth = depth
+        self.top_k = top_k
+
+        self.table = table if table is not None else \
+            np.zeros((depth, width), dtype=np.int64)
+
+        # hash → value of the current top values
+        self.top = top or {}
+
+    def slots(self, hashes):
+
+        # Row d uses the hash multiplied by its own odd constant
+        mults = np.array([
+            0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F,
+            0x165667B19E3779F9, 0xD6E8FEB86659FD93
+        ], dtype=np.uint64)[:self.depth, None]
+
+        return ((hashes[None, :] * mults) >> np.uint64(40)) \
+            .astype(np.int64) % self.width
+
+    def add(self, hashes, counts, values):
+
+        slots = self.slots(hashes)
+
+        for d in range(self.depth):
+            self.table[d] += np.bincount(
+                slots[d], weights=counts, minlength=self.width
+            ).astype(np.int64)
+
+        best = np.argsort(counts, kind="stable")[::-1][:self.top_k]
+
+        for i in best:
+            self.top[int(hashes[i])] = values[i]
+
+        self.trim()
+
+    def estimate(self, hashes):
+
+        slots = self.slots(hashes)
+
+        return self.table[np.arange(self.depth)[:, None], slots].min(axis=0)
+
+    def trim(self):
+
+        if len(self.top) <= self.top_k:
+            return
+
+        hashes = np.fromiter(self.top, dtype=np.uint64, count=len(self.top))
+        counts = self.estimate(hashes)
+
+        keep = np.argsort(counts, kind="stable")[::-1][:self.top_k]
+
+        self.top = {int(hashes[i]): self.top[int(hashes[i])] for i in keep}
+
+    def merge(self, other):
+
+        self.table += other.table
+        self.top.update(other.top)
+
+        self.trim()
+
+    def heavy_hitters(self):
+
+        if not self.top:
+            return []
+
+        hashes = np.fromiter(self.top, dtype=np.uint64, count=len(self.top))
+        counts = self.estimate(hashes)
+
+        order = np.argsort(counts, kind="stable")[::-1]
+
+        return [
+            [self.top[int(hashes[i])], int(counts[i])] for i in order
+        ]
+
+    def to_dict(self):
+
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "top_k": self.top_k,
+            "table": encode_array(self.table),
+            "top": [[str(h), v] for h, v in self.top.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+
+        return cls(
+            state["width"],
+            state["depth"],
+            state["top_k"],
+            decode_array(state["table"]),
+            {int(h): v for h, v in state["top"]}
+        )
+
+
+# ---------------- PROFILES ---------------- #
+
+class ColumnSketch:
+
+    # Null count, distinct count, and for numbers moments and quantiles,
+    # for text the heavy hitters if the column is tracked
+
+    def __init__(self, numeric, heavy=False):
+
+        self.numeric = numeric
+
+        self.rows = 0
+        self.nulls = 0
+
+        self.distinct = HyperLogLog()
+
+        # count, mean, M2 (Chan et al.), merged without the raw values
+        self.moments = [0, 0.0, 0.0]
+        self.digest = TDigest() if numeric else None
+
+        self.top = CountMin() if heavy else None
+
+    def add(self, series):
+
+        valid = series.notna().to_numpy()
+
+        self.rows += len(series)
+        self.nulls += int(len(series) - valid.sum())
+
+        values = series[valid]
+
+        if not len(values):
+            return
+
+        # Each distinct value is hashed once, whatever its row count
+        codes, uniques = pd.factorize(values)
+        hashes = value_hashes(uniques, self.numeric)
+
+        self.distinct.add(hashes)
+
+        if self.top is not None:
+            counts = np.bincount(codes, minlength=len(uniques))
+            self.top.add(hashes, counts, [str(u) for u in uniques])
+
+        if self.numeric:
+
+            array = values.to_numpy(dtype=float)
+
+            self.combine_moments(
+                len(array), float(array.mean()),
+                float(((array - array.mean()) ** 2).sum())
+            )
+
+            self.digest.add(array)
+
+    def combine_moments(self, n, mean, m2):
+
+        count, own_mean, own_m2 = self.moments
+
+        total = count + n
+        delta = mean - own_mean
+
+        self.moments = [
+            total,
+            own_mean + delta * n / total,
+            own_m2 + m2 + delta ** 2 * count * n / total
+        ]
+
+    def merge(self, other):
+
+        self.rows += other.rows
+        self.nulls += other.nulls
+
+        self.distinct.merge(other.distinct)
+
+        # A column numeric in one file and text in another: keep what
+        # both can describe
+        if self.numeric and other.numeric:
+
+            if other.moments[0]:
+                self.combine_moments(*other.moments)
+
+            self.digest.merge(other.digest)
+
+        else:
+            self.numeric = False
+            self.digest = None
+
+        if self.top is not None and other.top is not None:
+            self.top.merge(other.top)
+
+        elif other.top is not None:
+            self.top = other.top
+
+    def summary(self):
+
+        info = {
+            "null_rate": self.nulls / self.rows if self.rows else 0.0,
+            "nulls": self.nulls,
+            "distinct": self.distinct.count()
+        }
+
+        if self.numeric and self.moments[0]:
+
+            count, mean, m2 = self.moments
+
+            info["mean"] = mean
+            info["std"] = float(np.sqrt(m2 / (count - 1))) if count > 1 \
+                else 0.0
+            info["min"] = self.digest.low
+            info["max"] = self.digest.high
+            info["quantiles"] = {
+                str(q): self.digest.quantile(q) for q in QUANTILES
+            }
+
+        if self.top is not None:
+            info["top"] = self.top.heavy_hitters()
+
+        return info
+
+    def to_dict(self):
+
+        return {
+            "numeric": self.numeric,
+            "rows": self.rows,
+            "nulls": self.nulls,
+            "distinct": self.distinct.to_dict(),
+            "moments": self.moments,
+            "digest": self.digest.to_dict() if self.digest else None,
+            "top": self.top.to_dict() if self.top else None
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+
+        sketch = cls(state["numeric"])
+
+        sketch.rows = state["rows"]
+        sketch.nulls = state["nulls"]
+        sketch.distinct = HyperLogLog.from_dict(state["distinct"])
+        sketch.moments = state["moments"]
+
+        if state["digest"]:
+            sketch.digest = TDigest.from_dict(state["digest"])
+
+        if state["top"]:
+            sketch.top = CountMin.from_dict(state["top"])
+
+        return sketch
+
+
+class Profile:
+
+    # Per-column sketches over a stream of chunks, in one pass and in
+    # memory that doesn't grow with the rows. Profiles of chunks, files
+    # or partitions merge into the profile of their union, so a bigger
+    # profile never needs the data rescanned.
+
+    def __init__(self, heavy_hitters=HEAVY_HITTERS):
+
+        self.heavy_hitters = list(heavy_hitters)
+
+        self.rows = 0
+        self.columns = {}
+
+    def add(self, chunk):
+
+        self.rows += len(chunk)
+
+        for col in chunk.columns:
+
+            series = chunk[col]
+
+            if col not in self.columns:
+                self.columns[col] = ColumnSketch(
+                    pd.api.types.is_numeric_dtype(series),
+                    heavy=col in self.heavy_hitters
+                )
+
+            self.columns[col].add(series)
+
+        return self
+
+    def merge(self, other):
+
+        self.rows += other.rows
+
+        for col, sketch in other.columns.items():
+
+            if col in self.columns:
+                self.columns[col].merge(sketch)
+            else:
+                self.columns[col] = ColumnSketch.from_dict(sketch.to_dict())
+
+        return self
+
+    def summary(self):
+
+        return {
+            "rows": self.rows,
+            "columns": {
+                col: sketch.summary() for col, sketch in self.columns.items()
+            }
+        }
+
+    def to_dict(self):
+
+        return {
+            "rows": self.rows,
+            "heavy_hitters": self.heavy_hitters,
+            "columns": {
+                col: sketch.to_dict() for col, sketch in self.columns.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+
+        profile = cls(state.get("heavy_hitters", HEAVY_HITTERS))
+
+        profile.rows = state["rows"]
+        profile.columns = {
+            col: ColumnSketch.from_dict(sketch)
+            for col, sketch in state["columns"].items()
+        }
+
+        return profile
+
+
+def profile_chunks(chunks, heavy_hitters=HEAVY_HITTERS):
+
+    profile = Profile(heavy_hitters)
+
+    for chunk in chunks:
+        profile.add(chunk)
+
+    return profile
+
+
+def profile_frame(df, chunk_rows=CHUNK_ROWS, heavy_hitters=HEAVY_HITTERS):
+
+    # A frame already in memory, streamed in slices so temporaries stay
+    # chunk-sized
+    return profile_chunks(
+        (df.iloc[start:start + chunk_rows]
+         for start in range(0, len(df), chunk_rows)),
+        heavy_hitters
+    )
+
+
+def combine(profiles):
+
+    merged = Profile()
+
+    for profile in profiles:
+        merged.merge(profile)
+
+    return merged
+
+
+# ---------------- STORAGE ---------------- #
+
+def save_profile(path, profile):
+
+    # Summary for people, state for merging
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path + ".tmp", "w") as f:
+        json.dump({
+            "summary": profile.summary(),
+            "state": profile.to_dict()
+        }, f)
+
+    os.replace(path + ".tmp", path)
+
+    return path
+
+
+def load_profile(path, source=None):
+
+    # None if missing, unreadable, or older than the file it describes
+    try:
+        if source is not None and \
+                os.path.getmtime(path) < os.path.getmtime(source):
+            return None
+
+        with open(path, "r") as f:
+            return Profile.from_dict(json.load(f)["state"])
+
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+# ---------------- DRIFT ---------------- #
+
+def step_cdf(digest, x):
+
+    # Share of the weight in centroids at or below x. Interpolating
+    # between centroids smears a point mass (a count that is mostly 0)
+    # over its neighbours; as a step the atom stays whole, and elsewhere
+    # the error is at most one centroid's weight.
+    ranks = np.r_[0.0, np.cumsum(digest.weights)]
+
+    return ranks[np.searchsorted(digest.means, x, side="right")] / \
+        digest.total
+
+
+def ks_distance(reference, current):
+
+    # Largest CDF gap; both step functions only jump at centroids, so
+    # reading them at every centroid finds it
+    points = np.union1d(reference.means, current.means)
+
+    if not len(points):
+        return 0.0
+
+    return float(np.max(np.abs(
+        step_cdf(reference, points) - step_cdf(current, points)
+    )))
+
+
+def drift_report(reference, current):
+
+    # Numeric columns of `current` against the same columns of
+    # `reference`, e.g. a recent window against the full history
+    report = {}
+
+    for col, sketch in current.columns.items():
+
+        if not sketch.numeric or not sketch.moments[0]:
+            continue
+
+        stats = sketch.summary()
+
+        entry = {"mean": stats["mean"], "std": stats["std"]}
+
+        base = reference.columns.get(col) if reference else None
+
+        if base is not None and base.numeric and base.moments[0]:
+
+            base_stats = base.summary()
+
+            entry["reference_mean"] = base_stats["mean"]
+            entry["reference_std"] = base_stats["std"]
+            entry["ks"] = ks_distance(base.digest, sketch.digest)
+            entry["drift"] = entry["ks"] > DRIFT_KS
+
+        report[col] = entry
+
+    return report
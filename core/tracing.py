@@ -0,0 +1,318 @@
+import os
+import sys
+import json
+import time
+import uuid
+import cProfile
+import threading
+import functools
+import contextvars
+from collections import Counter
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+# ---------------- CONFIG ---------------- #
+
+TRACE_DIR = os.getenv("ADIP_TRACE_DIR", "data/traces")
+
+# Comma-separated stage names (or "all") to profile, and how:
+# "cprofile" (deterministic) or "sample" (stack sampling, low overhead)
+PROFILE_STAGES = os.getenv("ADIP_PROFILE", "")
+PROFILE_MODE = os.getenv("ADIP_PROFILE_MODE", "cprofile")
+
+SAMPLE_INTERVAL = 0.005
+
+
+# ---------------- RESOURCE COUNTERS ---------------- #
+
+def peak_rss_kb():
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def io_counters():
+
+    # Process-wide bytes passed through read()/write() (Linux only)
+    try:
+        with open("/proc/self/io", "r") as f:
+            fields = dict(line.split(": ") for line in f.read().splitlines())
+
+        return int(fields["rchar"]), int(fields["wchar"])
+
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def count_rows(value):
+
+    # pandas is looked up rather than imported: if no stage has loaded
+    # it yet, no argument can be a DataFrame.
+    pd = sys.modules.get("pandas")
+
+    if pd is not None and isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+
+    if isinstance(value, (tuple, list)):
+
+        counts = [count_rows(v) for v in value]
+        counts = [c for c in counts if c is not None]
+
+        return sum(counts) if counts else None
+
+    return None
+
+
+def delta(after, before):
+
+    if after is None or before is None:
+        return None
+
+    return after - before
+
+
+# ---------------- PROFILERS ---------------- #
+
+class StackSampler:
+
+    # Samples one thread's Python stack on a timer and aggregates it
+    # into collapsed "frame;frame;frame count" lines (flamegraph input).
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+
+    def sample(self):
+
+        while not self.stopped.wait(self.interval):
+
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} "
+                    f"({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self, path):
+
+        self.stopped.set()
+        self.thread.join()
+
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# ---------------- TRACER ---------------- #
+
+class Tracer:
+
+    def __init__(self, trace_dir=TRACE_DIR, run_id=None):
+
+        self.trace_dir = trace_dir
+        self.run_id = run_id or os.getenv("ADIP_RUN_ID") or \
+            time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+        self.profile_stages = {
+            s.strip() for s in PROFILE_STAGES.split(",") if s.strip()
+        }
+        self.profile_mode = PROFILE_MODE
+
+        self.current = contextvars.ContextVar("span", default=None)
+        self.lock = threading.Lock()
+
+    @property
+    def trace_path(self):
+        return os.path.join(self.trace_dir, f"{self.run_id}.jsonl")
+
+    def configure(self, profile=None, mode=None, run_id=None):
+
+        if profile is not None:
+            self.profile_stages = {
+                s.strip() for s in profile.split(",") if s.strip()
+            }
+
+        if mode is not None:
+            self.profile_mode = mode
+
+        if run_id is not None:
+            self.run_id = run_id
+
+    def new_run(self):
+
+        self.run_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+        return self.run_id
+
+    def should_profile(self, stage):
+
+        return "all" in self.profile_stages or stage in self.profile_stages
+
+    def emit(self, span):
+
+        line = json.dumps(span, default=str)
+
+        with self.lock:
+
+            os.makedirs(self.trace_dir, exist_ok=True)
+
+            with open(self.trace_path, "a") as f:
+                f.write(line + "\n")
+
+    def start_profile(self, stage):
+
+        if self.profile_mode == "sample":
+
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+
+            return sampler
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        return profiler
+
+    def stop_profile(self, profiler, stage):
+
+        os.makedirs(self.trace_dir, exist_ok=True)
+
+        if isinstance(profiler, StackSampler):
+
+            path = os.path.join(
+                self.trace_dir, f"{self.run_id}_{stage}.folded"
+            )
+            profiler.stop(path)
+
+        else:
+
+            profiler.disable()
+
+            path = os.path.join(
+                self.trace_dir, f"{self.run_id}_{stage}.prof"
+            )
+            profiler.dump_stats(path)
+
+        print(f"🔬 Profile for {stage} saved to: {path}")
+
+    def call(self, stage, name, func, args, kwargs):
+
+        parent = self.current.get()
+        span_id = uuid.uuid4().hex[:12]
+        token = self.current.set(span_id)
+
+        profiler = None
+        if name == "run" and self.should_profile(stage):
+            profiler = self.start_profile(stage)
+
+        read_before, written_before = io_counters()
+        rss_before = peak_rss_kb()
+        cpu_before = time.thread_time()
+        started = time.time()
+        wall_before = time.perf_counter()
+
+        status, error, result = "ok", None, None
+
+        try:
+            result = func(*args, **kwargs)
+            return result
+
+        except Exception as e:
+            status, error = "error", str(e)
+            raise
+
+        finally:
+
+            wall = time.perf_counter() - wall_before
+            cpu = time.thread_time() - cpu_before
+            read_after, written_after = io_counters()
+
+            self.current.reset(token)
+
+            if profiler is not None:
+                self.stop_profile(profiler, stage)
+
+            # cpu_s is this thread's CPU time. The RSS and I/O counters
+            # are process-wide: a span that overlaps another thread's
+            # work (the watch daemon, parallel stages) is charged for it
+            # too, and peak RSS only moves when the process high-water
+            # mark does. The names say so.
+            self.emit({
+                "run_id": self.run_id,
+                "span_id": span_id,
+                "parent_id": parent,
+                "stage": stage,
+                "name": f"{stage}.{name}",
+                "thread": threading.current_thread().name,
+                "start": started,
+                "wall_s": wall,
+                "cpu_s": cpu,
+                "process_peak_rss_delta_kb": delta(peak_rss_kb(), rss_before),
+                "rows_in": count_rows(list(args) + list(kwargs.values())),
+                "rows_out": count_rows(result),
+                "process_bytes_read": delta(read_after, read_before),
+                "process_bytes_written": delta(
+                    written_after, written_before
+                ),
+                "status": status,
+                "error": error
+            })
+
+
+tracer = Tracer()
+
+
+# ---------------- INSTRUMENTATION ---------------- #
+
+def instrument(stage, *steps):
+
+    # Class decorator: the agent's run() and the load/transform/save
+    # steps it names become spans "<stage>.<method>"; nested calls
+    # record their parent span. Small helpers (paths, lookups, checks)
+    # stay unwrapped so the trace isn't flooded with them.
+
+    def wrap(name, func):
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            return tracer.call(
+                stage,
+                name,
+                functools.partial(func, self),
+                args,
+                kwargs
+            )
+
+        return wrapper
+
+    def decorate(cls):
+
+        for name in ("run",) + steps:
+            setattr(cls, name, wrap(name, getattr(cls, name)))
+
+        return cls
+
+    return decorate
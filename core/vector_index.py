@@ -0,0 +1,147 @@
+import os
+import hashlib
+
+import numpy as np
+
+
+# ---------------- EMBEDDING ---------------- #
+
+class HashedNgramEmbedder:
+
+    # Offline embedding: character n-grams hashed into a fixed number of
+    # signed buckets and L2 normalised. No model download, no network.
+
+    def __init__(self, dim=1024, ngram_range=(3, 5)):
+
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dim = dim
+
+        self.vectorizer = HashingVectorizer(
+            analyzer="char_wb",
+            ngram_range=ngram_range,
+            n_features=dim,
+            alternate_sign=True,
+            lowercase=True,
+            norm="l2"
+        )
+
+    def embed_many(self, texts):
+
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+    def embed(self, text):
+
+        return self.embed_many([text])[0]
+
+
+# ---------------- INDEX ---------------- #
+
+def document_id(text):
+
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class VectorIndex:
+
+    # Persistent HNSW index (chromadb) over analytics reports and the
+    # insights generated from them. Insights are keyed by the id of the
+    # report they were generated from.
+
+    def __init__(self, index_dir="data/index", dim=1024):
+
+        self.index_dir = index_dir
+        self.embedder = HashedNgramEmbedder(dim=dim)
+
+        import chromadb
+
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        self.client = chromadb.PersistentClient(path=self.index_dir)
+
+        self.reports = self.client.get_or_create_collection(
+            "reports",
+            embedding_function=None,
+            metadata={"hnsw:space": "cosine"}
+        )
+
+        self.insights = self.client.get_or_create_collection(
+            "insights",
+            embedding_function=None,
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def _upsert(self, collection, ids, texts, metadatas):
+
+        batch = self.client.get_max_batch_size()
+        embeddings = self.embedder.embed_many(texts)
+
+        for i in range(0, len(ids), batch):
+
+            collection.upsert(
+                ids=ids[i:i + batch],
+                embeddings=embeddings[i:i + batch],
+                documents=texts[i:i + batch],
+                metadatas=metadatas[i:i + batch]
+            )
+
+    def add_reports(self, texts, sources):
+
+        ids = [document_id(t) for t in texts]
+        metadatas = [{"source": s} for s in sources]
+
+        self._upsert(self.reports, ids, texts, metadatas)
+
+        return ids
+
+    def add_report(self, text, source):
+
+        return self.add_reports([text], [source])[0]
+
+    def add_insight(self, report_id, text, source):
+
+        self._upsert(
+            self.insights,
+            [report_id],
+            [text],
+            [{"source": source}]
+        )
+
+    def get_insight(self, report_id):
+
+        result = self.insights.get(ids=[report_id], include=["documents"])
+
+        if not result["ids"]:
+            return None
+
+        return result["documents"][0]
+
+    def query(self, text, k=3):
+
+        count = self.reports.count()
+
+        if count == 0:
+            return []
+
+        result = self.reports.query(
+            query_embeddings=self.embedder.embed_many([text]),
+            n_results=min(k, count),
+            include=["documents", "metadatas", "distances"]
+        )
+
+        matches = []
+
+        for doc_id, doc, meta, dist in zip(
+            result["ids"][0],
+            result["documents"][0],
+            result["metadatas"][0],
+            result["distances"][0]
+        ):
+            matches.append({
+                "id": doc_id,
+                "report": doc,
+                "source": meta.get("source"),
+                "similarity": 1.0 - float(dist)
+            })
+
+        return matches
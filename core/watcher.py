@@ -0,0 +1,169 @@
+import os
+import time
+import threading
+
+
+WRITE_EVENTS = {"created", "modified", "moved", "closed"}
+
+
+class RawFileWatcher:
+
+    # Watches a directory for new or modified files. Uses watchdog
+    # (inotify on Linux) when it is installed and falls back to polling.
+    # A file is handed out once no event has arrived for `debounce`
+    # seconds and its size/mtime stopped changing, i.e. the writer is done.
+
+    def __init__(self, watch_dir, accept, debounce=2.0, poll_interval=1.0):
+
+        self.watch_dir = watch_dir
+        self.accept = accept
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+        self.observer = None
+        self.mode = None
+
+    # ---------- Events ---------- #
+
+    def touch(self, path):
+
+        name = os.path.basename(path)
+
+        if not self.accept(name):
+            return
+
+        now = time.time()
+
+        with self.lock:
+
+            entry = self.pending.setdefault(
+                name,
+                {"first_seen": now, "stat": None}
+            )
+            entry["last_event"] = now
+
+    def snapshot(self):
+
+        files = {}
+
+        for entry in os.scandir(self.watch_dir):
+            if entry.is_file() and self.accept(entry.name):
+                stat = entry.stat()
+                files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+
+        return files
+
+    def poll(self):
+
+        known = self.snapshot()
+
+        while not self.stopped.wait(self.poll_interval):
+
+            current = self.snapshot()
+
+            for name, stat in current.items():
+                if known.get(name) != stat:
+                    self.touch(os.path.join(self.watch_dir, name))
+
+            known = current
+
+    # ---------- Lifecycle ---------- #
+
+    def start(self):
+
+        os.makedirs(self.watch_dir, exist_ok=True)
+
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+
+        except ImportError:
+            Observer = None
+
+        if Observer is not None:
+
+            watcher = self
+
+            class Handler(FileSystemEventHandler):
+
+                def on_any_event(self, event):
+
+                    # Reads also raise opened/closed_no_write events;
+                    # only writes and moves signal new data.
+                    if event.is_directory or \
+                            event.event_type not in WRITE_EVENTS:
+                        return
+
+                    # Moves into the directory report the new path
+                    watcher.touch(getattr(event, "dest_path", "")
+                                  or event.src_path)
+
+            self.observer = Observer()
+            self.observer.schedule(Handler(), self.watch_dir)
+            self.observer.start()
+
+            self.mode = "inotify" if "Inotify" in \
+                type(self.observer).__name__ else "events"
+
+        else:
+
+            threading.Thread(target=self.poll, daemon=True).start()
+
+            self.mode = "polling"
+
+        return self.mode
+
+    def stop(self):
+
+        self.stopped.set()
+
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+
+    # ---------- Ready Files ---------- #
+
+    def ready(self):
+
+        now = time.time()
+        batch = []
+
+        with self.lock:
+
+            for name, entry in list(self.pending.items()):
+
+                if now - entry["last_event"] < self.debounce:
+                    continue
+
+                path = os.path.join(self.watch_dir, name)
+
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    del self.pending[name]
+                    continue
+
+                current = (stat.st_size, stat.st_mtime_ns)
+
+                # Size/mtime must hold still for one poll interval
+                if entry["stat"] != current:
+                    entry["stat"] = current
+                    entry["checked_at"] = now
+                    continue
+
+                if now - entry["checked_at"] < self.poll_interval:
+                    continue
+
+                batch.append({
+                    "file": name,
+                    "first_seen": entry["first_seen"],
+                    "ready_at": now
+                })
+
+                del self.pending[name]
+
+        return batch
@@ -1,6 +1,8 @@
 import streamlit as st
-import pandas as pd
 import os
+import time
+
+from core.dashboard_data import DashboardDataService
 
 
 # ---------------- Page Config ---------------- #
@@ -21,38 +23,110 @@ st.divider()
 
 # ---------------- File Paths ---------------- #
 
-FEATURE_FILE = "data/features/ecommerce_data.csv"
+CLEAN_FILE = "data/clean/ecommerce_data.csv"
 INSIGHT_FILE = "data/insights/ecommerce_data_insight.txt"
+INSIGHT_STREAM_FILE = INSIGHT_FILE + ".partial"
 MONITOR_FILE = "monitoring/monitor_report.txt"
 
 
+# ---------------- Config ---------------- #
+
+STREAM_POLL_SECONDS = 0.5
+
+# A .partial untouched for this long is left over from a killed run
+STREAM_STALE_SECONDS = 15
+
+
 # ---------------- Load Data ---------------- #
 
+# Queries are cached per (data signature, filters): a new pipeline run
+# changes the signature, so stale results are never served. Only small
+# aggregates are kept in the Streamlit cache, never the raw rows.
+
+@st.cache_resource
+def get_service():
+    return DashboardDataService(CLEAN_FILE)
+
+
+@st.cache_data
+def load_options(signature):
+    return get_service().options()
+
+
+@st.cache_data
+def load_kpis(signature, filters):
+    return get_service().kpis(**dict(filters))
+
+
+@st.cache_data
+def load_trend(signature, filters):
+    return get_service().revenue_trend(**dict(filters))
+
+
 @st.cache_data
-def load_data():
-    return pd.read_csv(FEATURE_FILE)
+def load_top_products(signature, filters):
+    return get_service().top_products(**dict(filters))
+
+
+service = get_service()
+
+signature = service.refresh() if service.exists() else None
+
+
+# ---------------- Filters ---------------- #
+
+filters = ()
+
+if signature:
+
+    options = load_options(signature)
+
+    st.sidebar.header("🔎 Filters")
+
+    # No dates when the clean data is empty or every InvoiceDate is null
+    if options["min_date"] is not None and options["max_date"] is not None:
+
+        date_range = st.sidebar.date_input(
+            "Date range",
+            value=(options["min_date"].date(), options["max_date"].date()),
+            min_value=options["min_date"].date(),
+            max_value=options["max_date"].date()
+        )
+
+    else:
+        date_range = ()
+        st.sidebar.caption("No invoice dates to filter on.")
+
+    countries = st.sidebar.multiselect("Country", options["countries"])
+
+    product = st.sidebar.text_input("Product (StockCode or description)")
+
+    start, end = (list(date_range) + [None, None])[:2]
+
+    filters = (
+        ("start", start),
+        ("end", end),
+        ("countries", tuple(countries)),
+        ("product", product.strip() or None)
+    )
 
 
 # ---------------- KPIs ---------------- #
 
 st.header("📊 Business KPIs")
 
-if os.path.exists(FEATURE_FILE):
+if signature:
 
-    df = load_data()
+    kpis = load_kpis(signature, filters)
 
     col1, col2, col3 = st.columns(3)
 
-    total_revenue = df["Revenue"].sum()
-    avg_revenue = df["Revenue"].mean()
-    total_orders = len(df)
-
-    col1.metric("Total Revenue", f"{total_revenue:,.0f}")
-    col2.metric("Average Revenue", f"{avg_revenue:.2f}")
-    col3.metric("Total Orders", total_orders)
+    col1.metric("Total Revenue", f"{kpis['total_revenue']:,.0f}")
+    col2.metric("Average Revenue", f"{kpis['avg_revenue']:.2f}")
+    col3.metric("Total Orders", kpis["total_orders"])
 
 else:
-    st.warning("Feature data not found. Run pipeline first.")
+    st.warning("Clean data not found. Run pipeline first.")
 
 
 st.divider()
@@ -62,16 +136,19 @@ st.divider()
 
 st.header("📈 Monthly Revenue Trend")
 
-if os.path.exists(FEATURE_FILE):
+if signature:
 
-    if "month" in df.columns:
+    trend = load_trend(signature, filters)
 
-        trend = df.groupby("month")["Revenue"].sum()
+    if len(trend):
 
         st.line_chart(trend)
 
+        st.subheader("🏷️ Top Products")
+        st.dataframe(load_top_products(signature, filters))
+
     else:
-        st.info("No month column found in data.")
+        st.info("No transactions match the selected filters.")
 
 else:
     st.warning("No data available.")
@@ -84,16 +161,78 @@ st.divider()
 
 st.header("🧠 AI-Generated Business Insights")
 
-if os.path.exists(INSIGHT_FILE):
+def read_text(path):
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    except FileNotFoundError:
+        return None
+
+
+def stream_state():
+
+    # "streaming" while the sidecar keeps growing; a sidecar nothing has
+    # written to for STREAM_STALE_SECONDS was left by a killed run
+    try:
+        age = time.time() - os.path.getmtime(INSIGHT_STREAM_FILE)
+
+    except FileNotFoundError:
+        return None
+
+    return "streaming" if age < STREAM_STALE_SECONDS else "stale"
+
+
+def render_insights():
 
-    with open(INSIGHT_FILE, "r", encoding="utf-8") as f:
+    state = stream_state()
 
-        insights = f.read()
+    if state == "streaming":
 
+        # Re-run by the fragment timer, never a blocking loop
+        partial = read_text(INSIGHT_STREAM_FILE)
+
+        if partial:
+            st.markdown(partial + " ▌")
+        else:
+            st.info("⏳ Generating insights...")
+
+        return
+
+    if st.session_state.get("insight_streaming"):
+
+        # The stream finished or went stale: one full rerun drops
+        # the refresh timer
+        st.session_state["insight_streaming"] = False
+        st.rerun()
+
+    insights = read_text(INSIGHT_FILE)
+
+    if insights:
         st.markdown(insights)
 
-else:
-    st.info("No AI insights found. Run pipeline with LLM enabled.")
+    elif state == "stale":
+
+        partial = read_text(INSIGHT_STREAM_FILE)
+
+        if partial:
+            st.markdown(partial)
+
+        st.info("Insight generation did not complete.")
+
+    else:
+        st.info("No AI insights found. Run pipeline with LLM enabled.")
+
+
+# Only a live stream refreshes; everything else renders once
+streaming = stream_state() == "streaming"
+st.session_state["insight_streaming"] = streaming
+
+st.fragment(
+    render_insights,
+    run_every=STREAM_POLL_SECONDS if streaming else None
+)()
 
 
 st.divider()
@@ -1,30 +1,31 @@
-from agents.ingestion_agent import IngestionAgent
-from agents.quality_agent import QualityAgent
-from agents.etl_agent import ETLAgent
-from agents.analytics_agent import AnalyticsAgent
-from agents.ml_agent import MLAgent
-from agents.monitoring_agent import MonitoringAgent
+from core.dag import run_dag, print_timing_report
+from orchestrator import STAGE_DEPS, load_agent
 
 
 def main():
 
-    ingestion = IngestionAgent()
-    ingestion.run()
+    stages = [
+        "ingestion",
+        "quality",
+        "customer",
+        "etl",
+        "analytics",
+        "ml",
+        "monitor"
+    ]
 
-    quality = QualityAgent()
-    quality.run()
+    tasks = {
+        stage: (lambda stage=stage: load_agent(stage)().run())
+        for stage in stages
+    }
 
-    etl = ETLAgent()
-    etl.run()
+    # Same dependency DAG as the orchestrator: independent stages overlap
+    report = run_dag(tasks, STAGE_DEPS)
 
-    analytics = AnalyticsAgent()
-    analytics.run()
+    print_timing_report(report)
 
-    ml = MLAgent()
-    ml.run()
-
-    monitor = MonitoringAgent()
-    monitor.run()
+    for stage, error in report["errors"].items():
+        print(f"❌ {stage}: {error}")
 
 
 if __name__ == "__main__":
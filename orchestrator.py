@@ -1,276 +1,802 @@
-from typing import TypedDict, Optional
+import os
+import json
+import time
+import argparse
+import operator
+import functools
+import importlib
+from typing import Annotated, TypedDict
 
-from langgraph.graph import StateGraph, END
-
-from agents.ingestion_agent import IngestionAgent
-from agents.quality_agent import QualityAgent
-from agents.etl_agent import ETLAgent
-from agents.analytics_agent import AnalyticsAgent
-from agents.ml_agent import MLAgent
-from agents.monitoring_agent import MonitoringAgent
-from agents.llm_agent import LLMInsightAgent
+from core.checkpoint import CheckpointStore
+from core.dag import run_dag, timing_report, print_timing_report
+from core.resources import resources
+from core.tracing import tracer
 
 
 # ---------------- CONFIG ---------------- #
 
 MAX_RETRIES = 2
 
+# Each stage lists the stages whose outputs it reads. Stages with no
+# path between them (analytics/ml, then llm/monitor) run concurrently.
+STAGE_DEPS = {
+    "ingestion": [],
+    "quality": ["ingestion"],
+    "customer": ["quality"],
+    "etl": ["quality", "customer"],
+    "analytics": ["etl"],
+    "ml": ["etl"],
+    "monitor": ["ml"],
+    "llm": ["analytics"]
+}
+
+STAGES = list(STAGE_DEPS)
+
+# Agents are imported when their node runs, so a partial run only pays
+# for the libraries (sklearn, matplotlib, groq...) its stages need.
+STAGE_AGENTS = {
+    "ingestion": "agents.ingestion_agent.IngestionAgent",
+    "quality": "agents.quality_agent.QualityAgent",
+    "customer": "agents.customer_agent.CustomerAgent",
+    "etl": "agents.etl_agent.ETLAgent",
+    "analytics": "agents.analytics_agent.AnalyticsAgent",
+    "ml": "agents.ml_agent.MLAgent",
+    "monitor": "agents.monitoring_agent.MonitoringAgent",
+    "llm": "agents.llm_agent.LLMInsightAgent"
+}
+
+# Optional stages never block or fail the pipeline
+OPTIONAL_STAGES = {"llm"}
+
+WATCH_LATENCY_LOG = "monitoring/watch_latency.jsonl"
+
+# Default validation rules; a quality_rules.* file in the working
+# directory overrides them (see core/rules.py)
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rules")
+
+# Directories each stage reads and writes, used for checkpoint validity
+STAGE_IO = {
+    "ingestion": (
+        ["data/raw"],
+        ["data/processed", "data/schemas/ingestion", "data/profiles"]
+    ),
+    "quality": (
+        ["data/processed", "data/schemas/ingestion", "data/profiles",
+         RULES_DIR, "quality_rules.json", "quality_rules.yaml", "quality_rules.yml"],
+        ["data/clean", "data/schemas/quality", "data/dedup", "data/quality"]
+    ),
+    "customer": (
+        ["data/clean", "data/schemas/quality"],
+        ["data/customers"]
+    ),
+    "etl": (
+        ["data/clean", "data/schemas/quality", "data/customers"],
+        ["data/features", "data/schemas/etl", "data/feature_store"]
+    ),
+    "analytics": (
+        ["data/features", "data/schemas/etl", "data/feature_store"],
+        ["data/reports"]
+    ),
+    "ml": (
+        ["data/features", "data/schemas/etl"],
+        ["models", "data/matrix"]
+    ),
+    "monitor": (
+        ["data/features", "data/schemas/etl", "data/feature_store",
+         "models"],
+        ["monitoring"]
+    ),
+    "llm": (["data/reports"], ["data/insights"])
+}
+
 
 # ---------------- STATE ---------------- #
 
+def merge(left, right):
+    return {**left, **right}
+
+
+# Stages running in parallel return partial updates; the reducers merge
+# them so concurrent branches never overwrite each other.
 class PipelineState(TypedDict):
-    step: str
-    error: Optional[str]
-    retries: int
+    from_stage: str
+    to_stage: str | list | None
+    force: bool
+    completed: Annotated[list, operator.add]
+    errors: Annotated[dict, merge]
+    retries: Annotated[dict, merge]
+    timings: Annotated[dict, merge]
 
 
-# ---------------- AGENT NODES ---------------- #
+# ---------------- STAGE RUNNER ---------------- #
 
-def router_node(state: PipelineState):
-    return state
+def load_agent(stage):
 
+    module, cls = STAGE_AGENTS[stage].rsplit(".", 1)
 
-def ingestion_node(state: PipelineState):
+    return getattr(importlib.import_module(module), cls)
 
-    try:
-        IngestionAgent().run()
-        return {
-            "step": "ingestion_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
 
-    except Exception as e:
-        return {
-            "step": "ingestion_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
+def descendants(stage):
 
+    # Every stage that reads, directly or not, what `stage` writes
+    found = []
 
-def quality_node(state: PipelineState):
+    for name in STAGES:
+        if any(d == stage or d in found for d in STAGE_DEPS[name]):
+            found.append(name)
 
-    try:
-        QualityAgent().run()
-        return {
-            "step": "quality_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+    return found
 
-    except Exception as e:
-        return {
-            "step": "quality_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
 
+def ancestors(stage):
 
-def etl_node(state: PipelineState):
+    # Every stage whose outputs `stage` needs, directly or not
+    found = set(STAGE_DEPS[stage])
 
-    try:
-        ETLAgent().run()
-        return {
-            "step": "etl_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+    for name in reversed(STAGES):
+        if name in found:
+            found.update(STAGE_DEPS[name])
 
-    except Exception as e:
-        return {
-            "step": "etl_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
+    return [name for name in STAGES if name in found]
 
 
-def analytics_node(state: PipelineState):
+def selection(from_stage=None, to_stage=None):
 
-    try:
-        AnalyticsAgent().run()
-        return {
-            "step": "analytics_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+    # from_stage and what runs after it, cut down to what to_stage
+    # needs. to_stage may name several targets; by default it is every
+    # stage nothing depends on, so independent branches all run.
+    from_stage = from_stage or STAGES[0]
 
-    except Exception as e:
-        return {
-            "step": "analytics_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
+    if not to_stage:
+        to_stage = [s for s in STAGES if not descendants(s)]
 
+    elif isinstance(to_stage, str):
+        to_stage = [to_stage]
 
-def ml_node(state: PipelineState):
+    after = {from_stage, *descendants(from_stage)}
+    needed = set(to_stage).union(*(ancestors(s) for s in to_stage))
 
-    try:
-        MLAgent().run()
-        return {
-            "step": "ml_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+    return [s for s in STAGES if s in after and s in needed]
 
-    except Exception as e:
-        return {
-            "step": "ml_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
 
+def selected(state: PipelineState, stage):
 
-def monitor_node(state: PipelineState):
+    return stage in selection(state.get("from_stage"), state.get("to_stage"))
 
-    try:
-        MonitoringAgent().run()
-        return {
-            "step": "monitor_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
 
-    except Exception as e:
-        return {
-            "step": "monitor_failed",
-            "error": str(e),
-            "retries": state.get("retries", 0)
-        }
+def check_failures(stage, failed):
 
+    # Agents that carry on past a bad file or model return how many
+    # failed; their outputs are incomplete, so the stage must not be
+    # checkpointed and counts as an error (and is retried)
+    if failed:
+        raise RuntimeError(f"{stage}: {failed} item(s) failed")
 
-def llm_node(state: PipelineState):
 
-    try:
-        LLMInsightAgent().run()
-        return {
-            "step": "llm_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+def run_stage(state: PipelineState, stage):
 
-    except Exception as e:
+    blocked = [d for d in STAGE_DEPS[stage] if d in state["errors"]]
 
-        # LLM is optional → do NOT crash pipeline
-        print("⚠️ LLM failed. Skipping insights.")
+    if blocked:
 
-        return {
-            "step": "llm_done",
-            "error": None,
-            "retries": state.get("retries", 0)
-        }
+        print(f"\n⛔ Skipping {stage}: upstream failed ({', '.join(blocked)})")
 
+        return {"errors": {stage: f"blocked by {', '.join(blocked)}"}}
 
-# ---------------- ROUTER ---------------- #
+    # Left out of "completed": it did not run in this pipeline
+    if not selected(state, stage):
+        return {}
 
-def route(state: PipelineState):
+    inputs, outputs = STAGE_IO[stage]
+    checkpoints = CheckpointStore()
 
-    retries = state.get("retries", 0)
+    if not state.get("force") and \
+            checkpoints.is_valid(stage, inputs, outputs):
 
-    # ---------- Error Handling ---------- #
+        print(f"\n⏭️ Skipping {stage}: checkpoint is up to date\n")
 
-    if state["error"] is not None:
+        return {"completed": [stage], "timings": {stage: 0.0}}
 
-        if retries < MAX_RETRIES:
+    start = time.perf_counter()
+    attempt = 0
 
-            print(
-                f"⚠️ Error detected. Retrying "
-                f"({retries + 1}/{MAX_RETRIES})..."
-            )
+    # Retries resume from this stage only; upstream outputs are reused
+    while True:
+
+        try:
+            # Imported before the lease, so the thread limits applied
+            # on entry also reach the libraries the agent loads
+            agent = load_agent(stage)
+
+            with resources.stage(stage):
+                check_failures(stage, agent().run())
+
+            checkpoints.save(stage, inputs, outputs)
 
             return {
-                "step": "ingestion",
-                "error": None,
-                "retries": retries + 1
+                "completed": [stage],
+                "retries": {stage: attempt},
+                "timings": {stage: time.perf_counter() - start}
             }
 
-        else:
+        except Exception as e:
 
-            print("\n❌ Max retries reached. Stopping pipeline.")
-            print("Last error:", state["error"])
+            if attempt < MAX_RETRIES and stage not in OPTIONAL_STAGES:
 
-            return END
+                attempt += 1
+                print(
+                    f"⚠️ Error in {stage}: {e}. Retrying {stage} "
+                    f"({attempt}/{MAX_RETRIES})..."
+                )
+                continue
 
-    # ---------- Normal Flow ---------- #
+            elapsed = time.perf_counter() - start
 
-    step = state["step"]
+            if stage in OPTIONAL_STAGES:
 
-    if step == "start":
-        return "ingestion"
+                # LLM is optional → do NOT crash pipeline
+                print(f"⚠️ {stage} failed. Skipping.")
 
-    if step == "ingestion_done":
-        return "quality"
+                return {"completed": [stage], "timings": {stage: elapsed}}
 
-    if step == "quality_done":
-        return "etl"
+            print(f"\n❌ {stage} failed after {attempt} retries: {e}")
 
-    if step == "etl_done":
-        return "analytics"
+            return {
+                "errors": {stage: str(e)},
+                "retries": {stage: attempt},
+                "timings": {stage: elapsed}
+            }
 
-    if step == "analytics_done":
-        return "ml"
 
-    if step == "ml_done":
-        return "monitor"
+def make_node(stage):
 
-    if step == "monitor_done":
-        return "llm"
+    def node(state: PipelineState):
+        return run_stage(state, stage)
 
-    if step == "llm_done":
-        return END
+    node.__name__ = f"{stage}_node"
 
-    return END
+    return node
 
 
 # ---------------- GRAPH ---------------- #
 
 def build_graph():
 
+    from langgraph.graph import StateGraph, START, END
+
     graph = StateGraph(PipelineState)
 
-    # Register nodes
-    graph.add_node("router", router_node)
+    for stage in STAGES:
+        graph.add_node(stage, make_node(stage))
 
-    graph.add_node("ingestion", ingestion_node)
-    graph.add_node("quality", quality_node)
-    graph.add_node("etl", etl_node)
-    graph.add_node("analytics", analytics_node)
-    graph.add_node("ml", ml_node)
-    graph.add_node("monitor", monitor_node)
-    graph.add_node("llm", llm_node)
+    dependents = {d for deps in STAGE_DEPS.values() for d in deps}
 
-    # Routing
-    graph.add_conditional_edges("router", route)
+    for stage, deps in STAGE_DEPS.items():
 
-    # Return to router
-    graph.add_edge("ingestion", "router")
-    graph.add_edge("quality", "router")
-    graph.add_edge("etl", "router")
-    graph.add_edge("analytics", "router")
-    graph.add_edge("ml", "router")
-    graph.add_edge("monitor", "router")
-    graph.add_edge("llm", "router")
+        if not deps:
+            graph.add_edge(START, stage)
+        elif len(deps) == 1:
+            graph.add_edge(deps[0], stage)
+        else:
+            # Wait for every dependency before running
+            graph.add_edge(deps, stage)
 
-    # Entry
-    graph.set_entry_point("router")
+        if stage not in dependents:
+            graph.add_edge(stage, END)
 
     return graph.compile()
 
 
+# ---------------- WATCH MODE ---------------- #
+
+class WatchDaemon:
+
+    # Long-running mode: agents (and the libraries, models and fitted
+    # transforms they hold) stay resident. New raw files are pushed
+    # through the DAG restricted to just those files; an edited rule
+    # file re-runs quality and the stages downstream of it. Stages
+    # upstream of the changed directory are never re-run.
+
+    def __init__(self, raw_dir="data/raw", debounce=2.0, poll_interval=1.0):
+
+        from core.watcher import RawFileWatcher
+
+        self.agents = {stage: load_agent(stage)() for stage in STAGES}
+
+        def watcher(directory, accept):
+            return RawFileWatcher(
+                directory,
+                accept,
+                debounce=debounce,
+                poll_interval=poll_interval
+            )
+
+        # (stage that reads the directory, its watcher)
+        raw = watcher(raw_dir, self.agents["ingestion"].is_supported)
+
+        self.routes = [("ingestion", raw)] + [
+            ("quality", watcher(directory, names.__contains__))
+            for directory, names in self.rule_sources()
+        ]
+
+    def rule_sources(self):
+
+        # Where core.rules looks for the spec: an explicit path, else a
+        # quality_rules.* in the working directory over the defaults
+        override = os.getenv("ADIP_QUALITY_RULES")
+
+        if override:
+            return [(os.path.dirname(override) or ".",
+                     {os.path.basename(override)})]
+
+        from core.rules import DEFAULT_RULES, RULES_FILES
+
+        return [
+            (".", set(RULES_FILES)),
+            (os.path.dirname(DEFAULT_RULES),
+             {os.path.basename(DEFAULT_RULES)})
+        ]
+
+    def run_batch(self, batch, trigger="ingestion"):
+
+        stages = [trigger] + descendants(trigger)
+
+        # Only new raw files narrow the run; a rule change re-validates
+        # every batch already ingested
+        if trigger == "ingestion":
+            files = [item["file"] for item in batch]
+            outputs = [self.agents["ingestion"].output_name(f) for f in files]
+
+        else:
+            files = outputs = None
+
+            # Rules are compiled when the agent is created
+            self.agents[trigger] = load_agent(trigger)()
+
+        tracer.new_run()
+
+        tasks = {
+            "ingestion": lambda: self.agents["ingestion"].run(files=files),
+            "quality": lambda: self.agents["quality"].run(files=outputs),
+            "customer": lambda: self.agents["customer"].run(files=outputs),
+            "etl": lambda: self.agents["etl"].run(files=outputs),
+            "analytics": lambda: self.agents["analytics"].run(files=outputs),
+            "ml": lambda: self.agents["ml"].run(files=outputs),
+            "monitor": lambda: self.agents["monitor"].run(),
+            "llm": lambda: self.agents["llm"].run()
+        }
+
+        report = run_dag(
+            {
+                name: functools.partial(self.run_task, name, task)
+                for name, task in tasks.items() if name in stages
+            },
+            STAGE_DEPS
+        )
+        finished = time.time()
+
+        print_timing_report(report)
+
+        os.makedirs(os.path.dirname(WATCH_LATENCY_LOG), exist_ok=True)
+
+        with open(WATCH_LATENCY_LOG, "a") as f:
+
+            for item in batch:
+
+                record = {
+                    "run_id": tracer.run_id,
+                    "file": item["file"],
+                    "trigger": trigger,
+                    "detected_at": item["first_seen"],
+                    "ready_at": item["ready_at"],
+                    "finished_at": finished,
+                    "settle_s": item["ready_at"] - item["first_seen"],
+                    "pipeline_s": report["wall_time"],
+                    "latency_s": finished - item["first_seen"],
+                    "errors": report["errors"]
+                }
+
+                f.write(json.dumps(record) + "\n")
+
+                print(
+                    f"⏱️ {item['file']}: landed → outputs updated in "
+                    f"{record['latency_s']:.2f}s "
+                    f"(settle {record['settle_s']:.2f}s, "
+                    f"pipeline {record['pipeline_s']:.2f}s)"
+                )
+
+        return report
+
+    def run_task(self, stage, task):
+
+        with resources.stage(stage):
+            check_failures(stage, task())
+
+    def serve_forever(self, tick=0.2):
+
+        for stage, watcher in self.routes:
+            mode = watcher.start()
+            print(f"👀 Watching {watcher.watch_dir} for {stage} ({mode})")
+
+        print()
+
+        try:
+            while True:
+
+                for stage, watcher in self.routes:
+
+                    batch = watcher.ready()
+
+                    if batch:
+                        print(f"\n📦 Changed: {[b['file'] for b in batch]} "
+                              f"→ {stage} onwards")
+                        self.run_batch(batch, stage)
+                        print("\n👀 Watching for changes\n")
+
+                time.sleep(tick)
+
+        except KeyboardInterrupt:
+            print("\n🛑 Watch mode stopped")
+
+        finally:
+            for _, watcher in self.routes:
+                watcher.stop()
+
+
+def parse_args():
+
+    parser = argparse.ArgumentParser(
+        description="Autonomous Data Intelligence Platform"
+    )
+
+    parser.add_argument(
+        "--from-stage",
+        choices=STAGES,
+        default=STAGES[0],
+        help="first stage to run"
+    )
+    parser.add_argument(
+        "--to-stage",
+        choices=STAGES,
+        default=None,
+        help="last stage to run, with the stages it needs "
+             "(default: every branch)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore checkpoints and re-run every selected stage"
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="comma-separated stages to profile, or 'all'"
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=["cprofile", "sample"],
+        default=None,
+        help="deterministic cProfile or low-overhead stack sampling"
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="train models only on batches they have not seen yet"
+    )
+
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="run on a stratified sample of data/raw in ./preview"
+    )
+    parser.add_argument(
+        "--preview-rows",
+        type=int,
+        default=None,
+        help="rows per raw file in the preview sample"
+    )
+
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="thread budget shared by the stages (default: all CPUs)"
+    )
+
+    parser.add_argument(
+        "--dataset",
+        default=None,
+        help="run in the dataset's own workspace (workspaces/<name>)"
+    )
+    parser.add_argument(
+        "--datasets",
+        default=None,
+        help="schedule several workspaces at once: name[:priority],..."
+    )
+    parser.add_argument(
+        "--memory-budget",
+        default=os.getenv("ADIP_MEMORY_BUDGET", "4G"),
+        help="estimated memory all scheduled pipelines may use, e.g. 8G"
+    )
+    parser.add_argument(
+        "--cpu-budget",
+        type=int,
+        default=None,
+        help="CPUs all scheduled pipelines may use (default: all)"
+    )
+    parser.add_argument(
+        "--cpus-per-job",
+        type=int,
+        default=1,
+        help="CPUs each scheduled pipeline is given"
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="run as a daemon, processing new files in data/raw"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="seconds without events before a new file is processed"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="polling period when inotify is unavailable"
+    )
+
+    args = parser.parse_args()
+
+    if not selection(args.from_stage, args.to_stage):
+        parser.error("--to-stage must be --from-stage or depend on it")
+
+    if args.datasets and (args.dataset or args.watch):
+        parser.error("--datasets runs its own pipelines; "
+                     "drop --dataset/--watch")
+
+    if args.preview and (args.datasets or args.watch):
+        parser.error("--preview runs a single pipeline; "
+                     "drop --datasets/--watch")
+
+    return args
+
+
 # ---------------- RUN ---------------- #
 
-if __name__ == "__main__":
+def raw_signature(raw_dir, rows):
 
-    print("\n🧠 Autonomous Data Intelligence Platform Started\n")
+    files = sorted(os.listdir(raw_dir)) if os.path.isdir(raw_dir) else []
+
+    return [rows] + [
+        [f, os.stat(os.path.join(raw_dir, f)).st_size,
+         os.stat(os.path.join(raw_dir, f)).st_mtime_ns]
+        for f in files
+    ]
+
+
+def run_preview(args):
+
+    # Same pipeline on a Country × month sample of data/raw, in its own
+    # workspace (./preview), then the full-data KPIs it implies
+    import shutil
+
+    from agents.ingestion_agent import IngestionAgent
+    from core.sampling import (
+        PREVIEW_DIR,
+        PREVIEW_ROWS,
+        PREVIEW_TREES,
+        STRATA_FILE,
+        StratifiedSampler,
+        estimate_kpis,
+        load_strata,
+        print_estimates,
+        save_strata
+    )
+    from core.schema import SchemaRegistry
+
+    rows = args.preview_rows or PREVIEW_ROWS
+    raw_dir = os.path.join(PREVIEW_DIR, "data", "raw")
+    strata_path = os.path.join(PREVIEW_DIR, STRATA_FILE)
+
+    signature = raw_signature("data/raw", rows)
+    previous = load_strata(strata_path)
+
+    if previous and previous["signature"] == signature:
+
+        print("⏭️ Preview sample is up to date\n")
+        strata = previous["files"]
+
+    else:
+
+        print(f"🎯 Sampling data/raw for preview ({rows:,} rows/file)\n")
+
+        ingestion = IngestionAgent(
+            processed_dir=os.path.join(PREVIEW_DIR, "data", "processed")
+        )
+
+        shutil.rmtree(raw_dir, ignore_errors=True)
+
+        strata = StratifiedSampler(rows).sample_dir(
+            "data/raw", raw_dir, ingestion.is_supported
+        )
+
+        save_strata(strata, signature, strata_path)
+
+    os.chdir(PREVIEW_DIR)
+
+    os.environ.setdefault("ADIP_FOREST_TREES", str(PREVIEW_TREES))
+
+    final_state = run_pipeline(args)
+
+    schemas = SchemaRegistry()
+    columns = ["InvoiceDate", "Country", "Quantity", "UnitPrice"]
+
+    clean = {
+        name: schemas.read_csv(
+            os.path.join("data/clean", name), "quality", columns=columns
+        )
+        for name in strata
+        if os.path.exists(os.path.join("data/clean", name))
+    }
+
+    if clean:
+
+        estimates = estimate_kpis(clean, strata)
+
+        print_estimates(estimates)
+
+        os.makedirs("data/reports", exist_ok=True)
+
+        with open("data/reports/preview_estimates.json", "w") as f:
+            json.dump(estimates, f, indent=2)
+
+    return final_state
+
+
+def parse_datasets(spec):
+
+    # "eu:2,us,apac:1" → [("eu", 2), ("us", 0), ("apac", 1)]
+    datasets = []
+
+    for item in spec.split(","):
+
+        name, _, priority = item.strip().partition(":")
+        datasets.append((name, int(priority or 0)))
+
+    return datasets
+
+
+def pipeline_args(args):
+
+    # What each scheduled pipeline is run with
+    forwarded = ["--from-stage", args.from_stage]
+
+    if args.to_stage:
+        forwarded += ["--to-stage", args.to_stage]
+
+    if args.force:
+        forwarded.append("--force")
+
+    if args.incremental:
+        forwarded.append("--incremental")
+
+    return forwarded
+
+
+def run_scheduled(args):
+
+    from core.scheduler import (
+        PipelineScheduler,
+        parse_size,
+        print_scheduler_report
+    )
+
+    scheduler = PipelineScheduler(
+        parse_size(args.memory_budget),
+        args.cpu_budget,
+        script=os.path.abspath(__file__)
+    )
+
+    for name, priority in parse_datasets(args.datasets):
+        scheduler.submit(
+            name,
+            priority,
+            cpus=args.cpus_per_job,
+            args=pipeline_args(args)
+        )
+
+    report = scheduler.run()
+
+    print_scheduler_report(report)
+
+    return report
+
+
+def run_pipeline(args):
+
+    print(f"🆔 Run ID: {tracer.run_id}\n")
 
     app = build_graph()
 
+    start = time.perf_counter()
+
     final_state = app.invoke(
         {
-            "step": "start",
-            "error": None,
-            "retries": 0
+            "from_stage": args.from_stage,
+            "to_stage": args.to_stage,
+            "force": args.force,
+            "completed": [],
+            "errors": {},
+            "retries": {},
+            "timings": {}
         }
     )
 
-    print("\n✅ System Finished")
-    print("Final State:", final_state)
+    report = timing_report(
+        final_state["timings"],
+        STAGE_DEPS,
+        time.perf_counter() - start
+    )
+
+    print_timing_report(report)
+
+    print(f"\n🧾 Trace written to: {tracer.trace_path}")
+
+    return final_state
+
+
+if __name__ == "__main__":
+
+    args = parse_args()
+
+    # Every stage path is relative, so the workspace is just the cwd
+    if args.dataset:
+
+        from core.scheduler import prepare_workspace
+
+        os.chdir(prepare_workspace(args.dataset))
+
+    tracer.configure(profile=args.profile, mode=args.profile_mode)
+    resources.configure(budget=args.threads, deps=STAGE_DEPS)
+
+    # Read by MLAgent, including retrains triggered by monitoring
+    if args.incremental:
+        os.environ["ADIP_TRAINING_MODE"] = "incremental"
+
+    print("\n🧠 Autonomous Data Intelligence Platform Started\n")
+
+    if args.datasets:
+
+        report = run_scheduled(args)
+
+        print("\n✅ System Finished")
+
+        if report["failed"]:
+            raise SystemExit(1)
+
+    elif args.preview:
+
+        final_state = run_preview(args)
+
+        print("\n✅ Preview Finished (outputs in ./preview)")
+        print("Final State:", final_state)
+
+    elif args.watch:
+
+        WatchDaemon(
+            debounce=args.debounce,
+            poll_interval=args.poll_interval
+        ).serve_forever()
+
+    else:
+
+        final_state = run_pipeline(args)
+
+        print("\n✅ System Finished")
+        print("Final State:", final_state)
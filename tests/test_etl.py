@@ -0,0 +1,59 @@
+import os
+import json
+
+import pandas as pd
+
+from benchmarks.generate_data import generate
+from agents.ingestion_agent import IngestionAgent
+from agents.quality_agent import QualityAgent
+from agents.etl_agent import DATE_FEATURES, ETLAgent
+from core.feature_store import FeatureStore
+
+
+ENCODING = "cp1252"
+
+
+def test_etl_survives_unparseable_invoice_date(tmp_path, monkeypatch):
+
+    # Every agent works on paths relative to the workspace
+    monkeypatch.chdir(tmp_path)
+
+    path = os.path.join("data", "raw", "batch.csv")
+    os.makedirs(os.path.dirname(path))
+
+    generate(2_000, path)
+
+    df = pd.read_csv(path, dtype=str, encoding=ENCODING)
+    df.loc[10, "InvoiceDate"] = "not a date"
+    df.to_csv(path, index=False, encoding=ENCODING)
+
+    assert not IngestionAgent().run()
+    assert not QualityAgent().run()
+
+    ETLAgent().run()
+
+    features = pd.read_csv(os.path.join("data", "features", "batch.csv"))
+    undated = int(features["year"].isna().sum())
+
+    assert undated == 1
+
+    # Date parts keep their calendar values: never standardized
+    with open(os.path.join("data", "features", "scaling.json")) as f:
+        assert not set(json.load(f)) & set(DATE_FEATURES)
+
+    assert features["year"].dropna().between(2009, 2012).all()
+
+    # Partitions come from the dates; the undated row is left out
+    store = FeatureStore()
+
+    assert all(
+        partition.startswith("year=20")
+        for partition in store.index["partitions"]
+    )
+    assert not os.path.exists(os.path.join(store.root, "year=0"))
+
+    assert sum(
+        stats["rows"] for _, _, stats in store.entries()
+    ) == len(features) - undated
+
+    assert len(store.read()) == len(features) - undated
@@ -0,0 +1,37 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.generate_data import generate, parse_rows
+from benchmarks.bench_memory import (
+    MIN_REDUCTION,
+    current_chain,
+    legacy_chain,
+    peak_bytes
+)
+
+
+# Below ~100k rows the encoders' fixed-size tables outweigh the copies
+# the current chain saves; ADIP_MEMORY_TEST_ROWS=1M for the full check
+ROWS = [parse_rows(os.getenv("ADIP_MEMORY_TEST_ROWS", "200k"))]
+
+
+@pytest.mark.parametrize("rows", ROWS)
+def test_peak_memory_below_copy_chaining(rows, tmp_path):
+
+    path = os.path.join(tmp_path, "raw.csv")
+    generate(rows, path, encoding="utf-8")
+
+    frame = pd.read_csv(path)
+
+    legacy = peak_bytes(legacy_chain, frame.copy())
+
+    current = peak_bytes(
+        current_chain, frame.copy(), os.path.join(tmp_path, "workspace")
+    )
+
+    assert current / legacy <= 1 - MIN_REDUCTION, (
+        f"peak {current / 1e6:.0f} MB vs {legacy / 1e6:.0f} MB "
+        f"copy-chaining on {rows:,} rows"
+    )